@@ -3,6 +3,13 @@ from . import braid, braid_vec
 
 Braid: type['braid.Braid'] | type['braid_vec.Braid']
 from .exceptions import IllegalTransformationException, InvalidBraidException, IndexOutOfRangeException
+from .braid_batch import BraidBatch, Move
+from .braid_key import BraidKey
+from .collation import collate
+from .incremental import IncrementalBraid
+from .mutable import MutableBraid
+from . import parallel
+from .polynomial import LaurentPolynomial
 if _os.environ.get("KNPY_FAST_BRAID", default="no").lower() in ["on", "yes", "true", "1"]:
     from .braid_vec import Braid
 else:
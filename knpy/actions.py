@@ -0,0 +1,233 @@
+from functools import lru_cache
+import numpy as np
+from .braid_batch import BraidBatch, Move
+from .exceptions import IllegalTransformationException
+
+# Moves of the discrete action space, in the same order as `Braid.performable_moves` lists them.
+ACTION_MOVES = (
+    Move.DESTABILIZATION,
+    Move.STABILIZATION,
+    Move.CONJUGATION,
+    Move.BRAID_RELATION1,
+    Move.BRAID_RELATION2,
+    Move.REMOVE_SIGMA_INVERSE_PAIR,
+)
+
+
+def _neighbours(sigmas: np.ndarray, lengths: np.ndarray, offset: int) -> np.ndarray:
+    """
+    Returns the matrix whose (row, j) element is the sigma at position `(j + offset) % length` of the row, treating
+    every braid as circular.
+    """
+    columns = np.arange(sigmas.shape[1])[None, :]
+    source = (columns + offset) % np.maximum(lengths, 1)[:, None]
+    return np.take_along_axis(sigmas, source, axis=1)
+
+
+def braid_relation1_mask(sigmas: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    Returns a boolean matrix telling at which positions of the padded braids braid relation 1 is performable. See
+    `Braid.braid_relation1` for details.
+    """
+    a, b, c = sigmas, _neighbours(sigmas, lengths, 1), _neighbours(sigmas, lengths, 2)
+    in_range = np.arange(sigmas.shape[1])[None, :] < lengths[:, None]
+    return (
+        in_range
+        & (lengths >= 3)[:, None]
+        & (np.abs(a) == np.abs(c))
+        & (np.abs(np.abs(b) - np.abs(a)) == 1)
+        & ~((np.sign(b) != np.sign(a)) & (np.sign(b) != np.sign(c)))
+    )
+
+
+def braid_relation2_mask(sigmas: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    in_range = np.arange(sigmas.shape[1])[None, :] < lengths[:, None]
+    return in_range & (np.abs(np.abs(sigmas) - np.abs(_neighbours(sigmas, lengths, 1))) >= 2)
+
+
+def remove_sigma_inverse_pair_mask(sigmas: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    in_range = np.arange(sigmas.shape[1])[None, :] < lengths[:, None]
+    return in_range & (sigmas == -_neighbours(sigmas, lengths, 1))
+
+
+def destabilization_mask(sigmas: np.ndarray, lengths: np.ndarray, strand_counts: np.ndarray) -> np.ndarray:
+    in_range = np.arange(sigmas.shape[1])[None, :] < lengths[:, None]
+    absolute = np.abs(sigmas)
+    top = absolute == 1
+    bottom = absolute == (strand_counts - 1)[:, None]
+    return in_range & ((top & (top.sum(axis=1) == 1)[:, None]) | (bottom & (bottom.sum(axis=1) == 1)[:, None]))
+
+
+class ActionSpace:
+    """
+    Fixed-size discrete encoding of the moves listed by `Braid.performable_moves`, for braids with at most max_len
+    crossings and max_strands strands. Action ids are laid out in blocks, in the order of `ACTION_MOVES`:
+
+    destabilization: index in [0, max_len)
+    stabilization: index in [0, max_len) times the 4 variants, with value `2 * on_top + inverse` (see `Move`)
+    conjugation: value in [-(max_strands - 1), -1] ∪ [1, max_strands - 1] times index in [0, max_len)
+    braid relation 1, braid relation 2, remove sigma inverse pair: index in [0, max_len)
+
+    An action is legal if the move is performable and its result still fits in max_len crossings and max_strands
+    strands.
+    """
+
+    def __init__(self, max_len: int, max_strands: int):
+        if max_len < 1 or max_strands < 2:
+            raise ValueError("max_len must be at least 1 and max_strands at least 2")
+        self.max_len = max_len
+        self.max_strands = max_strands
+        self._conjugation_values = np.concatenate(
+            (np.arange(-max_strands + 1, 0), np.arange(1, max_strands))
+        ).astype(np.int64)
+        sizes = [max_len, 4 * max_len, len(self._conjugation_values) * max_len, max_len, max_len, max_len]
+        self._offsets = np.concatenate(([0], np.cumsum(sizes))).astype(np.int64)
+
+    @property
+    def size(self) -> int:
+        return int(self._offsets[-1])
+
+    def __len__(self) -> int:
+        return self.size
+
+    def offset(self, move: Move) -> int:
+        """
+        Returns the id of the first action of move.
+        """
+        return int(self._offsets[ACTION_MOVES.index(move)])
+
+    def decode(self, action_ids: np.ndarray | int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Converts action ids to `(moves, indices, values)` arrays accepted by `BraidBatch.apply`.
+        """
+        shape = np.shape(action_ids)
+        action_ids = np.asarray(action_ids, dtype=np.int64).reshape(-1)
+        if np.any((action_ids < 0) | (action_ids >= self.size)):
+            raise ValueError(f"Action ids must be in the range [0, {self.size})")
+        block = np.searchsorted(self._offsets, action_ids, side="right") - 1
+        local = action_ids - self._offsets[block]
+        moves = np.asarray(ACTION_MOVES, dtype=np.int64)[block]
+        indices = local.copy()
+        values = np.zeros_like(local)
+
+        stabilization = block == ACTION_MOVES.index(Move.STABILIZATION)
+        indices[stabilization], values[stabilization] = np.divmod(local[stabilization], 4)
+        conjugation = block == ACTION_MOVES.index(Move.CONJUGATION)
+        value_position, indices[conjugation] = np.divmod(local[conjugation], self.max_len)
+        values[conjugation] = self._conjugation_values[value_position]
+        return moves.reshape(shape), indices.reshape(shape), values.reshape(shape)
+
+    def encode(self, moves: np.ndarray | int, indices: np.ndarray | int, values: np.ndarray | int = 0) -> np.ndarray:
+        """
+        Converts `(moves, indices, values)` to action ids, -1 where the action is not part of the action space.
+        """
+        moves, indices, values = np.broadcast_arrays(*(np.asarray(x, dtype=np.int64) for x in (moves, indices, values)))
+        action_ids = np.full(moves.shape, -1, dtype=np.int64)
+        valid_index = (0 <= indices) & (indices < self.max_len)
+        for block, move in enumerate(ACTION_MOVES):
+            selected = (moves == move) & valid_index
+            local = indices
+            if move == Move.STABILIZATION:
+                selected &= (0 <= values) & (values < 4)
+                local = 4 * indices + values
+            elif move == Move.CONJUGATION:
+                selected &= (values != 0) & (np.abs(values) < self.max_strands)
+                value_position = np.where(values < 0, values + self.max_strands - 1, values + self.max_strands - 2)
+                local = value_position * self.max_len + indices
+            action_ids[selected] = self._offsets[block] + local[selected]
+        return action_ids
+
+    def masks(self, sigmas: np.ndarray, lengths: np.ndarray, strand_counts: np.ndarray) -> np.ndarray:
+        """
+        Returns the (N, size) boolean matrix of legal actions of N padded braids.
+        """
+        rows = sigmas.shape[0]
+        sigmas = np.zeros((rows, self.max_len), dtype=sigmas.dtype) if sigmas.shape[1] == 0 else sigmas
+        width = min(sigmas.shape[1], self.max_len)
+        lengths = np.asarray(lengths, dtype=np.int64)
+        strand_counts = np.asarray(strand_counts, dtype=np.int64)
+
+        def fit(mask: np.ndarray) -> np.ndarray:
+            fitted = np.zeros((rows, self.max_len), dtype=bool)
+            fitted[:, :width] = mask[:, :width]
+            return fitted
+
+        positions = np.arange(self.max_len)[None, :]
+        fits_stabilization = (lengths + 1 <= self.max_len) & (strand_counts < self.max_strands)
+        stabilization = (positions <= lengths[:, None]) & fits_stabilization[:, None]
+        conjugation = (positions <= lengths[:, None] + 1) & (lengths + 2 <= self.max_len)[:, None]
+        conjugation_values = np.abs(self._conjugation_values)[None, :] < strand_counts[:, None]
+
+        return np.concatenate(
+            (
+                fit(destabilization_mask(sigmas, lengths, strand_counts)),
+                np.repeat(stabilization, 4, axis=1),
+                (conjugation_values[:, :, None] & conjugation[:, None, :]).reshape(rows, -1),
+                fit(braid_relation1_mask(sigmas, lengths)),
+                fit(braid_relation2_mask(sigmas, lengths)),
+                fit(remove_sigma_inverse_pair_mask(sigmas, lengths)),
+            ),
+            axis=1,
+        )
+
+    def batch_masks(self, batch: BraidBatch) -> np.ndarray:
+        return self.masks(batch.sigmas, batch.lengths, batch.strand_counts)
+
+    def braid_mask(self, braid) -> np.ndarray:
+        """
+        Returns the boolean array of legal actions of a single `Braid` (of either implementation), filled from its
+        `*_performable_indices` member functions.
+        """
+        mask = np.zeros(self.size, dtype=bool)
+        length, strand_count = len(braid), braid.strand_count
+
+        def set_indices(move: Move, indices: np.ndarray) -> None:
+            indices = np.asarray(indices, dtype=np.int64)
+            mask[self.offset(move) + indices[indices < self.max_len]] = True
+
+        set_indices(Move.DESTABILIZATION, braid.destabilization_performable_indices())
+        if length + 1 <= self.max_len and strand_count < self.max_strands:
+            start = self.offset(Move.STABILIZATION)
+            mask[start : start + 4 * (length + 1)] = True
+        if length + 2 <= self.max_len:
+            start = self.offset(Move.CONJUGATION)
+            conjugation = mask[start : start + len(self._conjugation_values) * self.max_len]
+            conjugation.reshape(-1, self.max_len)[np.abs(self._conjugation_values) < strand_count, : length + 2] = True
+        set_indices(Move.BRAID_RELATION1, braid.braid_relation1_performable_indices())
+        set_indices(Move.BRAID_RELATION2, braid.braid_relation2_performable_indices())
+        set_indices(Move.REMOVE_SIGMA_INVERSE_PAIR, braid.remove_sigma_inverse_pair_performable_indices())
+        return mask
+
+    def apply(self, braid, action_id: int):
+        """
+        Performs an action on a single `Braid` (of either implementation) with its member functions. Raises
+        `IllegalTransformationException` if the action is not legal.
+        """
+        moves, indices, values = self.decode(action_id)
+        move, index, value = Move(int(moves)), int(indices), int(values)
+        if move == Move.STABILIZATION and (len(braid) + 1 > self.max_len or braid.strand_count >= self.max_strands):
+            raise IllegalTransformationException(f"Stabilization does not fit in {self.max_len} crossings")
+        if move == Move.CONJUGATION and len(braid) + 2 > self.max_len:
+            raise IllegalTransformationException(f"Conjugation does not fit in {self.max_len} crossings")
+        if move not in (Move.STABILIZATION, Move.CONJUGATION) and index >= len(braid):
+            raise IllegalTransformationException(f"{move.name} is not performable at index {index}")
+
+        if move == Move.DESTABILIZATION:
+            return braid.destabilization(index)
+        if move == Move.STABILIZATION:
+            return braid.stabilization(index=index, on_top=bool(value & 2), inverse=bool(value & 1))
+        if move == Move.CONJUGATION:
+            return braid.conjugation(value=value, index=index)
+        if move == Move.BRAID_RELATION1:
+            return braid.braid_relation1(index)
+        if move == Move.BRAID_RELATION2:
+            return braid.braid_relation2(index)
+        return braid.remove_sigma_inverse_pair(index)
+
+
+@lru_cache(maxsize=64)
+def action_space(max_len: int, max_strands: int) -> ActionSpace:
+    """
+    Returns the shared `ActionSpace` with the given bounds.
+    """
+    return ActionSpace(max_len, max_strands)
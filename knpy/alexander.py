@@ -0,0 +1,113 @@
+from functools import lru_cache
+import numpy as np
+from .braid_key import BraidKey
+from .data_utils import knot_table
+from .polynomial import LaurentPolynomial
+from .rotation import least_rotation
+
+# Exact Alexander polynomial of the closure of a braid on n strands:
+#
+#     Δ(t) = det(I - R(t)) (1 - t) / (1 - t^n)
+#
+# where R is the reduced Burau matrix of the braid (see `knpy.burau`, here with Laurent polynomial entries instead of
+# numbers). The determinant is computed with Bareiss' fraction-free elimination, where every division is exact, so
+# all intermediate values stay Laurent polynomials with integer coefficients.
+
+_ONE = LaurentPolynomial(1)
+
+
+def burau_polynomial_matrix(sigmas: np.ndarray | list[int], strand_count: int) -> list[list[LaurentPolynomial]]:
+    """
+    Returns the reduced Burau matrix of the braid on strand_count strands, with the entries as Laurent polynomials.
+    """
+    size = strand_count - 1
+    # Columns 0 and size + 1 are padding, like in `knpy.burau.batch_burau`.
+    matrix = [[_ONE if column == row + 1 else LaurentPolynomial() for column in range(size + 2)] for row in range(size)]
+    for sigma in sigmas:
+        i = abs(int(sigma))
+        if not 0 < i < strand_count:
+            raise ValueError(f"Sigma {sigma} is not a generator of the braid group on {strand_count} strands")
+        for row in matrix:
+            old = row[i]
+            if not old:
+                continue
+            if sigma > 0:
+                row[i - 1], row[i], row[i + 1] = row[i - 1] + old, -old.shift(1), row[i + 1] + old.shift(1)
+            else:
+                row[i - 1], row[i], row[i + 1] = row[i - 1] + old.shift(-1), -old.shift(-1), row[i + 1] + old
+    return [row[1:-1] for row in matrix]
+
+
+def determinant(matrix: list[list[LaurentPolynomial]]) -> LaurentPolynomial:
+    """
+    Returns the determinant of a square matrix of Laurent polynomials, with Bareiss' algorithm.
+    """
+    size = len(matrix)
+    matrix = [list(row) for row in matrix]
+    previous, sign = _ONE, 1
+    for k in range(size):
+        if not matrix[k][k]:
+            pivot = next((row for row in range(k + 1, size) if matrix[row][k]), None)
+            if pivot is None:
+                return LaurentPolynomial()
+            matrix[k], matrix[pivot] = matrix[pivot], matrix[k]
+            sign = -sign
+        for i in range(k + 1, size):
+            for j in range(k + 1, size):
+                matrix[i][j] = (matrix[k][k] * matrix[i][j] - matrix[i][k] * matrix[k][j]).exact_divide(previous)
+        previous = matrix[k][k]
+    result = matrix[-1][-1] if size > 0 else _ONE
+    return result if sign > 0 else -result
+
+
+def normalize(polynomial: LaurentPolynomial) -> LaurentPolynomial:
+    """
+    Returns the representative of `±t^k polynomial` used by KnotInfo: the lowest exponent is 0 and its coefficient is
+    positive.
+    """
+    shifted = polynomial.shift(-polynomial.lowest)
+    return -shifted if shifted.terms.get(0, 0) < 0 else shifted
+
+
+def _compute(sigmas: np.ndarray | list[int], strand_count: int) -> LaurentPolynomial:
+    reduced = burau_polynomial_matrix(sigmas, strand_count)
+    size = strand_count - 1
+    difference = [[(_ONE if i == j else LaurentPolynomial()) - reduced[i][j] for j in range(size)] for i in range(size)]
+    strands = LaurentPolynomial([1] * strand_count)  # (1 - t^n) / (1 - t)
+    return normalize(determinant(difference).exact_divide(strands))
+
+
+@lru_cache(maxsize=1 << 16)
+def _cached(key: BraidKey, strand_count: int) -> LaurentPolynomial:
+    return _compute(key.notation(), strand_count)
+
+
+def alexander_polynomial(sigmas: np.ndarray | list[int], strand_count: int | None = None) -> LaurentPolynomial:
+    """
+    Returns the normalized (see `normalize`) Alexander polynomial of the closure of the braid on strand_count strands
+    (by default the strand count of the braid, one more than the largest absolute value of the sigmas).
+
+    Results are cached, keyed on the least rotation of the notation (see `knpy.rotation`), since rotations of a braid
+    have the same closure.
+    """
+    sigmas = np.asarray(sigmas)
+    largest = int(np.abs(sigmas).max(initial=0))
+    if strand_count is None:
+        strand_count = largest + 1
+    if strand_count <= largest:
+        raise ValueError(f"The braid does not fit on {strand_count} strands")
+    amount = least_rotation(sigmas.tolist())
+    return _cached(BraidKey(np.concatenate((sigmas[amount:], sigmas[:amount]))), strand_count)
+
+
+@lru_cache(maxsize=None)
+def knot_alexander_polynomial(name: str, notation_index: int = 0) -> LaurentPolynomial:
+    """
+    Returns the normalized Alexander polynomial of a knot of the table, by its name as used by `Braid`, e.g. "8_19".
+    """
+    return alexander_polynomial(knot_table().notation(name, notation_index))
+
+
+def clear_cache() -> None:
+    _cached.cache_clear()
+    knot_alexander_polynomial.cache_clear()
@@ -0,0 +1,229 @@
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from typing import Callable, NamedTuple, Sequence
+import numpy as np
+from . import braid, braid_vec
+from .data_utils import benchmark_table, knot_table
+from .incremental import IncrementalBraid
+
+# Benchmark of the moves and the `*_performable_indices` functions of every Braid implementation, on the prime knot
+# table and on the long braids of `benchmark.csv`. Run it with
+#
+#     python -m knpy.benchmark [--json results.json] [--compare baseline.json]
+#
+# to print the throughput and the memory allocated per call, save the results and fail when an operation got slower
+# than in a saved baseline.
+
+BACKENDS = {"braid": braid.Braid, "braid_vec": braid_vec.Braid, "incremental": IncrementalBraid}
+DATASETS = ("knots", "benchmark")
+
+OPERATIONS = (
+    "shift_left",
+    "shift_right",
+    "braid_relation1",
+    "braid_relation2",
+    "conjugation",
+    "stabilization",
+    "stabilization_on_top",
+    "destabilization",
+    "remove_sigma_inverse_pair",
+    "braid_relation1_performable_indices",
+    "braid_relation2_performable_indices",
+    "remove_sigma_inverse_pair_performable_indices",
+    "destabilization_performable_indices",
+    "performable_moves",
+)
+
+type Call = Callable[[], object]
+
+
+class BenchmarkResult(NamedTuple):
+    backend: str
+    dataset: str
+    operation: str
+    calls: int  # Number of calls per round (one per braid where the operation is performable)
+    seconds_per_call: float  # Of the fastest round
+    bytes_per_call: float  # Peak traced memory of a call, averaged over the calls
+
+    @property
+    def calls_per_second(self) -> float:
+        return 1 / self.seconds_per_call if self.seconds_per_call > 0 else float("inf")
+
+    @property
+    def key(self) -> tuple[str, str, str]:
+        return self.backend, self.dataset, self.operation
+
+
+def _first(indices: np.ndarray) -> int | None:
+    return int(indices[0]) if len(indices) > 0 else None
+
+
+def operations(b) -> dict[str, Call | None]:
+    """
+    Returns the calls of `OPERATIONS` on braid b, None for the moves which are not performable on b. The braid
+    relations are performed at the first index where they are performable. Destabilization and the removal of a sigma
+    inverse pair are performed on b after a stabilization or a conjugation in the middle (done before timing), since
+    table knots rarely allow them.
+    """
+    length = len(b)
+    relation1 = _first(b.braid_relation1_performable_indices())
+    relation2 = _first(b.braid_relation2_performable_indices())
+    stabilized = b.stabilization(index=length // 2)
+    conjugated = b.conjugation(1, length // 2) if b.strand_count > 1 else None
+    return {
+        "shift_left": (lambda: b.shift_left(1)) if length > 1 else None,
+        "shift_right": (lambda: b.shift_right(1)) if length > 1 else None,
+        "braid_relation1": None if relation1 is None else lambda: b.braid_relation1(relation1),
+        "braid_relation2": None if relation2 is None else lambda: b.braid_relation2(relation2),
+        "conjugation": None if conjugated is None else lambda: b.conjugation(1, length // 2),
+        "stabilization": lambda: b.stabilization(index=length // 2),
+        "stabilization_on_top": lambda: b.stabilization(index=length // 2, on_top=True, inverse=True),
+        "destabilization": lambda: stabilized.destabilization(length // 2),
+        "remove_sigma_inverse_pair": (
+            None if conjugated is None else lambda: conjugated.remove_sigma_inverse_pair(length // 2)
+        ),
+        "braid_relation1_performable_indices": b.braid_relation1_performable_indices,
+        "braid_relation2_performable_indices": b.braid_relation2_performable_indices,
+        "remove_sigma_inverse_pair_performable_indices": b.remove_sigma_inverse_pair_performable_indices,
+        "destabilization_performable_indices": b.destabilization_performable_indices,
+        "performable_moves": b.performable_moves,
+    }
+
+
+def dataset_notations(dataset: str, sample: int | None = None) -> list[np.ndarray]:
+    """
+    Returns the first braid notation of every knot of dataset ("knots" for the prime knot table, "benchmark" for
+    `benchmark.csv`). With sample, only that many knots are kept, evenly spaced in the table.
+    """
+    if dataset not in DATASETS:
+        raise ValueError(f"Unknown dataset {dataset!r}, must be one of {DATASETS}")
+    table = knot_table() if dataset == "knots" else benchmark_table()
+    names = [str(name) for name in table.names]
+    if sample is not None and sample < len(names):
+        names = [names[i] for i in np.linspace(0, len(names) - 1, sample).astype(np.int64)]
+    return [np.array(table.notation(name)) for name in names]
+
+
+def _time_round(calls: list[Call]) -> float:
+    start = time.perf_counter()
+    for call in calls:
+        call()
+    return time.perf_counter() - start
+
+
+def _bytes_per_call(calls: list[Call]) -> float:
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    total = 0
+    try:
+        for call in calls:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            call()
+            _, peak = tracemalloc.get_traced_memory()
+            total += peak - before
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return total / len(calls)
+
+
+def run(
+    backends: Sequence[str] = tuple(BACKENDS),
+    datasets: Sequence[str] = DATASETS,
+    selected: Sequence[str] | None = None,
+    repeat: int = 5,
+    sample: int | None = 200,
+) -> list[BenchmarkResult]:
+    """
+    Times every operation (or the selected ones) of every backend on every dataset. The calls of an operation on all
+    braids of a dataset form a round, which is repeated `repeat` times; the fastest round is reported like `timeit`
+    does. Memory is measured in a separate round with `tracemalloc`, since tracing slows down the calls.
+
+    sample: number of knots used from the prime knot table (None for all of them).
+    """
+    results = []
+    for dataset in datasets:
+        notations = dataset_notations(dataset, sample if dataset == "knots" else None)
+        for backend in backends:
+            braids = [BACKENDS[backend](notation) for notation in notations]
+            per_braid = [operations(b) for b in braids]
+            for operation in selected or OPERATIONS:
+                calls = [call for call in (braid_calls[operation] for braid_calls in per_braid) if call is not None]
+                if not calls:
+                    continue
+                seconds = min(_time_round(calls) for _ in range(repeat)) / len(calls)
+                memory = _bytes_per_call(calls)
+                results.append(BenchmarkResult(backend, dataset, operation, len(calls), seconds, memory))
+    return results
+
+
+def format_table(results: Sequence[BenchmarkResult]) -> str:
+    lines = [f"{'backend':<12} {'dataset':<10} {'operation':<46} {'µs/call':>10} {'calls/s':>12} {'bytes/call':>11}"]
+    for result in results:
+        lines.append(
+            f"{result.backend:<12} {result.dataset:<10} {result.operation:<46} "
+            f"{result.seconds_per_call * 1e6:>10.2f} {result.calls_per_second:>12.0f} {result.bytes_per_call:>11.0f}"
+        )
+    return "\n".join(lines)
+
+
+def save(results: Sequence[BenchmarkResult], path: str) -> None:
+    with open(path, "w") as file:
+        json.dump([result._asdict() for result in results], file, indent=1)
+
+
+def load(path: str) -> list[BenchmarkResult]:
+    with open(path, "r") as file:
+        return [BenchmarkResult(**result) for result in json.load(file)]
+
+
+def regressions(
+    results: Sequence[BenchmarkResult], baseline: Sequence[BenchmarkResult], threshold: float = 1.25
+) -> list[tuple[BenchmarkResult, float]]:
+    """
+    Returns the results (with their slowdown ratio) which are more than threshold times slower than the result of the
+    same backend, dataset and operation in baseline. Operations missing from baseline are ignored.
+    """
+    previous = {result.key: result for result in baseline}
+    slower = []
+    for result in results:
+        if result.key in previous and previous[result.key].seconds_per_call > 0:
+            ratio = result.seconds_per_call / previous[result.key].seconds_per_call
+            if ratio > threshold:
+                slower.append((result, ratio))
+    return slower
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m knpy.benchmark", description="Benchmark of the Braid moves.")
+    parser.add_argument("--backend", action="append", choices=tuple(BACKENDS), help="default: all backends")
+    parser.add_argument("--dataset", action="append", choices=DATASETS, help="default: all datasets")
+    parser.add_argument("--operation", action="append", choices=OPERATIONS, help="default: all operations")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timed rounds (default: 5)")
+    parser.add_argument("--sample", type=int, default=200, help="number of prime knots used, 0 for all (default: 200)")
+    parser.add_argument("--json", help="save the results to this file")
+    parser.add_argument("--compare", help="baseline saved with --json, exit with 1 when an operation got slower")
+    parser.add_argument("--threshold", type=float, default=1.25, help="allowed slowdown ratio (default: 1.25)")
+    args = parser.parse_args(argv)
+
+    results = run(
+        args.backend or tuple(BACKENDS), args.dataset or DATASETS, args.operation, args.repeat, args.sample or None
+    )
+    print(format_table(results))
+    if args.json:
+        save(results, args.json)
+    if args.compare:
+        slower = regressions(results, load(args.compare), args.threshold)
+        for result, ratio in slower:
+            print(f"Regression: {result.backend} {result.dataset} {result.operation} is {ratio:.2f} times slower")
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
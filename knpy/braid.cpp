@@ -3,10 +3,18 @@
 #include <pybind11/pybind11.h>
 #include <pybind11/numpy.h>
 #include <algorithm>
+#include <limits>
+#include <thread>
 #include <utility>
+#include <vector>
 
 namespace py = pybind11;
-using array = py::array_t<long long>;
+
+// Sigmas are int16 everywhere (knpy.braid.SIGMA_DTYPE), the sigma arguments are bound with noconvert, so passing
+// another dtype or a non contiguous array is a TypeError instead of a silent copy on every call.
+using sigma_t = int16_t;
+using array = py::array_t<sigma_t, py::array::c_style>;
+using mask_array = py::array_t<bool>;
 
 struct IllegalTransformationException : public std::runtime_error {
     using std::runtime_error::runtime_error;
@@ -16,13 +24,64 @@ int sign_of_non_zero(const int x) {
     return x > 0 ? 1 : -1;
 }
 
+// The kernels only touch Python objects to read their arguments and to allocate their results, the loops over the
+// sigmas run with the GIL released (py::gil_scoped_release), so threads calling them run in parallel. The performability
+// checks take anything indexable (e.g. the unchecked proxy of an array), as copying a py::array needs the GIL. The
+// constant time checks keep the GIL, releasing it would cost more than they do.
+
+template <typename S>
+bool braid_relation1_performable_at(const S& inp, const int n, const int index) {
+    if (n < 3) return false;
+    const int a = inp[(index+0)%n];
+    const int b = inp[(index+1)%n];
+    const int c = inp[(index+2)%n];
+
+    return abs(a) == abs(c) && abs(abs(b) - abs(a)) == 1 
+        && !(sign_of_non_zero(b) != sign_of_non_zero(a) && sign_of_non_zero(b) != sign_of_non_zero(c));
+}
+
+template <typename S>
+bool braid_relation2_performable_at(const S& inp, const int n, const int index) {
+    return n != 0 && abs(abs(inp[index]) - abs(inp[(index+1)%n])) >= 2;
+}
+
+template <typename S>
+bool destabilization_performable_at(const S& inp, const int n, const int index, const int strand_count) {
+    const bool valid_index = 0 <= index && index < n;
+    bool ok_bottom_position = false, ok_bottom_elsewhere = true, ok_top_position = false, ok_top_elsewhere = true;
+    for (int i = 0; i < n; i++) {
+        if (abs(inp[i]) == strand_count - 1) {
+            if (i == index) ok_bottom_position = true;
+            else ok_bottom_elsewhere = false;
+        }
+    }
+
+    for (int i = 0; i < n; i++) {
+        if (abs(inp[i]) == 1) {
+            if (i == index) ok_top_position = true;
+            else ok_top_elsewhere = false;
+        }
+    }
+    return valid_index && ((ok_bottom_position && ok_bottom_elsewhere) || (ok_top_position && ok_top_elsewhere));
+}
+
+template <typename S>
+bool remove_sigma_inverse_pair_performable_at(const S& inp, const int n, const int index) {
+    if (n == 0) return false;
+    const int j = (index+1)%n;
+    return 0 <= index && index < n && inp[index] == -inp[j];
+}
+
 array shift_left(const array _inp, const int amount = 1) {
     const auto inp = _inp.unchecked<1>();
     const int n = inp.size();
     array _res(n);
     auto res = _res.mutable_unchecked<1>();
-    for (int i = 0; i < n; i++) {
-        res[i] = inp[(i+amount)%n];
+    {
+        py::gil_scoped_release release;
+        for (int i = 0; i < n; i++) {
+            res[i] = inp[(i+amount)%n];
+        }
     }
     return _res;
 }
@@ -32,30 +91,29 @@ array shift_right(const array _inp, const int amount = 1) {
     const int n = inp.size();
     array _res(n);
     auto res = _res.mutable_unchecked<1>();
-    for (int i = 0; i < n; i++) {
-        res[i] = inp[(i-amount+n)%n];
+    {
+        py::gil_scoped_release release;
+        for (int i = 0; i < n; i++) {
+            res[i] = inp[(i-amount+n)%n];
+        }
     }
     return _res;
 }
 
 bool is_braid_relation1_performable(const array _inp, const int index) {
     const auto inp = _inp.unchecked<1>();
-    const int n = inp.size();
-    if (inp.size() < 3) return false;
-    const int a = inp[(index+0)%n];
-    const int b = inp[(index+1)%n];
-    const int c = inp[(index+2)%n];
-
-    return abs(a) == abs(c) && abs(abs(b) - abs(a)) == 1 
-        && !(sign_of_non_zero(b) != sign_of_non_zero(a) && sign_of_non_zero(b) != sign_of_non_zero(c));
+    return braid_relation1_performable_at(inp, inp.size(), index);
 }
 
-array braid_relation1_performable_indices(const array _inp) {
+mask_array braid_relation1_performable_indices(const array _inp) {
     const auto inp = _inp.unchecked<1>();
     const int n = inp.size();
-    array _res(n);
+    mask_array _res(n);
     auto res = _res.mutable_unchecked<1>();
-    for (int i = 0; i < n; i++) res[i] = is_braid_relation1_performable(_inp, i);
+    {
+        py::gil_scoped_release release;
+        for (int i = 0; i < n; i++) res[i] = braid_relation1_performable_at(inp, n, i);
+    }
     return _res;
 }
 
@@ -63,36 +121,41 @@ array braid_relation1(const array _inp, const int index) {
     const auto inp = _inp.unchecked<1>();
     const int n = inp.size();
 
-    if (!is_braid_relation1_performable(_inp, index)) {
+    if (!braid_relation1_performable_at(inp, n, index)) {
         throw IllegalTransformationException("Braid relation 1 is not performable at index " + std::to_string(index));
     }
 
     int signs[3] = {1, 1, 1};
     array _res(n);
     auto res = _res.mutable_unchecked<1>();
-    for (int i = 0; i < n; i++) res[i] = inp[i];
-    for (int i = 0; i < 3; i++) {
-        if (inp[(index+i)%n] < 0) signs[i] = -1;
-    }
-    for (int i = 0; i < 3; i++) {
-        const int j = (index+(i!=1))%n;
-        res[(index+i)%n] = signs[2-i] * abs(inp[j]); 
+    {
+        py::gil_scoped_release release;
+        for (int i = 0; i < n; i++) res[i] = inp[i];
+        for (int i = 0; i < 3; i++) {
+            if (inp[(index+i)%n] < 0) signs[i] = -1;
+        }
+        for (int i = 0; i < 3; i++) {
+            const int j = (index+(i!=1))%n;
+            res[(index+i)%n] = signs[2-i] * abs(inp[j]); 
+        }
     }
     return _res;
 }
 
 bool is_braid_relation2_performable(const array _inp, const int index) {
     const auto inp = _inp.unchecked<1>();
-    const int n = inp.size();
-    return n != 0 && abs(abs(inp[index]) - abs(inp[(index+1)%n])) >= 2;
+    return braid_relation2_performable_at(inp, inp.size(), index);
 }
 
-array braid_relation2_performable_indices(const array _inp) {
+mask_array braid_relation2_performable_indices(const array _inp) {
     const auto inp = _inp.unchecked<1>();
     const int n = inp.size();
-    array _res(n);
+    mask_array _res(n);
     auto res = _res.mutable_unchecked<1>();
-    for (int i = 0; i < n; i++) res[i] = is_braid_relation2_performable(_inp, i);
+    {
+        py::gil_scoped_release release;
+        for (int i = 0; i < n; i++) res[i] = braid_relation2_performable_at(inp, n, i);
+    }
     return _res;
 }
 
@@ -100,14 +163,17 @@ array braid_relation2(const array _inp, const int index) {
     const auto inp = _inp.unchecked<1>();
     const int n = inp.size();
     
-    if (!is_braid_relation2_performable(_inp, index)) {
+    if (!braid_relation2_performable_at(inp, n, index)) {
         throw IllegalTransformationException("Braid relation 2 is not performable at index " + std::to_string(index));
     }
 
     array _res(n);
     auto res = _res.mutable_unchecked<1>();
-    for (int i = 0; i < n; i++) res[i] = inp[i];
-    std::swap(res[index], res[(index+1)%n]);
+    {
+        py::gil_scoped_release release;
+        for (int i = 0; i < n; i++) res[i] = inp[i];
+        std::swap(res[index], res[(index+1)%n]);
+    }
     return _res;
 }
 
@@ -116,17 +182,20 @@ array conjugation(const array _inp, const int value, const int index) {
     const int n = inp.size();
     array _res(n+2);
     auto res = _res.mutable_unchecked<1>();
-    if (index == n + 1) {
-        res[0] = -value;
-        res[n+1] = value;
-        for (int i = 0; i < n; i++) {
-            res[i+1] = inp[i];
-        }
-    } else {
-        res[index] = value;
-        res[index+1] = -value;
-        for (int i = 0; i < n; i++) {
-            res[i + 2*(i>=index)] = inp[i];
+    {
+        py::gil_scoped_release release;
+        if (index == n + 1) {
+            res[0] = -value;
+            res[n+1] = value;
+            for (int i = 0; i < n; i++) {
+                res[i+1] = inp[i];
+            }
+        } else {
+            res[index] = value;
+            res[index+1] = -value;
+            for (int i = 0; i < n; i++) {
+                res[i + 2*(i>=index)] = inp[i];
+            }
         }
     }
     return _res;
@@ -138,75 +207,85 @@ array stabilization(const array _inp, const int index, const bool on_top, const
 
     array _res(n+1);
     auto res = _res.mutable_unchecked<1>();
-    int new_sigma = inverse ? -1 : 1;
-    if (on_top) {
-        res[index] = new_sigma;
-        for (int i = 0; i < n; i++) {
-            res[i+(i>=index)] = inp[i] + sign_of_non_zero(inp[i]);
-        }
-    } else {
-        new_sigma *= strand_count;
-        res[index] = new_sigma;
-        for (int i = 0; i < n; i++) {
-            res[i+(i>=index)] = inp[i];
+    {
+        py::gil_scoped_release release;
+        int new_sigma = inverse ? -1 : 1;
+        if (on_top) {
+            res[index] = new_sigma;
+            for (int i = 0; i < n; i++) {
+                res[i+(i>=index)] = inp[i] + sign_of_non_zero(inp[i]);
+            }
+        } else {
+            new_sigma *= strand_count;
+            res[index] = new_sigma;
+            for (int i = 0; i < n; i++) {
+                res[i+(i>=index)] = inp[i];
+            }
         }
     }
     return _res;
 }
 
 bool is_destabilization_performable(const array _inp, const int index, const int strand_count) {
+    const auto inp = _inp.unchecked<1>();
+    py::gil_scoped_release release;
+    return destabilization_performable_at(inp, inp.size(), index, strand_count);
+}
+
+mask_array destabilization_performable_indices(const array _inp, const int strand_count) {
     const auto inp = _inp.unchecked<1>();
     const int n = inp.size();
-    const bool valid_index = 0 <= index && index < n;
-    bool ok_bottom_position = false, ok_bottom_elsewhere = true, ok_top_position = false, ok_top_elsewhere = true;
-    for (int i = 0; i < n; i++) {
-        if (abs(inp[i]) == strand_count - 1) {
-            if (i == index) ok_bottom_position = true;
-            else ok_bottom_elsewhere = false;
+    mask_array _res(n);
+    auto res = _res.mutable_unchecked<1>();
+    {
+        py::gil_scoped_release release;
+        int top_count = 0, bottom_count = 0;
+        for (int i = 0; i < n; i++) {
+            top_count += abs(inp[i]) == 1;
+            bottom_count += abs(inp[i]) == strand_count - 1;
         }
-    }
-
-    for (int i = 0; i < n; i++) {
-        if (abs(inp[i]) == 1) {
-            if (i == index) ok_top_position = true;
-            else ok_top_elsewhere = false;
+        for (int i = 0; i < n; i++) {
+            res[i] = (abs(inp[i]) == 1 && top_count == 1) || (abs(inp[i]) == strand_count - 1 && bottom_count == 1);
         }
     }
-    return valid_index && ((ok_bottom_position && ok_bottom_elsewhere) || (ok_top_position && ok_top_elsewhere));
+    return _res;
 }
 
 array destabilization(const array _inp, const int index, const int strand_count) {
     const auto inp = _inp.unchecked<1>();
     const int n = inp.size();
 
-    if (!is_destabilization_performable(_inp, index, strand_count)) {
+    if (!destabilization_performable_at(inp, n, index, strand_count)) {
         throw IllegalTransformationException("Destabilization is not performable at index " + std::to_string(index));
     }
 
     const bool on_top = abs(inp[index]) == 1;
     array _res(n-1);
     auto res = _res.mutable_unchecked<1>();
-    for (int i = 0; i<n-1; i++) {
-        const int j = i+(i>=index);
-        res[i] = inp[j] - on_top * sign_of_non_zero(inp[j]);
+    {
+        py::gil_scoped_release release;
+        for (int i = 0; i<n-1; i++) {
+            const int j = i+(i>=index);
+            res[i] = inp[j] - on_top * sign_of_non_zero(inp[j]);
+        }
     }
     return _res;
 }
 
 bool is_remove_sigma_inverse_pair_performable(const array _inp, const int index) {
     const auto inp = _inp.unchecked<1>();
-    const int n = inp.size();
-    if (n == 0) return false;
-    const int j = (index+1)%n;
-    return 0 <= index && index < n && inp[index] == -inp[j];
+    return remove_sigma_inverse_pair_performable_at(inp, inp.size(), index);
 }
 
-array remove_sigma_inverse_pair_performable_indices(const array _inp) {
+mask_array remove_sigma_inverse_pair_performable_indices(const array _inp) {
     const auto inp = _inp.unchecked<1>();
     const int n = inp.size();
-    array _res(n);
+    mask_array _res(n);
     auto res = _res.mutable_unchecked<1>();
-    for (int i = 0; i < n; i++) res[i] = is_remove_sigma_inverse_pair_performable(_inp, i);
+    {
+        py::gil_scoped_release release;
+        for (int i = 0; i < n; i++) res[i] = remove_sigma_inverse_pair_performable_at(inp, n, i);
+    }
     return _res;
 }
 
@@ -214,41 +293,774 @@ array remove_sigma_inverse_pair(const array _inp, const int index) {
     const auto inp = _inp.unchecked<1>();
     const int n = inp.size();
 
-    if (!is_remove_sigma_inverse_pair_performable(_inp, index)) {
+    if (!remove_sigma_inverse_pair_performable_at(inp, n, index)) {
         throw IllegalTransformationException("Sigma inverse pair is not removable at index " + std::to_string(index));
     }
 
     array _res(n-2);
     auto res = _res.mutable_unchecked<1>();
-    int cnt = 0;
+    {
+        py::gil_scoped_release release;
+        int cnt = 0;
+        for (int i = 0; i < n; i++) {
+            if (i != index && i != (index+1)%n) {
+                res[cnt++] = inp[i];
+            }
+        }
+    }
+    return _res;
+}
+
+// Batched moves, working on a padded (N, capacity) sigma matrix. Move identifiers and the meaning of index and value
+// are the same as in `knpy.braid_batch.Move`.
+using batch_array = py::array_t<sigma_t, py::array::c_style>;
+using index_array = py::array_t<long long, py::array::c_style | py::array::forcecast>;
+
+// Rows per thread below which a batch is not split further, starting a thread costs about as much as moving a few
+// thousand short braids.
+constexpr py::ssize_t MIN_ROWS_PER_THREAD = 4096;
+
+// Runs body(begin, end) on contiguous ranges covering the rows [0, rows), on up to threads threads (as many as there
+// are cores if threads is 0). Called with the GIL released, body must not touch Python objects or throw.
+template <typename Body>
+void parallel_rows(const py::ssize_t rows, int threads, const Body& body) {
+    if (threads <= 0) threads = std::max(1u, std::thread::hardware_concurrency());
+    threads = (int)std::min<py::ssize_t>(threads, std::max<py::ssize_t>(rows / MIN_ROWS_PER_THREAD, 1));
+    const py::ssize_t chunk = (rows + threads - 1) / std::max(threads, 1);
+    std::vector<std::thread> workers;
+    for (int t = 1; t < threads; t++) {
+        workers.emplace_back(body, std::min(rows, t * chunk), std::min(rows, (t + 1) * chunk));
+    }
+    body(0, std::min(rows, chunk));
+    for (auto& worker : workers) worker.join();
+}
+
+enum Move {
+    SHIFT_LEFT = 0,
+    SHIFT_RIGHT = 1,
+    BRAID_RELATION1 = 2,
+    BRAID_RELATION2 = 3,
+    CONJUGATION = 4,
+    STABILIZATION = 5,
+    DESTABILIZATION = 6,
+    REMOVE_SIGMA_INVERSE_PAIR = 7,
+};
+
+constexpr int MOVE_COUNT = 8;
+const char* const MOVE_NAMES[MOVE_COUNT] = {"SHIFT_LEFT", "SHIFT_RIGHT", "BRAID_RELATION1", "BRAID_RELATION2",
+                                            "CONJUGATION", "STABILIZATION", "DESTABILIZATION",
+                                            "REMOVE_SIGMA_INVERSE_PAIR"};
+
+// Applies a move to the n sigmas in inp and writes the result to out, which must have room for n + 2 sigmas.
+// Returns the length of the result, or -1 if the move is not performable (out is undefined then).
+int apply_move_row(const sigma_t* inp, const int n, const int strand_count, const long long move,
+                   const long long index, const long long value, sigma_t* out) {
+    switch (move) {
+    case SHIFT_LEFT:
+    case SHIFT_RIGHT: {
+        if (index < 0 || index >= n) return -1;
+        const int amount = move == SHIFT_LEFT ? index : n - index;
+        for (int i = 0; i < n; i++) out[i] = inp[(i+amount)%n];
+        return n;
+    }
+    case BRAID_RELATION1: {
+        if (n < 3 || index < 0 || index >= n) return -1;
+        const int a = inp[index], b = inp[(index+1)%n], c = inp[(index+2)%n];
+        if (!(abs(a) == abs(c) && abs(abs(b) - abs(a)) == 1
+              && !(sign_of_non_zero(b) != sign_of_non_zero(a) && sign_of_non_zero(b) != sign_of_non_zero(c)))) {
+            return -1;
+        }
+        std::copy(inp, inp + n, out);
+        out[index] = sign_of_non_zero(c) * abs(b);
+        out[(index+1)%n] = sign_of_non_zero(b) * abs(a);
+        out[(index+2)%n] = sign_of_non_zero(a) * abs(b);
+        return n;
+    }
+    case BRAID_RELATION2: {
+        if (index < 0 || index >= n || abs(abs(inp[index]) - abs(inp[(index+1)%n])) < 2) return -1;
+        std::copy(inp, inp + n, out);
+        std::swap(out[index], out[(index+1)%n]);
+        return n;
+    }
+    case CONJUGATION: {
+        if (value == 0 || value <= -strand_count || value >= strand_count || index < 0 || index > n + 1) return -1;
+        if (index == n + 1) {
+            out[0] = -value;
+            std::copy(inp, inp + n, out + 1);
+            out[n+1] = value;
+        } else {
+            std::copy(inp, inp + index, out);
+            out[index] = value;
+            out[index+1] = -value;
+            std::copy(inp + index, inp + n, out + index + 2);
+        }
+        return n + 2;
+    }
+    case STABILIZATION: {
+        if (index < 0 || index > n || value < 0 || value >= 4) return -1;
+        const bool on_top = value & 2;
+        const int new_sigma = (value & 1 ? -1 : 1) * (on_top ? 1 : strand_count);
+        for (int i = 0; i < n; i++) {
+            out[i+(i>=index)] = inp[i] + on_top * sign_of_non_zero(inp[i]);
+        }
+        out[index] = new_sigma;
+        return n + 1;
+    }
+    case DESTABILIZATION: {
+        if (index < 0 || index >= n) return -1;
+        int top_count = 0, bottom_count = 0;
+        for (int i = 0; i < n; i++) {
+            top_count += abs(inp[i]) == 1;
+            bottom_count += abs(inp[i]) == strand_count - 1;
+        }
+        const bool on_top = abs(inp[index]) == 1;
+        if (!((on_top && top_count == 1) || (abs(inp[index]) == strand_count - 1 && bottom_count == 1))) return -1;
+        for (int i = 0; i < n - 1; i++) {
+            const int j = i+(i>=index);
+            out[i] = inp[j] - on_top * sign_of_non_zero(inp[j]);
+        }
+        return n - 1;
+    }
+    case REMOVE_SIGMA_INVERSE_PAIR: {
+        if (index < 0 || index >= n || inp[index] != -inp[(index+1)%n]) return -1;
+        int cnt = 0;
+        for (int i = 0; i < n; i++) {
+            if (i != index && i != (index+1)%n) out[cnt++] = inp[i];
+        }
+        return n - 2;
+    }
+    default:
+        return -1;
+    }
+}
+
+py::tuple apply_moves_batch(const batch_array _sigmas, const index_array _lengths, const index_array _moves,
+                            const index_array _indices, const index_array _values, const int threads = 1) {
+    const auto sigmas = _sigmas.unchecked<2>();
+    const auto lengths = _lengths.unchecked<1>();
+    const auto moves = _moves.unchecked<1>();
+    const auto indices = _indices.unchecked<1>();
+    const auto values = _values.unchecked<1>();
+    const py::ssize_t rows = sigmas.shape(0);
+
+    py::ssize_t capacity = std::max<py::ssize_t>(sigmas.shape(1), 1);
+    for (py::ssize_t r = 0; r < rows; r++) {
+        const int growth = moves[r] == CONJUGATION ? 2 : (moves[r] == STABILIZATION ? 1 : 0);
+        capacity = std::max<py::ssize_t>(capacity, lengths[r] + growth);
+    }
+
+    batch_array _res({rows, capacity});
+    index_array _res_lengths(rows);
+    py::array_t<bool> _performed(rows);
+    auto res = _res.mutable_unchecked<2>();
+    auto res_lengths = _res_lengths.mutable_unchecked<1>();
+    auto performed = _performed.mutable_unchecked<1>();
+
+    {
+        py::gil_scoped_release release;
+        parallel_rows(rows, threads, [&](const py::ssize_t begin, const py::ssize_t end) {
+            std::vector<sigma_t> buffer(capacity + 2);
+            for (py::ssize_t r = begin; r < end; r++) {
+                const sigma_t* inp = sigmas.data(r, 0);
+                const int n = lengths[r];
+                int strand_count = 1;
+                for (int i = 0; i < n; i++) strand_count = std::max(strand_count, abs(inp[i]) + 1);
+
+                int new_length = apply_move_row(inp, n, strand_count, moves[r], indices[r], values[r], buffer.data());
+                performed[r] = new_length >= 0;
+                const sigma_t* src = buffer.data();
+                if (new_length < 0) {
+                    new_length = n;
+                    src = inp;
+                }
+                sigma_t* dst = res.mutable_data(r, 0);
+                std::copy(src, src + new_length, dst);
+                std::fill(dst + new_length, dst + capacity, 0);
+                res_lengths[r] = new_length;
+            }
+        });
+    }
+    return py::make_tuple(_res, _res_lengths, _performed);
+}
+
+
+// Garside left normal form, the algorithm and the representation of simple elements (as permutations) are the same as
+// in knpy/garside.py
+using permutation = std::vector<int>;
+
+permutation inverse_permutation(const permutation& w) {
+    permutation inverse(w.size());
+    for (size_t position = 0; position < w.size(); position++) inverse[w[position]] = position;
+    return inverse;
+}
+
+bool left_weight(permutation& a, permutation& b) {
+    const int n = a.size();
+    permutation b_inverse = inverse_permutation(b);
+    bool changed = false;
+    for (int i = 1; i < n;) {
+        if (b_inverse[i-1] > b_inverse[i] && a[i-1] < a[i]) {
+            std::swap(a[i-1], a[i]);
+            std::swap(b_inverse[i-1], b_inverse[i]);
+            changed = true;
+            i = 1;
+        } else {
+            i++;
+        }
+    }
+    if (changed) b = inverse_permutation(b_inverse);
+    return changed;
+}
+
+py::tuple left_normal_form(const array _inp, const int strand_count) {
+    const auto inp = _inp.unchecked<1>();
+    const int n = inp.size();
+    py::gil_scoped_release release;
+    permutation delta(strand_count), identity(strand_count);
+    for (int p = 0; p < strand_count; p++) {
+        delta[p] = strand_count - 1 - p;
+        identity[p] = p;
+    }
+
+    int remaining_negatives = 0;
+    for (int i = 0; i < n; i++) remaining_negatives += inp[i] < 0;
+    int infimum = -remaining_negatives;
+    std::vector<permutation> factors;
+    factors.reserve(n);
+    for (int l = 0; l < n; l++) {
+        const int i = abs(inp[l]);
+        if (i < 1 || i >= strand_count) {
+            throw std::invalid_argument("Sigma " + std::to_string(inp[l]) + " is not a generator of the braid group on "
+                                        + std::to_string(strand_count) + " strands");
+        }
+        remaining_negatives -= inp[l] < 0;
+        permutation factor = inp[l] > 0 ? identity : delta;
+        std::swap(factor[i-1], factor[i]);
+        if (remaining_negatives % 2 == 1) {
+            permutation conjugated(strand_count);
+            for (int p = 0; p < strand_count; p++) conjugated[p] = strand_count - 1 - factor[strand_count - 1 - p];
+            factor = conjugated;
+        }
+        factors.push_back(std::move(factor));
+
+        for (int j = factors.size() - 1; j > 0 && left_weight(factors[j-1], factors[j]); j--) {}
+        int leading_deltas = 0;
+        while (leading_deltas < (int)factors.size() && factors[leading_deltas] == delta) leading_deltas++;
+        factors.erase(factors.begin(), factors.begin() + leading_deltas);
+        infimum += leading_deltas;
+        while (!factors.empty() && factors.back() == identity) factors.pop_back();
+    }
+
+    py::gil_scoped_acquire acquire;
+    py::array_t<int32_t> _factors({(py::ssize_t)factors.size(), (py::ssize_t)strand_count});
+    auto res = _factors.mutable_unchecked<2>();
+    for (size_t k = 0; k < factors.size(); k++) {
+        for (int p = 0; p < strand_count; p++) res(k, p) = factors[k][p];
+    }
+    return py::make_tuple(infimum, _factors);
+}
+
+
+// Booth's algorithm, see least_rotation in knpy/rotation.py
+template <typename T>
+int least_rotation_of(const T* s, const int n) {
+    if (n == 0) return 0;
+    std::vector<int> failure(2 * n, -1);
+    int k = 0;
+    for (int j = 1; j < 2 * n; j++) {
+        const T s_j = s[j % n];
+        int i = failure[j - k - 1];
+        while (i != -1 && s_j != s[(k + i + 1) % n]) {
+            if (s_j < s[(k + i + 1) % n]) k = j - i - 1;
+            i = failure[i];
+        }
+        if (s_j != s[(k + i + 1) % n]) {
+            if (s_j < s[k % n]) k = j;
+            failure[j - k] = -1;
+        } else {
+            failure[j - k] = i + 1;
+        }
+    }
+    return k % n;
+}
+
+int least_rotation(const array _inp) {
+    const auto inp = _inp.unchecked<1>();
+    py::gil_scoped_release release;
+    return least_rotation_of(inp.data(0), inp.size());
+}
+
+index_array least_rotations_batch(const batch_array _sigmas, const index_array _lengths, const int threads = 1) {
+    const auto sigmas = _sigmas.unchecked<2>();
+    const auto lengths = _lengths.unchecked<1>();
+    index_array _res(sigmas.shape(0));
+    auto res = _res.mutable_unchecked<1>();
+    {
+        py::gil_scoped_release release;
+        parallel_rows(sigmas.shape(0), threads, [&](const py::ssize_t begin, const py::ssize_t end) {
+            for (py::ssize_t r = begin; r < end; r++) {
+                res[r] = least_rotation_of(sigmas.data(r, 0), lengths[r]);
+            }
+        });
+    }
+    return _res;
+}
+
+
+
+// Writhe, strand permutation, number of components and generator counts, see knpy/stats.py. permutation must have
+// room for strand_count values and counts for 2 * (strand_count - 1), zeroed.
+template <typename T>
+long long stats_of(const T* s, const int n, const int strand_count, long long* permutation, long long* counts,
+                   long long& writhe) {
+    std::vector<int> strand_at(strand_count);
+    for (int p = 0; p < strand_count; p++) strand_at[p] = p;
+    writhe = 0;
+    for (int i = 0; i < n; i++) {
+        const int generator = abs((int)s[i]);
+        writhe += sign_of_non_zero(s[i]);
+        counts[2 * (generator - 1) + (s[i] < 0)]++;
+        std::swap(strand_at[generator - 1], strand_at[generator]);
+    }
+    for (int p = 0; p < strand_count; p++) permutation[strand_at[p]] = p;
+
+    long long components = 0;
+    std::vector<bool> visited(strand_count, false);
+    for (int start = 0; start < strand_count; start++) {
+        if (visited[start]) continue;
+        components++;
+        for (int p = start; !visited[p]; p = permutation[p]) visited[p] = true;
+    }
+    return components;
+}
+
+int checked_strand_count(const int largest, const int strand_count) {
+    if (strand_count < 0) return largest + 1;
+    if (strand_count <= largest) {
+        throw std::invalid_argument("The braid does not fit on " + std::to_string(strand_count) + " strands");
+    }
+    return strand_count;
+}
+
+py::tuple braid_stats(const array _inp, const int strand_count = -1) {
+    const auto inp = _inp.unchecked<1>();
+    const int n = inp.size();
+    int largest = 0;
+    for (int i = 0; i < n; i++) largest = std::max(largest, (int)std::abs(inp[i]));
+    const int strands = checked_strand_count(largest, strand_count);
+
+    index_array _permutation(strands);
+    index_array _counts({std::max(strands - 1, 0), 2});
+    std::fill(_counts.mutable_data(), _counts.mutable_data() + _counts.size(), 0);
+    long long* permutation = _permutation.mutable_data();
+    long long* counts = _counts.mutable_data();
+    long long writhe, components;
+    {
+        py::gil_scoped_release release;
+        components = stats_of(inp.data(0), n, strands, permutation, counts, writhe);
+    }
+    return py::make_tuple(writhe, _permutation, components, _counts);
+}
+
+py::tuple stats_batch(const batch_array _sigmas, const index_array _lengths, const int strand_count = -1,
+                      const int threads = 1) {
+    const auto sigmas = _sigmas.unchecked<2>();
+    const auto lengths = _lengths.unchecked<1>();
+    const py::ssize_t rows = sigmas.shape(0);
+    int largest = 0;
+    for (py::ssize_t r = 0; r < rows; r++) {
+        for (int i = 0; i < lengths[r]; i++) largest = std::max(largest, abs(sigmas(r, i)));
+    }
+    const int strands = checked_strand_count(largest, strand_count);
+
+    index_array _writhes(rows);
+    index_array _permutations({rows, (py::ssize_t)strands});
+    index_array _components(rows);
+    index_array _counts({rows, (py::ssize_t)std::max(strands - 1, 0), (py::ssize_t)2});
+    std::fill(_counts.mutable_data(), _counts.mutable_data() + _counts.size(), 0);
+    auto writhes = _writhes.mutable_unchecked<1>();
+    auto components = _components.mutable_unchecked<1>();
+    auto permutations = _permutations.mutable_unchecked<2>();
+    long long* counts = _counts.mutable_data();
+    const py::ssize_t row_counts = 2 * std::max(strands - 1, 0);
+    {
+        py::gil_scoped_release release;
+        parallel_rows(rows, threads, [&](const py::ssize_t begin, const py::ssize_t end) {
+            for (py::ssize_t r = begin; r < end; r++) {
+                long long writhe;
+                components[r] = stats_of(sigmas.data(r, 0), lengths[r], strands, permutations.mutable_data(r, 0),
+                                         counts + r * row_counts, writhe);
+                writhes[r] = writhe;
+            }
+        });
+    }
+    return py::make_tuple(_writhes, _permutations, _components, _counts);
+}
+
+// Greedy simplification, see knpy/reduction.py. Both work in place on the n sigmas of s and return the new length.
+template <typename T>
+int free_reduce_of(T* s, const int n) {
+    int top = 0;
     for (int i = 0; i < n; i++) {
-        if (i != index && i != (index+1)%n) {
-            res[cnt++] = inp[i];
+        if (top > 0 && s[top - 1] == -s[i]) top--;
+        else s[top++] = s[i];
+    }
+    int start = 0;
+    while (top - start >= 2 && s[start] == -s[top - 1]) {
+        start++;
+        top--;
+    }
+    std::copy(s + start, s + top, s);
+    return top - start;
+}
+
+template <typename T>
+int simplify_greedy_of(T* s, int n) {
+    n = free_reduce_of(s, n);
+    while (n > 0) {
+        int largest = 0, top_count = 0, top_index = -1;
+        for (int i = 0; i < n; i++) {
+            const int generator = abs((int)s[i]);
+            largest = std::max(largest, generator);
+            if (generator == 1) {
+                top_count++;
+                top_index = i;
+            }
+        }
+        int bottom_count = 0, bottom_index = -1;
+        for (int i = 0; i < n; i++) {
+            if (abs((int)s[i]) == largest) {
+                bottom_count++;
+                bottom_index = i;
+            }
+        }
+        // Destabilization on top if it is performable, else at the bottom
+        const bool on_top = top_count == 1;
+        if (!on_top && bottom_count != 1) break;
+        const int index = on_top ? top_index : bottom_index;
+        for (int i = index; i < n - 1; i++) s[i] = s[i + 1];
+        n--;
+        if (on_top) {
+            for (int i = 0; i < n; i++) s[i] -= sign_of_non_zero(s[i]);
         }
+        n = free_reduce_of(s, n);
     }
+    return n;
+}
+
+template <typename Reduce>
+array reduced(const array _inp, Reduce reduce) {
+    const auto inp = _inp.unchecked<1>();
+    std::vector<sigma_t> s(inp.size());
+    int n;
+    {
+        py::gil_scoped_release release;
+        for (py::ssize_t i = 0; i < inp.size(); i++) s[i] = inp[i];
+        n = reduce(s.data(), (int)s.size());
+    }
+    array _res(n);
+    std::copy(s.begin(), s.begin() + n, _res.mutable_data());
     return _res;
 }
 
+array free_reduce(const array _inp) {
+    return reduced(_inp, free_reduce_of<sigma_t>);
+}
+
+array simplify_greedy(const array _inp) {
+    return reduced(_inp, simplify_greedy_of<sigma_t>);
+}
+
+py::tuple simplify_batch(const batch_array _sigmas, const index_array _lengths, const bool destabilize = true,
+                         const int threads = 1) {
+    const auto sigmas = _sigmas.unchecked<2>();
+    const auto lengths = _lengths.unchecked<1>();
+    const py::ssize_t rows = sigmas.shape(0), capacity = sigmas.shape(1);
+    batch_array _res({rows, capacity});
+    index_array _res_lengths(rows);
+    auto res_lengths = _res_lengths.mutable_unchecked<1>();
+    // Both matrices are C contiguous
+    const sigma_t* inp = _sigmas.data();
+    sigma_t* res = _res.mutable_data();
+    {
+        py::gil_scoped_release release;
+        parallel_rows(rows, threads, [&](const py::ssize_t begin, const py::ssize_t end) {
+            for (py::ssize_t r = begin; r < end; r++) {
+                sigma_t* row = res + r * capacity;
+                std::copy(inp + r * capacity, inp + (r + 1) * capacity, row);
+                const int n = destabilize ? simplify_greedy_of(row, lengths[r]) : free_reduce_of(row, lengths[r]);
+                std::fill(row + n, row + capacity, 0);
+                res_lengths[r] = n;
+            }
+        });
+    }
+    return py::make_tuple(_res, _res_lengths);
+}
+
+// Braid owning its sigmas and strand count, the moves are the ones of `apply_move_row` (so the same as the batched
+// moves and as `knpy.braid_vec.Braid`). Moves return new braids without going through NumPy, which keeps a move well
+// under a microsecond.
+class NativeBraid {
+public:
+    std::vector<sigma_t> sigmas;
+    int strand_count = 1;
+
+    explicit NativeBraid(std::vector<sigma_t> s) : sigmas(std::move(s)) {
+        for (const sigma_t sigma : sigmas) {
+            if (sigma == 0) throw std::invalid_argument("Invalid braid, should not contain zero");
+            strand_count = std::max(strand_count, abs(sigma) + 1);
+        }
+    }
+
+    // Accepts any integers (e.g. a list), construction is not on the hot path.
+    static NativeBraid from_array(const index_array _inp) {
+        if (_inp.ndim() != 1) throw std::invalid_argument("The sigmas should be one dimensional");
+        std::vector<sigma_t> s(_inp.size());
+        for (py::ssize_t i = 0; i < _inp.size(); i++) {
+            const long long sigma = _inp.data()[i];
+            if (std::abs(sigma) > std::numeric_limits<sigma_t>::max()) {
+                throw std::invalid_argument("Sigma " + std::to_string(sigma) + " does not fit in int16");
+            }
+            s[i] = sigma;
+        }
+        return NativeBraid(std::move(s));
+    }
+
+    int size() const {
+        return sigmas.size();
+    }
+
+    batch_array notation() const {
+        batch_array _res(sigmas.size());
+        std::copy(sigmas.begin(), sigmas.end(), _res.mutable_data());
+        return _res;
+    }
+
+    NativeBraid apply(const long long move, const long long index, const long long value = 0) const {
+        std::vector<sigma_t> res(sigmas.size() + 2);
+        const int n = apply_move_row(sigmas.data(), size(), strand_count, move, index, value, res.data());
+        if (n < 0) {
+            const std::string name = 0 <= move && move < MOVE_COUNT ? MOVE_NAMES[move] : std::to_string(move);
+            throw IllegalTransformationException(name + " is not performable at index " + std::to_string(index)
+                                                 + " with value " + std::to_string(value));
+        }
+        res.resize(n);
+        return NativeBraid(std::move(res));
+    }
+
+    // Every performable move as a (move, index, value) row, in the order of `performable_moves` of the Python braids:
+    // destabilizations, stabilizations, conjugations, braid relations 1 and 2, sigma inverse pair removals.
+    index_array performable_moves() const {
+        const int n = size();
+        std::vector<long long> rows;
+        auto add = [&rows](const long long move, const long long index, const long long value) {
+            rows.insert(rows.end(), {move, index, value});
+        };
+        for (int i = 0; i < n; i++) {
+            if (destabilization_performable_at(sigmas, n, i, strand_count)) add(DESTABILIZATION, i, 0);
+        }
+        for (int i = 0; i <= n; i++) {
+            for (const int value : {0, 1, 2, 3}) add(STABILIZATION, i, value);
+        }
+        for (int value = 1 - strand_count; value < strand_count; value++) {
+            if (value == 0) continue;
+            for (int i = 0; i <= n + 1; i++) add(CONJUGATION, i, value);
+        }
+        for (int i = 0; i < n; i++) {
+            if (braid_relation1_performable_at(sigmas, n, i)) add(BRAID_RELATION1, i, 0);
+        }
+        for (int i = 0; i < n; i++) {
+            if (braid_relation2_performable_at(sigmas, n, i)) add(BRAID_RELATION2, i, 0);
+        }
+        for (int i = 0; i < n; i++) {
+            if (remove_sigma_inverse_pair_performable_at(sigmas, n, i)) add(REMOVE_SIGMA_INVERSE_PAIR, i, 0);
+        }
+        index_array _res({(py::ssize_t)rows.size() / 3, (py::ssize_t)3});
+        std::copy(rows.begin(), rows.end(), _res.mutable_data());
+        return _res;
+    }
+
+    template <typename Performable>
+    index_array performable_indices(Performable performable) const {
+        std::vector<long long> indices;
+        for (int i = 0; i < size(); i++) {
+            if (performable(i)) indices.push_back(i);
+        }
+        index_array _res(indices.size());
+        std::copy(indices.begin(), indices.end(), _res.mutable_data());
+        return _res;
+    }
+
+    template <typename Reduce>
+    NativeBraid reduced(Reduce reduce) const {
+        std::vector<sigma_t> res = sigmas;
+        res.resize(reduce(res.data(), size()));
+        return NativeBraid(std::move(res));
+    }
+
+    NativeBraid canonical_rotation() const {
+        const int amount = least_rotation_of(sigmas.data(), size());
+        std::vector<sigma_t> res(sigmas.begin() + amount, sigmas.end());
+        res.insert(res.end(), sigmas.begin(), sigmas.begin() + amount);
+        return NativeBraid(std::move(res));
+    }
+
+    bool operator==(const NativeBraid& other) const {
+        return strand_count == other.strand_count && sigmas == other.sigmas;
+    }
+
+    // FNV-1a of the sigmas, the same in every process
+    py::ssize_t hash() const {
+        unsigned long long h = 14695981039346656037ULL;
+        for (const sigma_t sigma : sigmas) {
+            h ^= (unsigned long long)(uint16_t)sigma;
+            h *= 1099511628211ULL;
+        }
+        return (py::ssize_t)(h >> 1);
+    }
+
+    std::string repr() const {
+        std::string res = "NativeBraid([";
+        for (size_t i = 0; i < sigmas.size(); i++) res += (i ? ", " : "") + std::to_string(sigmas[i]);
+        return res + "])";
+    }
+};
 
 PYBIND11_MODULE(braid_cpp_impl, m) {
     m.doc() = "Braid C++ implementation";
-    py::register_exception<IllegalTransformationException>(m, "IllegalTransformationException");
+    // A subclass of knpy.exceptions.IllegalTransformationException when the package is importable, so errors of the
+    // native braid are caught like the ones of the Python braids.
+    py::object exception_base = py::reinterpret_borrow<py::object>(PyExc_Exception);
+    try {
+        exception_base = py::module_::import("knpy.exceptions").attr("IllegalTransformationException");
+    } catch (py::error_already_set&) {
+        PyErr_Clear();
+    }
+    py::register_exception<IllegalTransformationException>(m, "IllegalTransformationException", exception_base);
 
     // Based on this example https://pybind11.readthedocs.io/en/stable/basics.html#default-arguments the third parameter defines 
     // the description of the function, however we couldn't find any specific documentation of this behaviour
-    m.def("shift_left", &shift_left, "Shift left implementation");
-    m.def("shift_right", &shift_right, "Shift right implementation");
-    m.def("is_braid_relation1_performable", &is_braid_relation1_performable, "Is braid relation #1 performable implementation");
-    m.def("braid_relation1_performable_indices", &braid_relation1_performable_indices, "Braid relation #1 performable indices implementation");
-    m.def("braid_relation1", &braid_relation1, "Braid relation #1 implementation");
-    m.def("is_braid_relation2_performable", &is_braid_relation2_performable, "Is braid relation #2 performable implementation");
-    m.def("braid_relation2_performable_indices", &braid_relation2_performable_indices, "Braid relation #2 performable indices implementation");
-    m.def("braid_relation2", &braid_relation2, "Braid relation #2 implementation");
-    m.def("conjugation", &conjugation, "Conjugation implementation");
-    m.def("stabilization", &stabilization, "Stabilization implementation");
-    m.def("is_destabilization_performable", &is_destabilization_performable, "Is destabilization performable");
-    m.def("destabilization", &destabilization, "Destabilization implementation");
-    m.def("is_remove_sigma_inverse_pair_performable", &is_remove_sigma_inverse_pair_performable, "Is remove sigma inverse pair performable implementation");
-    m.def("remove_sigma_inverse_pair_performable_indices", &remove_sigma_inverse_pair_performable_indices, "Remove sigma inverse pair performable indices implementation");
-    m.def("remove_sigma_inverse_pair", &remove_sigma_inverse_pair, "Remove sigma inverse pair implementation");
+    // Sigma arguments are noconvert: only C contiguous int16 arrays are accepted, see sigma_t.
+    const auto sigmas = py::arg("sigmas").noconvert();
+    m.def("shift_left", &shift_left, "Shift left implementation", sigmas, py::arg("amount") = 1);
+    m.def("shift_right", &shift_right, "Shift right implementation", sigmas, py::arg("amount") = 1);
+    m.def("is_braid_relation1_performable", &is_braid_relation1_performable,
+          "Is braid relation #1 performable implementation", sigmas, py::arg("index"));
+    m.def("braid_relation1_performable_indices", &braid_relation1_performable_indices,
+          "Braid relation #1 performable indices implementation", sigmas);
+    m.def("braid_relation1", &braid_relation1, "Braid relation #1 implementation", sigmas, py::arg("index"));
+    m.def("is_braid_relation2_performable", &is_braid_relation2_performable,
+          "Is braid relation #2 performable implementation", sigmas, py::arg("index"));
+    m.def("braid_relation2_performable_indices", &braid_relation2_performable_indices,
+          "Braid relation #2 performable indices implementation", sigmas);
+    m.def("braid_relation2", &braid_relation2, "Braid relation #2 implementation", sigmas, py::arg("index"));
+    m.def("conjugation", &conjugation, "Conjugation implementation", sigmas, py::arg("value"), py::arg("index"));
+    m.def("stabilization", &stabilization, "Stabilization implementation", sigmas, py::arg("index"),
+          py::arg("on_top"), py::arg("inverse"), py::arg("strand_count"));
+    m.def("is_destabilization_performable", &is_destabilization_performable, "Is destabilization performable",
+          sigmas, py::arg("index"), py::arg("strand_count"));
+    m.def("destabilization_performable_indices", &destabilization_performable_indices,
+          "Destabilization performable indices implementation", sigmas, py::arg("strand_count"));
+    m.def("destabilization", &destabilization, "Destabilization implementation", sigmas, py::arg("index"),
+          py::arg("strand_count"));
+    m.def("is_remove_sigma_inverse_pair_performable", &is_remove_sigma_inverse_pair_performable,
+          "Is remove sigma inverse pair performable implementation", sigmas, py::arg("index"));
+    m.def("remove_sigma_inverse_pair_performable_indices", &remove_sigma_inverse_pair_performable_indices,
+          "Remove sigma inverse pair performable indices implementation", sigmas);
+    m.def("remove_sigma_inverse_pair", &remove_sigma_inverse_pair, "Remove sigma inverse pair implementation",
+          sigmas, py::arg("index"));
+    m.def("apply_moves_batch", &apply_moves_batch, "Apply one move to every row of a padded sigma matrix",
+          sigmas, py::arg("lengths"), py::arg("moves"), py::arg("indices"), py::arg("values"),
+          py::arg("threads") = 1);
+    m.def("left_normal_form", &left_normal_form, "Garside left normal form implementation", sigmas,
+          py::arg("strand_count"));
+    m.def("least_rotation", &least_rotation, "Least rotation implementation", sigmas);
+    m.def("least_rotations_batch", &least_rotations_batch, "Least rotation of every row of a padded sigma matrix",
+          sigmas, py::arg("lengths"), py::arg("threads") = 1);
+    m.def("braid_stats", &braid_stats, "Writhe, permutation, component count and generator counts of a braid",
+          sigmas, py::arg("strand_count") = -1);
+    m.def("stats_batch", &stats_batch, "Braid stats of every row of a padded sigma matrix",
+          sigmas, py::arg("lengths"), py::arg("strand_count") = -1, py::arg("threads") = 1);
+    m.def("free_reduce", &free_reduce, "Cancels all sigma inverse pairs, including the last and first sigma", sigmas);
+    m.def("simplify_greedy", &simplify_greedy, "Free reduction and destabilizations until neither is possible",
+          sigmas);
+    m.def("simplify_batch", &simplify_batch, "Greedy simplification of every row of a padded sigma matrix",
+          sigmas, py::arg("lengths"), py::arg("destabilize") = true, py::arg("threads") = 1);
+
+    py::class_<NativeBraid>(m, "NativeBraid", "Braid owning its sigmas, with the moves of knpy.braid_vec.Braid")
+        .def(py::init(&NativeBraid::from_array), py::arg("sigmas"))
+        .def("notation", &NativeBraid::notation, "Copy of the sigmas")
+        .def_property_readonly("strand_count", [](const NativeBraid& b) { return b.strand_count; })
+        .def("__len__", &NativeBraid::size)
+        .def("apply", &NativeBraid::apply, "Performs a move of knpy.braid_batch.Move",
+             py::arg("move"), py::arg("index"), py::arg("value") = 0)
+        .def("shift_left", [](const NativeBraid& b, const int amount) { return b.apply(SHIFT_LEFT, amount); },
+             py::arg("amount") = 1)
+        .def("shift_right", [](const NativeBraid& b, const int amount) { return b.apply(SHIFT_RIGHT, amount); },
+             py::arg("amount") = 1)
+        .def("braid_relation1", [](const NativeBraid& b, const int index) { return b.apply(BRAID_RELATION1, index); },
+             py::arg("index"))
+        .def("braid_relation2", [](const NativeBraid& b, const int index) { return b.apply(BRAID_RELATION2, index); },
+             py::arg("index"))
+        .def("conjugation",
+             [](const NativeBraid& b, const int value, const int index) { return b.apply(CONJUGATION, index, value); },
+             py::arg("value"), py::arg("index"))
+        .def("stabilization",
+             [](const NativeBraid& b, const int index, const bool on_top, const bool inverse) {
+                 return b.apply(STABILIZATION, index, 2 * on_top + inverse);
+             },
+             py::arg("index"), py::arg("on_top") = false, py::arg("inverse") = false)
+        .def("destabilization", [](const NativeBraid& b, const int index) { return b.apply(DESTABILIZATION, index); },
+             py::arg("index"))
+        .def("remove_sigma_inverse_pair",
+             [](const NativeBraid& b, const int index) { return b.apply(REMOVE_SIGMA_INVERSE_PAIR, index); },
+             py::arg("index"))
+        .def("is_braid_relation1_performable",
+             [](const NativeBraid& b, const int index) {
+                 return 0 <= index && index < b.size() && braid_relation1_performable_at(b.sigmas, b.size(), index);
+             },
+             py::arg("index"))
+        .def("is_braid_relation2_performable",
+             [](const NativeBraid& b, const int index) {
+                 return 0 <= index && index < b.size() && braid_relation2_performable_at(b.sigmas, b.size(), index);
+             },
+             py::arg("index"))
+        .def("is_destabilization_performable",
+             [](const NativeBraid& b, const int index) {
+                 return destabilization_performable_at(b.sigmas, b.size(), index, b.strand_count);
+             },
+             py::arg("index"))
+        .def("is_remove_sigma_inverse_pair_performable",
+             [](const NativeBraid& b, const int index) {
+                 return remove_sigma_inverse_pair_performable_at(b.sigmas, b.size(), index);
+             },
+             py::arg("index"))
+        .def("braid_relation1_performable_indices", [](const NativeBraid& b) {
+            return b.performable_indices(
+                [&b](const int i) { return braid_relation1_performable_at(b.sigmas, b.size(), i); });
+        })
+        .def("braid_relation2_performable_indices", [](const NativeBraid& b) {
+            return b.performable_indices(
+                [&b](const int i) { return braid_relation2_performable_at(b.sigmas, b.size(), i); });
+        })
+        .def("destabilization_performable_indices", [](const NativeBraid& b) {
+            return b.performable_indices(
+                [&b](const int i) { return destabilization_performable_at(b.sigmas, b.size(), i, b.strand_count); });
+        })
+        .def("remove_sigma_inverse_pair_performable_indices", [](const NativeBraid& b) {
+            return b.performable_indices(
+                [&b](const int i) { return remove_sigma_inverse_pair_performable_at(b.sigmas, b.size(), i); });
+        })
+        .def("performable_moves", &NativeBraid::performable_moves,
+             "Every performable move as a (move, index, value) row of an (k, 3) array")
+        .def("free_reduce", [](const NativeBraid& b) { return b.reduced(free_reduce_of<sigma_t>); })
+        .def("simplify_greedy", [](const NativeBraid& b) { return b.reduced(simplify_greedy_of<sigma_t>); })
+        .def("canonical_rotation", &NativeBraid::canonical_rotation)
+        .def("__eq__", [](const NativeBraid& b, const NativeBraid& other) { return b == other; }, py::is_operator())
+        .def("__hash__", &NativeBraid::hash)
+        .def("__repr__", &NativeBraid::repr)
+        .def(py::pickle([](const NativeBraid& b) { return b.notation(); },
+                        [](const array sigmas) {
+                            return NativeBraid(std::vector<sigma_t>(sigmas.data(), sigmas.data() + sigmas.size()));
+                        }));
 }
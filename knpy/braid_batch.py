@@ -0,0 +1,449 @@
+import os as _os
+from enum import IntEnum
+from typing import Callable, Sequence
+import numpy as np
+from .braid import Braid, SIGMA_DTYPE, as_sigma_array
+from . import alexander, braid_vec, burau, garside, jones
+from .braid_key import BraidKey, batch_keys
+from .polynomial import LaurentPolynomial
+from .reduction import batch_simplify
+from .rotation import batch_least_rotations
+from .stats import BatchStats, batch_stats
+from .exceptions import IllegalTransformationException
+
+_USE_CPP = _os.environ.get("KNPY_FAST_BRAID", default="no").lower() in ["on", "yes", "true", "1"]
+# Number of threads the C++ batch kernels split the rows of large batches over, 0 means one per core.
+_THREADS = int(_os.environ.get("KNPY_THREADS", default="1"))
+
+
+class Move(IntEnum):
+    """
+    Identifiers of the braid moves that can be applied to a `BraidBatch`. The meaning of the `index` and `value` of an
+    action depends on the move:
+
+    SHIFT_LEFT, SHIFT_RIGHT: index is the amount, in the range [0, k) where k is the number of crossings.
+    BRAID_RELATION1, BRAID_RELATION2, DESTABILIZATION, REMOVE_SIGMA_INVERSE_PAIR: index as in the corresponding
+        `Braid` member function, in the range [0, k).
+    CONJUGATION: index in the range [0, k + 1] and value is the inserted sigma, in the range (-n, n) and not zero.
+    STABILIZATION: index in the range [0, k] and value is `2 * on_top + inverse` (so in the range [0, 4)).
+    """
+
+    SHIFT_LEFT = 0
+    SHIFT_RIGHT = 1
+    BRAID_RELATION1 = 2
+    BRAID_RELATION2 = 3
+    CONJUGATION = 4
+    STABILIZATION = 5
+    DESTABILIZATION = 6
+    REMOVE_SIGMA_INVERSE_PAIR = 7
+
+
+def _gather(sigmas: np.ndarray, source: np.ndarray) -> np.ndarray:
+    """
+    Builds rows from `sigmas`, the j-th element of a result row is `sigmas[row, source[row, j]]`, or padding when
+    `source[row, j]` is negative.
+    """
+    gathered = np.take_along_axis(sigmas, np.clip(source, 0, sigmas.shape[1] - 1), axis=1)
+    gathered[source < 0] = 0
+    return gathered
+
+
+def _at(sigmas: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """
+    Returns `sigmas[row, positions[row]]` for every row.
+    """
+    return sigmas[np.arange(sigmas.shape[0]), positions]
+
+
+def strand_counts_of(sigmas: np.ndarray) -> np.ndarray:
+    """
+    Returns the strand counts of the braids of a (N, capacity) padded sigma matrix.
+    """
+    if sigmas.shape[1] == 0:
+        return np.ones(sigmas.shape[0], dtype=np.int64)
+    return np.abs(sigmas).max(axis=1).astype(np.int64) + 1
+
+
+# Every move below works on the rows of a batch where the same move is applied. Arguments:
+# sigmas: (k, capacity) padded sigmas, lengths: (k,), strands: (k,), index: (k,), value: (k,), columns: (1, capacity')
+# Each returns the mask of rows where the move is performable, the transformed rows and their lengths.
+
+
+def _shift(sigmas, lengths, strands, index, value, columns, *, direction):
+    # pylint: disable=unused-argument
+    legal = (0 <= index) & (index < lengths)
+    safe_lengths = np.maximum(lengths, 1)[:, None]
+    source = (columns + direction * index[:, None]) % safe_lengths
+    source[columns >= lengths[:, None]] = -1
+    return legal, _gather(sigmas, source), lengths
+
+
+def _braid_relation1(sigmas, lengths, strands, index, value, columns):
+    # pylint: disable=unused-argument
+    legal = (lengths >= 3) & (0 <= index) & (index < lengths)
+    safe_lengths = np.maximum(lengths, 1)
+    positions = [(index + i) % safe_lengths for i in range(3)]
+    a, b, c = (_at(sigmas, p) for p in positions)
+    legal &= (np.abs(a) == np.abs(c)) & (np.abs(np.abs(b) - np.abs(a)) == 1)
+    legal &= ~((np.sign(b) != np.sign(a)) & (np.sign(b) != np.sign(c)))
+
+    rows = np.arange(sigmas.shape[0])
+    transformed = sigmas.copy()
+    transformed[rows, positions[0]] = np.sign(c) * np.abs(b)
+    transformed[rows, positions[1]] = np.sign(b) * np.abs(a)
+    transformed[rows, positions[2]] = np.sign(a) * np.abs(b)
+    return legal, transformed, lengths
+
+
+def _braid_relation2(sigmas, lengths, strands, index, value, columns):
+    # pylint: disable=unused-argument
+    legal = (0 <= index) & (index < lengths)
+    safe_lengths = np.maximum(lengths, 1)
+    first, second = index % safe_lengths, (index + 1) % safe_lengths
+    legal &= np.abs(np.abs(_at(sigmas, first)) - np.abs(_at(sigmas, second))) >= 2
+
+    source = np.broadcast_to(columns, (sigmas.shape[0], columns.shape[1])).copy()
+    rows = np.arange(sigmas.shape[0])
+    source[rows, first], source[rows, second] = second, first
+    return legal, _gather(sigmas, source), lengths
+
+
+def _conjugation(sigmas, lengths, strands, index, value, columns):
+    legal = (value != 0) & (np.abs(value) < strands) & (0 <= index) & (index <= lengths + 1)
+    wrap = index == lengths + 1
+    inner_index = np.where(wrap, 0, index)[:, None]
+    source = np.where(wrap[:, None], columns - 1, columns - 2 * (columns >= inner_index + 2))
+    source[columns >= lengths[:, None] + 2] = -1
+    transformed = _gather(sigmas, source)
+
+    rows = np.arange(sigmas.shape[0])
+    first = np.where(wrap, lengths + 1, index).clip(0, columns.shape[1] - 1)
+    second = np.where(wrap, 0, index + 1).clip(0, columns.shape[1] - 1)
+    transformed[rows, first] = value
+    transformed[rows, second] = -value
+    return legal, transformed, lengths + 2
+
+
+def _stabilization(sigmas, lengths, strands, index, value, columns):
+    legal = (0 <= index) & (index <= lengths) & (0 <= value) & (value < 4)
+    on_top = (value & 2) != 0
+    new_sigma = np.where((value & 1) != 0, -1, 1) * np.where(on_top, 1, strands)
+
+    source = columns - (columns > index[:, None])
+    source[columns > lengths[:, None]] = -1
+    transformed = _gather(sigmas, source)
+    transformed += np.where(on_top[:, None], np.sign(transformed), 0).astype(transformed.dtype)
+    transformed[np.arange(sigmas.shape[0]), index.clip(0, columns.shape[1] - 1)] = new_sigma
+    return legal, transformed, lengths + 1
+
+
+def _destabilization(sigmas, lengths, strands, index, value, columns):
+    # pylint: disable=unused-argument
+    legal = (0 <= index) & (index < lengths)
+    absolute = np.abs(sigmas)
+    removed = np.abs(_at(sigmas, index.clip(0, sigmas.shape[1] - 1)))
+    bottom = (removed == strands - 1) & ((absolute == (strands - 1)[:, None]).sum(axis=1) == 1)
+    top = (removed == 1) & ((absolute == 1).sum(axis=1) == 1)
+    legal &= bottom | top
+
+    source = columns + (columns >= index[:, None])
+    source[columns >= (lengths - 1)[:, None]] = -1
+    transformed = _gather(sigmas, source)
+    transformed -= np.where((removed == 1)[:, None], np.sign(transformed), 0).astype(transformed.dtype)
+    return legal, transformed, lengths - 1
+
+
+def _remove_sigma_inverse_pair(sigmas, lengths, strands, index, value, columns):
+    # pylint: disable=unused-argument
+    legal = (0 <= index) & (index < lengths)
+    safe_lengths = np.maximum(lengths, 1)
+    legal &= _at(sigmas, index % safe_lengths) == -_at(sigmas, (index + 1) % safe_lengths)
+
+    wrap = (index == lengths - 1)[:, None]
+    source = np.where(wrap, columns + 1, columns + 2 * (columns >= index[:, None]))
+    source[columns >= (lengths - 2)[:, None]] = -1
+    return legal, _gather(sigmas, source), lengths - 2
+
+
+_MOVE_IMPLEMENTATIONS = {
+    Move.SHIFT_LEFT: lambda *args: _shift(*args, direction=1),
+    Move.SHIFT_RIGHT: lambda *args: _shift(*args, direction=-1),
+    Move.BRAID_RELATION1: _braid_relation1,
+    Move.BRAID_RELATION2: _braid_relation2,
+    Move.CONJUGATION: _conjugation,
+    Move.STABILIZATION: _stabilization,
+    Move.DESTABILIZATION: _destabilization,
+    Move.REMOVE_SIGMA_INVERSE_PAIR: _remove_sigma_inverse_pair,
+}
+
+
+def notation_of(braid: Braid | braid_vec.Braid | np.ndarray | list[int] | str) -> np.ndarray:
+    """
+    Returns the sigmas of a braid of either `Braid` implementation (without copying), or of anything the `Braid`
+    constructor accepts.
+    """
+    if isinstance(braid, (Braid, braid_vec.Braid)):
+        return braid.notation(copy=False)
+    return Braid(braid).notation(copy=False)
+
+
+class BraidBatch:
+    def __init__(
+        self,
+        braids: Sequence[Braid | braid_vec.Braid | np.ndarray | list[int] | str],
+        capacity: int | None = None,
+    ):
+        """
+        Init BraidBatch class, holding N braids in one padded sigma matrix of shape (N, capacity) and a vector of
+        lengths. Padding is zero, which is never a valid sigma.
+
+        braids: sequence of braids, each given as a `Braid` of either implementation or anything the `Braid`
+            constructor accepts.
+        capacity: number of columns of the sigma matrix, at least the length of the longest braid. Reserving more
+            columns avoids reallocation when moves make the braids longer.
+        """
+        notations = [notation_of(b) for b in braids]
+        lengths = np.array([len(notation) for notation in notations], dtype=np.int64)
+        longest = int(lengths.max()) if len(notations) > 0 else 0
+        if capacity is None:
+            capacity = longest
+        if capacity < longest:
+            raise ValueError(f"Capacity ({capacity}) is smaller than the longest braid ({longest})")
+
+        self._sigmas = np.zeros((len(notations), capacity), dtype=SIGMA_DTYPE)
+        for row, notation in enumerate(notations):
+            self._sigmas[row, : len(notation)] = notation
+        self._lengths = lengths
+        self._n = strand_counts_of(self._sigmas)
+
+    @classmethod
+    def from_padded(cls, sigmas: np.ndarray, lengths: np.ndarray, copy_sigmas: bool = True) -> "BraidBatch":
+        """
+        Creates a batch directly from a padded sigma matrix and the lengths of the rows. Elements after the length of
+        a row must be zero. Without copy_sigmas the matrix is only copied if it is not a C contiguous SIGMA_DTYPE
+        array, the layout the C++ kernels take. Raises InvalidBraidException if a sigma does not fit in SIGMA_DTYPE.
+        """
+        obj = cls.__new__(cls)
+        obj._sigmas = as_sigma_array(sigmas, copy=copy_sigmas)
+        obj._lengths = np.asarray(lengths, dtype=np.int64)
+        obj._n = strand_counts_of(obj._sigmas)
+        return obj
+
+    @property
+    def sigmas(self) -> np.ndarray:
+        """
+        Padded sigma matrix of shape (N, capacity), should not be modified
+        """
+        return self._sigmas
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return self._lengths
+
+    @property
+    def strand_counts(self) -> np.ndarray:
+        return self._n
+
+    @property
+    def capacity(self) -> int:
+        return self._sigmas.shape[1]
+
+    def __len__(self) -> int:
+        return self._sigmas.shape[0]
+
+    def __getitem__(self, row: int) -> Braid:
+        return Braid(self._sigmas[row, : self._lengths[row]].copy(), copy_sigmas=False)
+
+    def to_braids(self) -> list[Braid]:
+        return [self[row] for row in range(len(self))]
+
+    def keys(self) -> list[BraidKey]:
+        """
+        Returns the `BraidKey` of every braid of the batch, the i-th key equals `self[i].key()`.
+        """
+        return batch_keys(self._sigmas, self._lengths)
+
+    def canonical_rotations(self) -> tuple["BraidBatch", np.ndarray]:
+        """
+        Rotates every braid of the batch to its lexicographically least rotation, see `Braid.canonical_rotation`.
+
+        Returns: the rotated batch and the amounts the braids were shifted left by.
+        """
+        if _USE_CPP:
+            from . import braid_cpp_impl as B  # pylint: disable=import-outside-toplevel
+
+            amounts = B.least_rotations_batch(self._sigmas, self._lengths, _THREADS)
+        else:
+            amounts = batch_least_rotations(self._sigmas, self._lengths)
+        # Shifting an empty braid is not performable, those rows are left unchanged.
+        rotated, _ = self.apply(np.full(len(self), Move.SHIFT_LEFT), amounts)
+        return rotated, amounts
+
+    def free_reduce(self) -> "BraidBatch":
+        """
+        Applies `Braid.free_reduce` to every braid of the batch, the capacity is kept.
+        """
+        return self._simplify(destabilize=False)
+
+    def simplify_greedy(self) -> "BraidBatch":
+        """
+        Applies `Braid.simplify_greedy` to every braid of the batch, the capacity is kept.
+        """
+        return self._simplify(destabilize=True)
+
+    def _simplify(self, destabilize: bool) -> "BraidBatch":
+        if _USE_CPP:
+            from . import braid_cpp_impl as B  # pylint: disable=import-outside-toplevel
+
+            sigmas, lengths = B.simplify_batch(self._sigmas, self._lengths, destabilize, _THREADS)
+        else:
+            sigmas, lengths = batch_simplify(self._sigmas, self._lengths, destabilize)
+        return BraidBatch.from_padded(sigmas, lengths, copy_sigmas=False)
+
+    def normal_form_keys(self) -> list[BraidKey]:
+        """
+        Returns the `Braid.normal_form_key` of every braid of the batch, equal keys mean equal braids (in the braid
+        group) even if their notations differ.
+        """
+        left_normal_form: Callable[[np.ndarray, int], tuple[int, np.ndarray]]
+        if _USE_CPP:
+            from . import braid_cpp_impl as B  # pylint: disable=import-outside-toplevel
+
+            left_normal_form = B.left_normal_form
+        else:
+            left_normal_form = garside.left_normal_form
+        keys = []
+        for row in range(len(self)):
+            strand_count = int(self._n[row])
+            infimum, factors = left_normal_form(self._sigmas[row, : self._lengths[row]], strand_count)
+            keys.append(BraidKey(garside.normal_form_key_sigmas(infimum, factors, strand_count)))
+        return keys
+
+    def stats(self, strand_count: int | None = None) -> BatchStats:
+        """
+        Returns the `Braid.stats` of every braid of the batch, all on strand_count strands (by default the largest
+        strand count of the batch), see `knpy.stats.batch_stats`.
+        """
+        if _USE_CPP:
+            from . import braid_cpp_impl as B  # pylint: disable=import-outside-toplevel
+
+            strand_count = -1 if strand_count is None else strand_count
+            return BatchStats(*B.stats_batch(self._sigmas, self._lengths, strand_count, _THREADS))
+        return batch_stats(self._sigmas, self._lengths, strand_count)
+
+    def burau_matrices(self, t: complex, reduced: bool = True) -> np.ndarray:
+        """
+        Returns the (reduced) Burau matrices of the braids at t, all on the largest strand count of the batch, stacked
+        in an array of shape (N, n, n) (or (N, n - 1, n - 1) when reduced), see `knpy.burau.batch_burau`.
+        """
+        strand_count = int(self._n.max(initial=1))
+        return burau.batch_burau(self._sigmas, self._lengths, t, strand_count, reduced)
+
+    def alexander_polynomials(self) -> list[LaurentPolynomial]:
+        """
+        Returns the `Braid.alexander_polynomial` of every braid of the batch (computed once per distinct rotation class
+        thanks to the cache).
+        """
+        return [
+            alexander.alexander_polynomial(self._sigmas[row, : self._lengths[row]], int(self._n[row]))
+            for row in range(len(self))
+        ]
+
+    def jones_polynomials(self) -> list[LaurentPolynomial]:
+        """
+        Returns the `Braid.jones_polynomial` of every braid of the batch (computed once per distinct rotation class
+        thanks to the cache).
+        """
+        return [
+            jones.jones_polynomial(self._sigmas[row, : self._lengths[row]], int(self._n[row]))
+            for row in range(len(self))
+        ]
+
+    def unique(self) -> tuple["BraidBatch", np.ndarray, np.ndarray]:
+        """
+        Removes duplicate braids from the batch, keeping the first occurrence of each.
+
+        Returns: the batch of distinct braids (in order of first occurrence), the rows of the batch they come from and
+        for every row of the batch the row of the distinct batch it equals.
+        """
+        # Padding is zero, which is never a sigma, so equal padded rows mean equal braids.
+        _, first, inverse = np.unique(self._sigmas, axis=0, return_index=True, return_inverse=True)
+        order = np.argsort(first)
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        rows = first[order]
+        distinct = BraidBatch.from_padded(self._sigmas[rows], self._lengths[rows], copy_sigmas=False)
+        return distinct, rows, rank[inverse.reshape(-1)]
+
+    def apply(
+        self,
+        moves: np.ndarray | Sequence[int],
+        indices: np.ndarray | Sequence[int],
+        values: np.ndarray | Sequence[int] | None = None,
+        strict: bool = False,
+    ) -> tuple["BraidBatch", np.ndarray]:
+        """
+        Applies the action `(moves[i], indices[i], values[i])` to the i-th braid of the batch. See `Move` for the
+        meaning of indices and values. Rows where the move is not performable are left unchanged.
+
+        strict: raise `IllegalTransformationException` if any of the moves is not performable.
+        Returns: the transformed batch and a boolean array telling which moves were performed.
+        """
+        moves = np.broadcast_to(np.asarray(moves, dtype=np.int64), (len(self),))
+        indices = np.broadcast_to(np.asarray(indices, dtype=np.int64), (len(self),))
+        if values is None:
+            values = np.zeros(len(self), dtype=np.int64)
+        values = np.broadcast_to(np.asarray(values, dtype=np.int64), (len(self),))
+
+        if _USE_CPP:
+            sigmas, lengths, performed = _apply_cpp(self._sigmas, self._lengths, moves, indices, values)
+        else:
+            sigmas, lengths, performed = _apply_numpy(self._sigmas, self._lengths, self._n, moves, indices, values)
+
+        if strict and not np.all(performed):
+            row = int(np.argmin(performed))
+            raise IllegalTransformationException(
+                f"{Move(moves[row]).name} is not performable at index {indices[row]} in row {row}"
+            )
+        return BraidBatch.from_padded(sigmas, lengths, copy_sigmas=False), performed
+
+    def __eq__(self, value: object) -> bool:
+        if not isinstance(value, BraidBatch):
+            return NotImplemented
+        if len(self) != len(value) or not np.array_equal(self._lengths, value._lengths):
+            return False
+        columns = min(self.capacity, value.capacity)
+        return (
+            np.array_equal(self._sigmas[:, :columns], value._sigmas[:, :columns])
+            and not np.any(self._sigmas[:, columns:])
+            and not np.any(value._sigmas[:, columns:])
+        )
+
+
+def _apply_numpy(sigmas, lengths, strands, moves, indices, values):
+    growth = np.select([moves == Move.CONJUGATION, moves == Move.STABILIZATION], [2, 1], 0)
+    capacity = max(1, sigmas.shape[1], int((lengths + growth).max(initial=0)))
+    result = np.zeros((sigmas.shape[0], capacity), dtype=SIGMA_DTYPE)
+    result[:, : sigmas.shape[1]] = sigmas
+    result_lengths = lengths.copy()
+    performed = np.zeros(sigmas.shape[0], dtype=bool)
+
+    columns = np.arange(capacity)[None, :]
+    for move, implementation in _MOVE_IMPLEMENTATIONS.items():
+        rows = np.nonzero(moves == move)[0]
+        if len(rows) == 0:
+            continue
+        legal, transformed, new_lengths = implementation(
+            result[rows], lengths[rows], strands[rows], indices[rows], values[rows], columns
+        )
+        rows = rows[legal]
+        result[rows] = transformed[legal]
+        result_lengths[rows] = new_lengths[legal]
+        performed[rows] = True
+    return result, result_lengths, performed
+
+
+def _apply_cpp(sigmas, lengths, moves, indices, values):
+    from . import braid_cpp_impl as B  # pylint: disable=import-outside-toplevel
+
+    return B.apply_moves_batch(sigmas, lengths, moves, indices, values, _THREADS)
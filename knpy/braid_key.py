@@ -0,0 +1,100 @@
+import hashlib
+import numpy as np
+
+# Sigmas are packed into the smallest of these dtypes that can hold them.
+_PACKED_DTYPES = (np.dtype(np.int8), np.dtype(np.int16), np.dtype(np.int32))
+
+
+def _packed_dtype(largest: int) -> np.dtype:
+    for dtype in _PACKED_DTYPES:
+        if largest <= np.iinfo(dtype).max:
+            return dtype
+    raise ValueError(f"Sigma {largest} is too large to be packed")
+
+
+def _digest(itemsize: int, data: bytes) -> int:
+    # Unlike the builtin hash of bytes, this does not depend on PYTHONHASHSEED, so it is the same in every process.
+    digest = hashlib.blake2b(data, digest_size=8, person=bytes([itemsize]))
+    return int.from_bytes(digest.digest(), "little", signed=True)
+
+
+class BraidKey:
+    """
+    Compact immutable key of a braid notation, to be used in sets and as dictionary key (e.g. visited sets and
+    transposition tables of searches).
+
+    The sigmas are packed into bytes of int8 (or int16/int32 if some sigma does not fit), and the 64-bit hash is
+    computed once, when the key is created. Two keys are equal if and only if the notations are equal, regardless of
+    the dtype of the arrays they were created from. The hash is the same in every process.
+    """
+
+    __slots__ = ("_itemsize", "_data", "_hash")
+
+    def __init__(self, sigmas: np.ndarray | list[int]):
+        sigmas = np.asarray(sigmas)
+        dtype = _packed_dtype(int(np.abs(sigmas).max(initial=0)))
+        self._set(dtype.itemsize, sigmas.astype(dtype, copy=False).tobytes())
+
+    @classmethod
+    def from_bytes(cls, itemsize: int, data: bytes) -> "BraidKey":
+        """
+        Creates a key from sigmas already packed into bytes of integers of itemsize bytes (see `data`).
+        """
+        obj = cls.__new__(cls)
+        obj._set(itemsize, data)
+        return obj
+
+    def _set(self, itemsize: int, data: bytes) -> None:
+        self._itemsize = itemsize
+        self._data = data
+        self._hash = _digest(itemsize, data)
+
+    @property
+    def data(self) -> bytes:
+        """
+        Packed sigmas, see `dtype`
+        """
+        return self._data
+
+    @property
+    def dtype(self) -> np.dtype:
+        return _PACKED_DTYPES[self._itemsize.bit_length() - 1]
+
+    def notation(self) -> np.ndarray:
+        """
+        Returns the sigmas of the key as a (read-only) numpy array
+        """
+        return np.frombuffer(self._data, dtype=self.dtype)
+
+    def __len__(self) -> int:
+        return len(self._data) // self._itemsize
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, value: object) -> bool:
+        if not isinstance(value, BraidKey):
+            return NotImplemented
+        return self._hash == value._hash and self._itemsize == value._itemsize and self._data == value._data
+
+    def __reduce__(self):
+        return (BraidKey.from_bytes, (self._itemsize, self._data))
+
+    def __repr__(self) -> str:
+        return f"BraidKey({self.notation().tolist()})"
+
+
+def batch_keys(sigmas: np.ndarray, lengths: np.ndarray) -> list[BraidKey]:
+    """
+    Returns the keys of the rows of a padded sigma matrix, the i-th key is `BraidKey(sigmas[i, :lengths[i]])`.
+    """
+    largest = np.abs(sigmas).max(axis=1, initial=0)
+    packed_index = np.searchsorted([np.iinfo(dtype).max for dtype in _PACKED_DTYPES], largest)
+    if np.any(packed_index == len(_PACKED_DTYPES)):
+        raise ValueError(f"Sigma {largest.max()} is too large to be packed")
+    # The whole matrix is converted once per packed dtype in use (almost always only int8), rows are then sliced.
+    packed = {i: sigmas.astype(_PACKED_DTYPES[i]) for i in np.unique(packed_index).tolist()}
+    return [
+        BraidKey.from_bytes(_PACKED_DTYPES[i].itemsize, packed[i][row, :length].tobytes())
+        for row, (i, length) in enumerate(zip(packed_index.tolist(), np.asarray(lengths).tolist()))
+    ]
@@ -1,14 +1,20 @@
 # pylint: disable=R0801
-from typing import Callable
+from typing import Callable, TYPE_CHECKING
 import numpy as np
-import torch
-import braidvisualiser as bv
 from functools import partial, wraps
-from .data_utils import knots_in_braid_notation_dict
+from . import alexander, burau, garside, jones
+from .braid_key import BraidKey
+from .polynomial import LaurentPolynomial
+from .stats import BraidStats
+from .data_utils import knot_table
 from .exceptions import IllegalTransformationException, InvalidBraidException, IndexOutOfRangeException
+from .braid import SIGMA_DTYPE, as_sigma_array
 
 from . import braid_cpp_impl as B
 
+if TYPE_CHECKING:
+    import torch
+
 type BraidNotation = np.ndarray
 type BraidTransformation = Callable[[], "Braid"]
 
@@ -38,23 +44,23 @@ class Braid:
             (e.g. 11a,13n)
         notation_index: If sigmas is a name of braid than it is possible that multiple notations are available to the
             same knot. notation_index says which one to choose from these.
+        copy_sigmas: If sigmas is an array, copy it. Otherwise the braid shares it if it is a C contiguous SIGMA_DTYPE
+            array, any other array is still converted to a new one.
         #TODO 10_136 {{-1;-1;-2;3;-2;1;-2;-2;3;2;2};{-1;2;-1;2;3;-2;-2;-4;3;-4}}? Which one?
         #TODO 11n_8,{{-1;-1;-2;1;-2;-1;3;-2;-2;-4;3;-4};{1;2;-1;2;3;-2;-1;-1;-2;-2;-3;-3;-2}}? Which one?
         """
         self._braid: BraidNotation
         if isinstance(sigmas, str):
-            self._braid = np.array(knots_in_braid_notation_dict[sigmas][notation_index], dtype=np.int32)
+            self._braid = np.array(knot_table().notation(sigmas, notation_index), dtype=SIGMA_DTYPE)
         elif isinstance(sigmas, np.ndarray):
-            if copy_sigmas:
-                self._braid = sigmas.copy()
-            else:
-                self._braid = sigmas
+            # Converted to SIGMA_DTYPE here, so the moves never have to convert
+            self._braid = as_sigma_array(sigmas, copy=copy_sigmas)
         else:
             if not all(isinstance(x, (int, np.integer)) for x in sigmas):
                 raise InvalidBraidException(
                     f"Unable to create braid from {type(sigmas)}, an element is not instance of int or np.integer"
                 )
-            self._braid = np.array(sigmas, dtype=np.int32)
+            self._braid = as_sigma_array(sigmas)
 
         if np.any(self._braid == 0):
             raise InvalidBraidException
@@ -62,7 +68,10 @@ class Braid:
         if len(self) == 0:
             self._n = 1
         else:
-            self._n = np.max(np.abs(self._braid)) + 1
+            self._n = int(np.max(np.abs(self._braid))) + 1
+        self._key: BraidKey | None = None
+        self._normal_form_key: BraidKey | None = None
+        self._stats: BraidStats | None = None
 
     @classmethod
     def _from_array_directly(cls, inp: np.ndarray):
@@ -73,7 +82,10 @@ class Braid:
         if inp.size == 0:
             obj._n = 1
         else:
-            obj._n = np.max(np.abs(inp)) + 1
+            obj._n = int(np.max(np.abs(inp))) + 1
+        obj._key = None
+        obj._normal_form_key = None
+        obj._stats = None
         return obj
 
     def values(self) -> tuple[int, BraidNotation]:
@@ -95,14 +107,18 @@ class Braid:
     def strand_count(self) -> int:
         return self._n
 
-    def to_torch(self) -> torch.Tensor:
+    def to_torch(self) -> "torch.Tensor":
         """
-        Returns self._braid represented as torch.tensor
-        #TODO Does it copies by default?
+        Returns self._braid represented as torch.tensor, sharing memory with it (no copy). Use `knpy.collate` to
+        convert many braids at once.
         """
+        import torch  # pylint: disable=import-outside-toplevel
+
         return torch.from_numpy(self._braid)
 
     def show(self) -> None:
+        import braidvisualiser as bv  # pylint: disable=import-outside-toplevel
+
         bv.Braid(*([self._n] + list(self._braid))).draw()
 
     # Action functions from paper https://arxiv.org/pdf/2010.16263
@@ -139,6 +155,15 @@ class Braid:
         shifted = B.shift_right(self._braid, amount)
         return Braid._from_array_directly(shifted)
 
+    def canonical_rotation(self) -> "Braid":
+        """
+        Returns the lexicographically least rotation of the braid (see `shift_left`), computed with Booth's algorithm
+        in linear time. Every rotation of a notation gives the same result, so `braid.canonical_rotation().key()` can
+        be used as the single key of all rotations, e.g. in transposition tables.
+        """
+        amount = B.least_rotation(self._braid)
+        return Braid._from_array_directly(B.shift_left(self._braid, amount))
+
     # Braid relations
     @braid_move
     def braid_relation1(self, index: int) -> "Braid":
@@ -234,6 +259,19 @@ class Braid:
         transformed = B.remove_sigma_inverse_pair(self._braid, index)
         return Braid._from_array_directly(transformed)
 
+    def free_reduce(self) -> "Braid":
+        """
+        Removes all sigma inverse pairs (including the pairs of the last and first sigma) in one linear pass with a
+        stack. Same as performing `remove_sigma_inverse_pair` until it is not performable anywhere, up to rotation.
+        """
+        return Braid._from_array_directly(B.free_reduce(self._braid))
+
+    def simplify_greedy(self) -> "Braid":
+        """
+        Performs `free_reduce` and destabilizations (on top first) until neither of them changes the braid.
+        """
+        return Braid._from_array_directly(B.simplify_greedy(self._braid))
+
     # Chech whether a move is performable or not
     def is_braid_relation1_performable(self, index: int) -> bool:
         """
@@ -297,12 +335,34 @@ class Braid:
         """
         return B.is_destabilization_performable(self._braid, index, self.strand_count)
 
+    def destabilization_performable_indices(self) -> np.ndarray:
+        return np.nonzero(B.destabilization_performable_indices(self._braid, self.strand_count))[0]
+
     def is_remove_sigma_inverse_pair_performable(self, index: int) -> bool:
         return B.is_remove_sigma_inverse_pair_performable(self._braid, index)
 
     def remove_sigma_inverse_pair_performable_indices(self) -> np.ndarray:
         return np.nonzero(B.remove_sigma_inverse_pair_performable_indices(self._braid))[0]
 
+    def legal_action_mask(self, max_len: int, max_strands: int) -> np.ndarray:
+        """
+        Returns a boolean array over the actions of `knpy.actions.ActionSpace(max_len, max_strands)` telling which ones
+        are legal. Contains the same moves as `performable_moves`, except the ones whose result would have more than
+        max_len crossings or max_strands strands.
+        """
+        from .actions import action_space  # pylint: disable=import-outside-toplevel
+
+        return action_space(max_len, max_strands).braid_mask(self)
+
+    def apply_action(self, action_id: int, max_len: int, max_strands: int) -> "Braid":
+        """
+        Performs the action with id action_id of `knpy.actions.ActionSpace(max_len, max_strands)`. Raises
+        `IllegalTransformationException` if the action is not legal (see `legal_action_mask`).
+        """
+        from .actions import action_space  # pylint: disable=import-outside-toplevel
+
+        return action_space(max_len, max_strands).apply(self, action_id)
+
     def performable_moves(self) -> list[BraidTransformation]:
         """
         Checks if a move is performable.
@@ -362,5 +422,77 @@ class Braid:
             return NotImplemented
         return self._n == value._n and np.array_equal(self._braid, value._braid)
 
+    def key(self) -> BraidKey:
+        """
+        Returns the hashable `BraidKey` of the notation, it is computed on the first call and reused afterwards.
+        Braids are equal if and only if their keys are equal (also across the two Braid implementations).
+        """
+        if self._key is None:
+            self._key = BraidKey(self._braid)
+        return self._key
+
+    def left_normal_form(self) -> tuple[int, np.ndarray]:
+        """
+        Returns the Garside left normal form `Δ^infimum A_1 ... A_k` of the braid in the braid group on strand_count
+        strands, as infimum and the (k, strand_count) matrix of the simple factors, see `knpy.garside`.
+        """
+        infimum, factors = B.left_normal_form(self._braid, self._n)
+        return int(infimum), factors
+
+    def normal_form(self) -> "Braid":
+        """
+        Returns the braid written in Garside left normal form, so braid words that are equal in the braid group (e.g.
+        `[1, 2, 1]` and `[2, 1, 2]`) give the same notation. The strand count of the result might be smaller, when the
+        normal form does not contain the last sigma.
+        """
+        infimum, factors = self.left_normal_form()
+        return Braid(garside.normal_form_word(infimum, factors, self._n))
+
+    def normal_form_key(self) -> BraidKey:
+        """
+        Returns a `BraidKey` of the left normal form and the strand count, computed on the first call. Two braids have
+        the same normal form key if and only if they have the same strand count and are equal in the braid group.
+        """
+        if self._normal_form_key is None:
+            infimum, factors = self.left_normal_form()
+            self._normal_form_key = BraidKey(garside.normal_form_key_sigmas(infimum, factors, self._n))
+        return self._normal_form_key
+
+    def stats(self) -> BraidStats:
+        """
+        Returns the writhe, the permutation of the strands, the number of components of the closure and the number of
+        occurrences of every generator, see `knpy.stats`. The result is computed once and cached on the braid, its
+        arrays are read-only.
+        """
+        if self._stats is None:
+            writhe, permutation, component_count, generator_counts = B.braid_stats(self._braid, self._n)
+            permutation.setflags(write=False)
+            generator_counts.setflags(write=False)
+            self._stats = BraidStats(writhe, permutation, component_count, generator_counts)
+        return self._stats
+
+    def burau_matrix(self, t: complex, reduced: bool = True) -> np.ndarray:
+        """
+        Returns the (reduced) Burau matrix of the braid on strand_count strands evaluated at t, see `knpy.burau`.
+        """
+        return burau.burau_matrix(self._braid, t, self._n, reduced)
+
+    def alexander_polynomial(self) -> LaurentPolynomial:
+        """
+        Returns the Alexander polynomial of the closure of the braid, normalized like in KnotInfo (lowest exponent 0
+        with positive coefficient), see `knpy.alexander`. Results are cached, shared by every rotation of the notation.
+        """
+        return alexander.alexander_polynomial(self._braid, self._n)
+
+    def jones_polynomial(self) -> LaurentPolynomial:
+        """
+        Returns the Jones polynomial of the closure of the braid, with the conventions of KnotInfo, computed with the
+        Temperley–Lieb representation, see `knpy.jones`. Results are cached, shared by every rotation of the notation.
+        """
+        return jones.jones_polynomial(self._braid, self._n)
+
+    def __hash__(self) -> int:
+        return hash(self.key())
+
     def __len__(self) -> int:
         return len(self._braid)
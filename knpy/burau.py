@@ -0,0 +1,366 @@
+from typing import Sequence
+import numpy as np
+
+# Burau representation of braids evaluated at a number t, see e.g. Kassel and Turaev, Braid Groups, chapter 3.
+#
+# The Burau matrix of sigma i on n strands is the identity, except the 2x2 block at rows and columns i - 1 and i, which
+# is [[1 - t, t], [1, 0]]. A braid word maps to the product of the matrices of its sigmas, from left to right.
+#
+# The matrices fix the vector (1, t, ..., t^(n - 1)) from the left, so they act on the (n - 1)-dimensional subspace it
+# annihilates. In the basis t e_k - e_(k + 1) of this subspace, the reduced Burau matrix of sigma i is the identity,
+# except row i - 1, which is (1, -t, t) at columns i - 2, i - 1 and i (cut at the border). Every generator changes at
+# most three columns of a product, so a braid word of length k is evaluated in O(k n) steps without matrix products.
+
+
+def _dtype(t: complex) -> np.dtype:
+    return np.result_type(t, np.float64)
+
+
+def _strand_count(sigmas: np.ndarray) -> int:
+    return int(np.abs(sigmas).max(initial=0)) + 1
+
+
+def batch_burau(
+    sigmas: np.ndarray,
+    lengths: np.ndarray | Sequence[int],
+    t: complex,
+    strand_count: int | None = None,
+    reduced: bool = True,
+) -> np.ndarray:
+    """
+    Returns the (reduced) Burau matrices of the braids of a padded sigma matrix at t, stacked in an array of shape
+    (rows, n, n), or (rows, n - 1, n - 1) when reduced. Every braid is treated as a braid on n strands, where n is
+    strand_count (by default the largest strand count of the batch).
+
+    The rows are evaluated together, one position of the padded matrix at a time.
+    """
+    sigmas = np.asarray(sigmas)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    rows, capacity = sigmas.shape
+    sigmas = np.where(np.arange(capacity)[None, :] < lengths[:, None], sigmas, 0)
+    n = _strand_count(sigmas) if strand_count is None else strand_count
+    if n < _strand_count(sigmas):
+        raise ValueError(f"The braids do not fit on {n} strands")
+    size = n - 1 if reduced else n
+    dtype = _dtype(t)
+    matrices = np.zeros((rows, size, size + 2 if reduced else size), dtype=dtype)
+    if reduced:
+        # Columns 0 and size + 1 are padding, so the neighbours of the changed column always exist.
+        matrices[:, np.arange(size), np.arange(size) + 1] = 1
+    else:
+        matrices[:, np.arange(size), np.arange(size)] = 1
+    if n < 2:
+        return matrices[:, :, 1:-1] if reduced else matrices
+
+    all_rows = np.arange(rows)
+    for position in range(int(lengths.max(initial=0))):
+        column = sigmas[:, position]
+        positive, negative = column > 0, column < 0
+        if reduced:
+            # Column i of the product is replaced by -t (or -1/t) times itself and added to its neighbours.
+            center = np.maximum(np.abs(column), 1)
+            factor = np.where(positive, -t, np.where(negative, -1 / t, 1)).astype(dtype)
+            left = np.where(positive, 1, np.where(negative, 1 / t, 0)).astype(dtype)
+            right = np.where(positive, t, np.where(negative, 1, 0)).astype(dtype)
+            old = matrices[all_rows, :, center]
+            matrices[all_rows, :, center - 1] += left[:, None] * old
+            matrices[all_rows, :, center + 1] += right[:, None] * old
+            matrices[all_rows, :, center] = factor[:, None] * old
+        else:
+            first = np.maximum(np.abs(column), 1) - 1
+            a = np.where(positive, 1 - t, np.where(negative, 0, 1)).astype(dtype)
+            b = np.where(positive, t, np.where(negative, 1, 0)).astype(dtype)
+            c = np.where(positive, 1, np.where(negative, 1 / t, 0)).astype(dtype)
+            d = np.where(positive, 0, np.where(negative, 1 - 1 / t, 1)).astype(dtype)
+            old_first, old_second = matrices[all_rows, :, first], matrices[all_rows, :, first + 1]
+            matrices[all_rows, :, first] = a[:, None] * old_first + c[:, None] * old_second
+            matrices[all_rows, :, first + 1] = b[:, None] * old_first + d[:, None] * old_second
+    return matrices[:, :, 1:-1] if reduced else matrices
+
+
+def burau_matrix(
+    sigmas: np.ndarray | Sequence[int], t: complex, strand_count: int | None = None, reduced: bool = True
+) -> np.ndarray:
+    """
+    Returns the (reduced) Burau matrix of a braid word at t, on strand_count strands (by default the strand count of
+    the word).
+    """
+    sigmas = [int(sigma) for sigma in sigmas]
+    smallest = max((abs(sigma) for sigma in sigmas), default=0) + 1
+    n = smallest if strand_count is None else strand_count
+    if n < smallest:
+        raise ValueError(f"The braid does not fit on {n} strands")
+    if not reduced:
+        matrix = np.eye(n, dtype=_dtype(t))
+        for sigma in sigmas:
+            _multiply_right(matrix, sigma, t)
+        return matrix
+    # Same as in `batch_burau`, with padding columns 0 and n.
+    padded = np.zeros((n - 1, n + 1), dtype=_dtype(t))
+    padded[np.arange(n - 1), np.arange(1, n)] = 1
+    for sigma in sigmas:
+        i = abs(sigma)
+        old = padded[:, i].copy()
+        if sigma > 0:
+            padded[:, i - 1] += old
+            padded[:, i + 1] += t * old
+            padded[:, i] = -t * old
+        else:
+            padded[:, i - 1] += old / t
+            padded[:, i + 1] += old
+            padded[:, i] = -old / t
+    return padded[:, 1:-1]
+
+
+def reduce(matrix: np.ndarray, t: complex) -> np.ndarray:
+    """
+    Returns the reduced Burau matrix from the (unreduced) Burau matrix of the same braid, also for stacked matrices.
+    """
+    n = matrix.shape[-1]
+    # Columns of basis are the vectors t e_k - e_(k + 1), its first n - 1 rows form an invertible matrix.
+    basis = np.zeros((n, n - 1), dtype=_dtype(t))
+    basis[np.arange(n - 1), np.arange(n - 1)] = t
+    basis[np.arange(1, n), np.arange(n - 1)] = -1
+    return np.linalg.solve(basis[:-1], (matrix @ basis)[..., :-1, :])
+
+
+def alexander_value(reduced_matrix: np.ndarray, t: complex) -> complex | np.ndarray:
+    """
+    Returns the Alexander polynomial of the closure of a braid at t, `det(I - R) (1 - t) / (1 - t^n)` where R is the
+    reduced Burau matrix of the braid on n strands (also for stacked matrices). The polynomial is only defined up to
+    multiplication by `±t^k`, so for `|t| = 1` its absolute value is an invariant of the knot, cheaper than the exact
+    polynomial. t must not be a root of unity of order at most n.
+    """
+    n = reduced_matrix.shape[-1] + 1
+    identity = np.eye(n - 1, dtype=reduced_matrix.dtype)
+    return np.linalg.det(identity - reduced_matrix) * (1 - t) / (1 - t**n)
+
+
+def batch_alexander_values(sigmas: np.ndarray, lengths: np.ndarray | Sequence[int], t: complex) -> np.ndarray:
+    """
+    Returns `alexander_value` of every braid of a padded sigma matrix, each on its own strand count.
+    """
+    sigmas = np.asarray(sigmas)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    in_range = np.arange(sigmas.shape[1])[None, :] < lengths[:, None]
+    strand_counts = np.abs(np.where(in_range, sigmas, 0)).max(axis=1, initial=0) + 1
+    values = np.empty(len(sigmas), dtype=np.result_type(t, np.complex128))
+    for n in np.unique(strand_counts):
+        rows = np.flatnonzero(strand_counts == n)
+        matrices = batch_burau(sigmas[rows], lengths[rows], t, int(n), reduced=True)
+        values[rows] = alexander_value(matrices, t)
+    return values
+
+
+def _block(sigma: int, t: complex) -> tuple[complex, complex, complex, complex]:
+    """
+    Returns the 2x2 block [[a, b], [c, d]] of the Burau matrix of a sigma (negative for the inverse).
+    """
+    if sigma > 0:
+        return 1 - t, t, 1, 0
+    return 0, 1, 1 / t, 1 - 1 / t
+
+
+def _multiply_right(matrix: np.ndarray, sigma: int, t: complex) -> None:
+    """
+    Multiplies matrix by the Burau matrix of sigma from the right, in place.
+    """
+    a, b, c, d = _block(sigma, t)
+    i = abs(sigma) - 1
+    first, second = matrix[:, i].copy(), matrix[:, i + 1].copy()
+    matrix[:, i] = a * first + c * second
+    matrix[:, i + 1] = b * first + d * second
+
+
+def _multiply_left(matrix: np.ndarray, sigma: int, t: complex) -> None:
+    """
+    Multiplies matrix by the Burau matrix of sigma from the left, in place.
+    """
+    a, b, c, d = _block(sigma, t)
+    i = abs(sigma) - 1
+    first, second = matrix[i].copy(), matrix[i + 1].copy()
+    matrix[i] = a * first + b * second
+    matrix[i + 1] = c * first + d * second
+
+
+def _splice(
+    matrix: np.ndarray,
+    prefix: np.ndarray,
+    suffix: np.ndarray,
+    removed: Sequence[int],
+    inserted: Sequence[int],
+    t: complex,
+) -> None:
+    """
+    Turns the Burau matrix of `prefix + removed + suffix` into the matrix of `prefix + inserted + suffix` in place, by
+    peeling off the shorter one of prefix and suffix.
+    """
+    if len(prefix) <= len(suffix):
+        for sigma in prefix:
+            _multiply_left(matrix, -int(sigma), t)
+        for sigma in removed:
+            _multiply_left(matrix, -sigma, t)
+        for sigma in reversed(inserted):
+            _multiply_left(matrix, sigma, t)
+        for sigma in prefix[::-1]:
+            _multiply_left(matrix, int(sigma), t)
+    else:
+        for sigma in suffix[::-1]:
+            _multiply_right(matrix, -int(sigma), t)
+        for sigma in reversed(removed):
+            _multiply_right(matrix, -sigma, t)
+        for sigma in inserted:
+            _multiply_right(matrix, sigma, t)
+        for sigma in suffix:
+            _multiply_right(matrix, int(sigma), t)
+
+
+def _fit(matrix: np.ndarray, strand_count: int) -> np.ndarray:
+    """
+    Returns the Burau matrix of the same braid on strand_count strands, the extra strands do not cross any other.
+    """
+    n = len(matrix)
+    if strand_count <= n:
+        return matrix[:strand_count, :strand_count]
+    fitted = np.eye(strand_count, dtype=matrix.dtype)
+    fitted[:n, :n] = matrix
+    return fitted
+
+
+class BurauTracker:
+    """
+    A braid (of either `Braid` implementation) together with its Burau matrix at t. Moves return a new tracker whose
+    matrix is updated from the current one instead of evaluating the whole braid word again:
+
+    - the braid relations, the removal of a sigma inverse pair and conjugation (except where they wrap around the end
+      of the word) do not change the braid group element, so the matrix is kept as it is
+    - shifts, and the other moves where they wrap around the end, conjugate the matrix by the sigmas they move
+    - stabilization and destabilization peel off the sigmas before or after the changed crossing, whichever are fewer
+
+    so a move costs O(m n) where m is at most half the length of the braid, and often zero.
+    """
+
+    def __init__(self, braid, t: complex, matrix: np.ndarray | None = None):
+        """
+        braid: a `Braid` of either implementation.
+        matrix: the unreduced Burau matrix of braid at t on `braid.strand_count` strands, computed when not given.
+        """
+        self._braid = braid
+        self._t = t
+        if matrix is None:
+            matrix = burau_matrix(braid.notation(copy=False), t, braid.strand_count, reduced=False)
+        self._matrix = matrix
+
+    @property
+    def braid(self):
+        return self._braid
+
+    @property
+    def t(self) -> complex:
+        return self._t
+
+    def matrix(self, reduced: bool = True) -> np.ndarray:
+        if reduced:
+            return reduce(self._matrix, self._t)
+        return self._matrix.copy()
+
+    def alexander_value(self) -> complex:
+        return complex(alexander_value(self.matrix(reduced=True), self._t))
+
+    def _derived(self, braid, matrix: np.ndarray) -> "BurauTracker":
+        return BurauTracker(braid, self._t, _fit(matrix, braid.strand_count))
+
+    def shift_left(self, amount: int = 1) -> "BurauTracker":
+        shifted = self._braid.shift_left(amount)
+        return self._derived(shifted, self._rotated(amount % len(self._braid)))
+
+    def shift_right(self, amount: int = 1) -> "BurauTracker":
+        shifted = self._braid.shift_right(amount)
+        return self._derived(shifted, self._rotated(-amount % len(self._braid)))
+
+    def _rotated(self, amount: int) -> np.ndarray:
+        """
+        Returns the matrix of the braid shifted left by amount, `A^-1 M A` (or `B M B^-1`) where the braid is AB and A
+        consists of amount sigmas.
+        """
+        sigmas, matrix, t = self._braid.notation(copy=False), self._matrix.copy(), self._t
+        if amount <= len(sigmas) - amount:
+            for sigma in sigmas[:amount]:
+                _multiply_left(matrix, -int(sigma), t)
+                _multiply_right(matrix, int(sigma), t)
+        else:
+            for sigma in sigmas[amount:][::-1]:
+                _multiply_left(matrix, int(sigma), t)
+                _multiply_right(matrix, -int(sigma), t)
+        return matrix
+
+    def _relation(self, transformed, index: int, chunk: int) -> "BurauTracker":
+        """
+        Returns the tracker of transformed, the braid after a relation on the chunk sigmas starting at index. If the
+        chunk wraps around the end, the first w sigmas of the word change from P to Q, and the braid PY becomes QY'
+        where Y'Q = P^-1 (PY) P, so the matrix is conjugated to `Q P^-1 M P Q^-1`.
+        """
+        wrapped = index % len(self._braid) + chunk - len(self._braid)
+        if wrapped <= 0:
+            return self._derived(transformed, self._matrix)
+        before = self._braid.notation(copy=False)[:wrapped]
+        after = transformed.notation(copy=False)[:wrapped]
+        matrix, t = self._matrix.copy(), self._t
+        for sigma in before:
+            _multiply_left(matrix, -int(sigma), t)
+            _multiply_right(matrix, int(sigma), t)
+        for sigma in after[::-1]:
+            _multiply_left(matrix, int(sigma), t)
+            _multiply_right(matrix, -int(sigma), t)
+        return self._derived(transformed, matrix)
+
+    def braid_relation1(self, index: int) -> "BurauTracker":
+        return self._relation(self._braid.braid_relation1(index), index, 3)
+
+    def braid_relation2(self, index: int) -> "BurauTracker":
+        return self._relation(self._braid.braid_relation2(index), index, 2)
+
+    def conjugation(self, value: int, index: int) -> "BurauTracker":
+        conjugated = self._braid.conjugation(value, index)
+        matrix = self._matrix
+        if index == len(self._braid) + 1:
+            matrix = matrix.copy()
+            _multiply_left(matrix, -value, self._t)
+            _multiply_right(matrix, value, self._t)
+        return self._derived(conjugated, matrix)
+
+    def remove_sigma_inverse_pair(self, index: int) -> "BurauTracker":
+        removed = self._braid.remove_sigma_inverse_pair(index)
+        matrix = self._matrix
+        if index % len(self._braid) == len(self._braid) - 1:
+            # The pair is the last and the first sigma: `s C s^-1` becomes C.
+            first = int(self._braid.notation(copy=False)[0])
+            matrix = matrix.copy()
+            _multiply_left(matrix, -first, self._t)
+            _multiply_right(matrix, first, self._t)
+        return self._derived(removed, matrix)
+
+    def stabilization(self, index: int | None = None, on_top=False, inverse: bool = False) -> "BurauTracker":
+        stabilized = self._braid.stabilization(index, on_top, inverse)
+        if index is None:
+            index = len(self._braid)
+        n = stabilized.strand_count
+        matrix = np.eye(n, dtype=self._matrix.dtype)
+        if on_top:
+            # Every other sigma is increased, which moves the braid to the strands 1, ..., n - 1.
+            matrix[1:, 1:] = self._matrix
+        else:
+            matrix[: n - 1, : n - 1] = self._matrix
+        sigmas = stabilized.notation(copy=False)
+        _splice(matrix, sigmas[:index], sigmas[index + 1 :], [], [int(sigmas[index])], self._t)
+        return self._derived(stabilized, matrix)
+
+    def destabilization(self, index: int) -> "BurauTracker":
+        destabilized = self._braid.destabilization(index)
+        sigmas, matrix = self._braid.notation(copy=False), self._matrix.copy()
+        removed = int(sigmas[index])
+        _splice(matrix, sigmas[:index], sigmas[index + 1 :], [removed], [], self._t)
+        if abs(removed) == 1:
+            # Every other sigma is decreased, which moves the braid to the strands 0, ..., n - 2.
+            matrix = matrix[1:, 1:]
+        return self._derived(destabilized, matrix)
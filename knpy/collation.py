@@ -0,0 +1,105 @@
+from typing import Literal, NamedTuple, Sequence, TYPE_CHECKING
+import numpy as np
+from . import braid_vec
+from .braid import Braid, SIGMA_DTYPE
+from .braid_batch import BraidBatch
+
+if TYPE_CHECKING:
+    import torch
+
+# Collation of braids into padded torch tensors, e.g. as the `collate_fn` of a torch DataLoader. The tensors are
+# allocated once per batch (in pinned memory when CUDA is available, so copies to the GPU can be asynchronous) and the
+# sigmas of all braids are written into them through NumPy views, without converting every braid to a tensor.
+
+type Encoding = Literal["one_hot", "generator_sign"]
+
+
+class Collated(NamedTuple):
+    sigmas: "torch.Tensor"  # (B, max_len) padded sigmas
+    lengths: "torch.Tensor"  # (B,) int64
+    mask: "torch.Tensor"  # (B, max_len) bool, True where a sigma is (and not padding)
+    features: "torch.Tensor | None"  # (B, max_len, C) float32 channels of the encoding, None without an encoding
+
+
+def _notations(braids: Sequence[Braid | braid_vec.Braid | np.ndarray | list[int]]) -> list[np.ndarray]:
+    return [
+        b.notation(copy=False) if isinstance(b, (Braid, braid_vec.Braid)) else np.asarray(b, dtype=SIGMA_DTYPE)
+        for b in braids
+    ]
+
+
+def collate(
+    braids: BraidBatch | Sequence[Braid | braid_vec.Braid | np.ndarray | list[int]],
+    max_len: int | None = None,
+    pad: int = 0,
+    dtype: "torch.dtype | None" = None,
+    encoding: Encoding | None = None,
+    max_strands: int | None = None,
+    pin_memory: bool | None = None,
+) -> Collated:
+    """
+    Collates braids into one padded (B, max_len) tensor of sigmas, their lengths and a mask of the non-padding
+    positions.
+
+    max_len: number of columns, by default the length of the longest braid.
+    pad: value of the padding positions of the sigma tensor.
+    dtype: torch.int64 (default) or torch.int32, dtype of the sigma tensor.
+    encoding: also returns features of the sigmas, zero at padding:
+        "one_hot": 2 * (max_strands - 1) channels, sigma i > 0 sets channel i - 1 and sigma -i sets channel
+            max_strands + i - 2.
+        "generator_sign": 2 channels, the generator |sigma| and the sign of sigma.
+    max_strands: number of strands the one hot encoding has channels for, by default the most strands of a braid.
+    pin_memory: allocate the tensors in pinned memory, by default if CUDA is available.
+    """
+    import torch  # pylint: disable=import-outside-toplevel
+
+    if dtype is None:
+        dtype = torch.int64
+    if dtype not in (torch.int64, torch.int32):
+        raise ValueError(f"dtype should be torch.int64 or torch.int32, not {dtype}")
+    if encoding not in (None, "one_hot", "generator_sign"):
+        raise ValueError(f"Unknown encoding {encoding!r}, should be 'one_hot' or 'generator_sign'")
+    if pin_memory is None:
+        pin_memory = torch.cuda.is_available()
+
+    if isinstance(braids, BraidBatch):
+        lengths = braids.lengths
+        flat = braids.sigmas[np.arange(braids.capacity) < lengths[:, None]]
+    else:
+        notations = _notations(braids)
+        lengths = np.array([len(notation) for notation in notations], dtype=np.int64)
+        flat = np.concatenate(notations) if notations else np.zeros(0, dtype=SIGMA_DTYPE)
+    longest = int(lengths.max()) if len(lengths) > 0 else 0
+    if max_len is None:
+        max_len = longest
+    if max_len < longest:
+        raise ValueError(f"max_len ({max_len}) is smaller than the longest braid ({longest})")
+
+    rows = len(lengths)
+    mask = torch.empty((rows, max_len), dtype=torch.bool, pin_memory=pin_memory)
+    mask_view = mask.numpy()
+    np.less(np.arange(max_len), lengths[:, None], out=mask_view)
+    sigmas = torch.empty((rows, max_len), dtype=dtype, pin_memory=pin_memory)
+    sigma_view = sigmas.numpy()
+    sigma_view.fill(pad)
+    sigma_view[mask_view] = flat
+    length_tensor = torch.empty(rows, dtype=torch.int64, pin_memory=pin_memory)
+    length_tensor.numpy()[:] = lengths
+
+    features = None
+    if encoding == "one_hot":
+        strands = int(np.abs(flat).max()) + 1 if len(flat) > 0 else 1
+        if max_strands is None:
+            max_strands = strands
+        if max_strands < strands:
+            raise ValueError(f"max_strands ({max_strands}) is smaller than the most strands of a braid ({strands})")
+        features = torch.zeros((rows, max_len, 2 * (max_strands - 1)), dtype=torch.float32, pin_memory=pin_memory)
+        channels = np.where(flat > 0, flat - 1, max_strands - 2 - flat)
+        row_ids, column_ids = np.nonzero(mask_view)
+        features.numpy()[row_ids, column_ids, channels] = 1
+    elif encoding == "generator_sign":
+        features = torch.zeros((rows, max_len, 2), dtype=torch.float32, pin_memory=pin_memory)
+        feature_view = features.numpy()
+        feature_view[mask_view, 0] = np.abs(flat)
+        feature_view[mask_view, 1] = np.sign(flat)
+    return Collated(sigmas, length_tensor, mask, features)
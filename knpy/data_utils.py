@@ -1,4 +1,11 @@
 import os
+import shutil
+import tempfile
+import numpy as np
+
+PRIME_KNOTS_PATH = "data_knots/prime_knots_in_braid_notation.csv"
+BENCHMARK_PATH = "data_knots/benchmark.csv"
+
 
 def load_csv(BRAID_PATH):
     current_dir = os.path.dirname(__file__)
@@ -18,5 +25,170 @@ def load_csv(BRAID_PATH):
             res[key] = temp_braid_notations
     return res
 
-knots_in_braid_notation_dict = load_csv("data_knots/prime_knots_in_braid_notation.csv")
-benchmark_braids = load_csv("data_knots/benchmark.csv")
+
+class KnotTable:
+    """
+    Table of named knots with one or more braid notations each, stored in flat arrays:
+
+    sigmas: every notation concatenated, int32
+    notation_offsets: the i-th notation is `sigmas[notation_offsets[i]:notation_offsets[i + 1]]`
+    knot_offsets: the notations of the j-th knot are the ones in `range(knot_offsets[j], knot_offsets[j + 1])`
+    names: name of the j-th knot
+
+    The arrays can be saved to and memory-mapped from a directory of `.npy` files, so the table does not have to be
+    parsed again in every process.
+    """
+
+    _FILES = ("sigmas", "notation_offsets", "knot_offsets", "names")
+
+    def __init__(self, sigmas: np.ndarray, notation_offsets: np.ndarray, knot_offsets: np.ndarray, names: np.ndarray):
+        self.sigmas = sigmas
+        self.notation_offsets = notation_offsets
+        self.knot_offsets = knot_offsets
+        self.names = names
+        self._index: dict[str, int] | None = None
+
+    @classmethod
+    def from_dict(cls, table: dict[str, list[list[int]]]) -> "KnotTable":
+        notations = [notation for knot_notations in table.values() for notation in knot_notations]
+        notation_offsets = np.zeros(len(notations) + 1, dtype=np.int64)
+        np.cumsum([len(notation) for notation in notations], out=notation_offsets[1:])
+        knot_offsets = np.zeros(len(table) + 1, dtype=np.int64)
+        np.cumsum([len(knot_notations) for knot_notations in table.values()], out=knot_offsets[1:])
+        sigmas = np.fromiter(
+            (s for notation in notations for s in notation), dtype=np.int32, count=int(notation_offsets[-1])
+        )
+        return cls(sigmas, notation_offsets, knot_offsets, np.array(list(table.keys()), dtype=str))
+
+    @classmethod
+    def from_csv(cls, BRAID_PATH: str) -> "KnotTable":
+        return cls.from_dict(load_csv(BRAID_PATH))
+
+    @classmethod
+    def load(cls, directory: str) -> "KnotTable":
+        """
+        Memory-maps a table saved with `save`.
+        """
+        arrays = [np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in cls._FILES]
+        return cls(*arrays)
+
+    def save(self, directory: str) -> None:
+        """
+        Saves the arrays of the table to `directory`. The directory is written under a temporary name and renamed at
+        the end, so concurrent readers never see a partially written table.
+        """
+        parent = os.path.dirname(os.path.abspath(directory))
+        os.makedirs(parent, exist_ok=True)
+        temp_directory = tempfile.mkdtemp(dir=parent)
+        try:
+            for name in self._FILES:
+                np.save(os.path.join(temp_directory, f"{name}.npy"), getattr(self, name))
+            os.replace(temp_directory, directory)
+        except OSError:
+            # Another process might have saved the same table in the meantime.
+            shutil.rmtree(temp_directory, ignore_errors=True)
+            if not os.path.isdir(directory):
+                raise
+
+    def _knot_position(self, name: str) -> int:
+        if self._index is None:
+            self._index = {str(knot_name): i for i, knot_name in enumerate(self.names)}
+        return self._index[name]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: object) -> bool:
+        try:
+            self._knot_position(str(name))
+        except KeyError:
+            return False
+        return True
+
+    def notation_ids(self, name: str) -> range:
+        """
+        Returns the positions of the notations of the knot called name in `notation_offsets`.
+        """
+        position = self._knot_position(name)
+        return range(int(self.knot_offsets[position]), int(self.knot_offsets[position + 1]))
+
+    def notation_count(self, name: str) -> int:
+        return len(self.notation_ids(name))
+
+    def notation(self, name: str, notation_index: int = 0) -> np.ndarray:
+        """
+        Returns the notation_index-th braid notation of the knot called name as a read-only view into the table.
+        Raises KeyError for unknown names and IndexError for invalid notation indices.
+        """
+        position = self._knot_position(name)
+        count = self.knot_offsets[position + 1] - self.knot_offsets[position]
+        if not -count <= notation_index < count:
+            raise IndexError(f"{name} has {count} braid notations, notation_index = {notation_index} is out of range")
+        i = self.knot_offsets[position] + notation_index % count
+        return self.sigmas[self.notation_offsets[i] : self.notation_offsets[i + 1]]
+
+    def to_dict(self) -> dict[str, list[list[int]]]:
+        return {
+            str(name): [
+                self.sigmas[self.notation_offsets[i] : self.notation_offsets[i + 1]].tolist()
+                for i in range(self.knot_offsets[j], self.knot_offsets[j + 1])
+            ]
+            for j, name in enumerate(self.names)
+        }
+
+
+def cache_dir() -> str:
+    """
+    Directory of the precompiled knot tables: `$KNPY_CACHE_DIR` if set, otherwise `knpy` in the user cache directory.
+    """
+    if "KNPY_CACHE_DIR" in os.environ:
+        return os.environ["KNPY_CACHE_DIR"]
+    return os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser(os.path.join("~", ".cache"))), "knpy")
+
+
+_tables: dict[str, KnotTable] = {}
+
+
+def get_table(BRAID_PATH: str) -> KnotTable:
+    """
+    Returns the table stored in the csv file at BRAID_PATH (relative to the package). The table is loaded on first
+    use: from the binary cache if it is up to date, otherwise by parsing the csv file and writing the cache.
+    """
+    if BRAID_PATH in _tables:
+        return _tables[BRAID_PATH]
+
+    file_path = os.path.join(os.path.dirname(__file__), BRAID_PATH)
+    stat = os.stat(file_path)
+    stem = os.path.splitext(os.path.basename(BRAID_PATH))[0]
+    directory = os.path.join(cache_dir(), f"{stem}-{stat.st_size}-{stat.st_mtime_ns}")
+
+    if os.path.isdir(directory):
+        table = KnotTable.load(directory)
+    else:
+        table = KnotTable.from_csv(BRAID_PATH)
+        try:
+            table.save(directory)
+        except OSError:
+            pass  # The cache is only an optimization, e.g. the cache directory may be read-only.
+    _tables[BRAID_PATH] = table
+    return table
+
+
+def knot_table() -> KnotTable:
+    return get_table(PRIME_KNOTS_PATH)
+
+
+def benchmark_table() -> KnotTable:
+    return get_table(BENCHMARK_PATH)
+
+
+_LAZY_DICTS = {"knots_in_braid_notation_dict": knot_table, "benchmark_braids": benchmark_table}
+
+
+def __getattr__(name: str):
+    # The tables used to be parsed into these dictionaries at import, now they are only built when accessed.
+    if name in _LAZY_DICTS:
+        value = _LAZY_DICTS[name]().to_dict()
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
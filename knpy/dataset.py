@@ -0,0 +1,285 @@
+import json
+import os
+import shutil
+import tempfile
+from typing import Iterator, NamedTuple, Sequence, TYPE_CHECKING
+import numpy as np
+from . import braid_vec
+from .braid import Braid, SIGMA_DTYPE
+from .braid_batch import BraidBatch
+
+if TYPE_CHECKING:
+    import torch
+
+# Columnar on-disk format of trajectories (rollouts of states, actions and rewards). A dataset is a directory of raw
+# little-endian arrays and a `meta.json` with their dtypes and sizes:
+#
+# sigmas.bin: the sigmas of every state concatenated, int8 or int16
+# offsets.bin: the state of the i-th step is `sigmas[offsets[i]:offsets[i + 1]]`, int64
+# actions.bin: the action taken in the i-th step (e.g. an id of `ActionSpace`, -1 for none), int64
+# rewards.bin: the reward of the i-th step, float32
+# episodes.bin: the steps of the j-th episode are the ones in `range(episodes[j], episodes[j + 1])`, int64
+#
+# `TrajectoryWriter` appends to the files in chunks and renames the directory into place when closed, so readers never
+# see a partially written dataset. `TrajectoryDataset.load` maps the files with `np.memmap`, so nothing is read until a
+# step is accessed.
+
+FORMAT_VERSION = 1
+_COLUMNS = ("sigmas", "offsets", "actions", "rewards", "episodes")
+
+
+class TrajectoryBatch(NamedTuple):
+    sigmas: "np.ndarray | torch.Tensor"  # (N, max_len) padded sigmas of the states
+    lengths: "np.ndarray | torch.Tensor"  # (N,)
+    actions: "np.ndarray | torch.Tensor"  # (N,)
+    rewards: "np.ndarray | torch.Tensor"  # (N,)
+
+
+class TrajectoryWriter:
+    def __init__(self, directory: str, sigma_dtype: type = np.int8, chunk_size: int = 1 << 16):
+        """
+        Starts writing a dataset to directory, which must not exist yet. Use as a context manager or call `close`.
+
+        sigma_dtype: np.int8 or np.int16, the dtype the sigmas are stored with. int8 fits braids of up to 128 strands.
+        chunk_size: number of steps buffered in memory before they are appended to the files.
+        """
+        if np.dtype(sigma_dtype) not in (np.dtype(np.int8), np.dtype(np.int16)):
+            raise ValueError(f"sigma_dtype should be np.int8 or np.int16, not {np.dtype(sigma_dtype)}")
+        if os.path.exists(directory):
+            raise FileExistsError(f"{directory} already exists")
+        self.directory = directory
+        self.sigma_dtype: np.dtype = np.dtype(sigma_dtype)
+        self.chunk_size = chunk_size
+        self._limit = np.iinfo(self.sigma_dtype).max
+        self._steps = 0
+        self._sigma_count = 0
+        self._episode_count = 0
+        self._buffer: list[tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = []
+        self._buffered = 0
+
+        parent = os.path.dirname(os.path.abspath(directory))
+        os.makedirs(parent, exist_ok=True)
+        self._temp_directory: str | None = tempfile.mkdtemp(dir=parent)
+        self._files = {
+            name: open(os.path.join(self._temp_directory, f"{name}.bin"), "wb")  # pylint: disable=consider-using-with
+            for name in _COLUMNS
+        }
+        np.zeros(1, dtype="<i8").tofile(self._files["offsets"])
+        np.zeros(1, dtype="<i8").tofile(self._files["episodes"])
+
+    def __enter__(self) -> "TrajectoryWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def write(
+        self,
+        states: BraidBatch | Sequence[Braid | braid_vec.Braid | np.ndarray | list[int] | str],
+        actions: np.ndarray | Sequence[int],
+        rewards: np.ndarray | Sequence[float],
+        episode_lengths: np.ndarray | Sequence[int] | None = None,
+    ) -> None:
+        """
+        Appends steps: the states (one per step), the actions taken in them and the rewards.
+
+        episode_lengths: number of steps of each of the episodes the steps are split into, in order. By default the
+            steps are one episode.
+        """
+        if not isinstance(states, BraidBatch):
+            states = BraidBatch(states)
+        actions = np.asarray(actions, dtype=np.int64)
+        rewards = np.asarray(rewards, dtype=np.float32)
+        if not len(states) == len(actions) == len(rewards):
+            raise ValueError(
+                f"Got {len(states)} states, {len(actions)} actions and {len(rewards)} rewards, they should be the same"
+            )
+        if episode_lengths is None:
+            episode_lengths = np.array([len(states)], dtype=np.int64)
+        episode_lengths = np.asarray(episode_lengths, dtype=np.int64)
+        if np.any(episode_lengths < 0) or episode_lengths.sum() != len(states):
+            raise ValueError(f"Episode lengths should be non-negative and add up to the {len(states)} steps")
+        if len(states) == 0:
+            return
+
+        sigmas = states.sigmas[np.arange(states.capacity) < states.lengths[:, None]]
+        if len(sigmas) > 0 and np.abs(sigmas).max() > self._limit:
+            raise ValueError(f"A sigma does not fit in {self.sigma_dtype}, use a wider sigma_dtype")
+        offsets = self._sigma_count + np.cumsum(states.lengths)
+        episodes = self._steps + np.cumsum(episode_lengths)
+        self._buffer.append((sigmas.astype(self.sigma_dtype), offsets, actions, rewards, episodes))
+        self._buffered += len(states)
+        self._steps += len(states)
+        self._sigma_count += len(sigmas)
+        self._episode_count += len(episode_lengths)
+        if self._buffered >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Appends the buffered steps to the files.
+        """
+        if not self._buffer:
+            return
+        dtypes = (self.sigma_dtype.newbyteorder("<"), "<i8", "<i8", "<f4", "<i8")
+        for name, dtype, columns in zip(_COLUMNS, dtypes, zip(*self._buffer)):
+            np.concatenate(columns).astype(dtype, copy=False).tofile(self._files[name])
+        self._buffer = []
+        self._buffered = 0
+
+    def close(self) -> None:
+        """
+        Writes the remaining steps and the metadata and moves the dataset to its directory.
+        """
+        if self._temp_directory is None:
+            return
+        self.flush()
+        for file in self._files.values():
+            file.close()
+        meta = {
+            "version": FORMAT_VERSION,
+            "sigma_dtype": self.sigma_dtype.name,
+            "steps": self._steps,
+            "sigma_count": self._sigma_count,
+            "episodes": self._episode_count,
+        }
+        with open(os.path.join(self._temp_directory, "meta.json"), "w", encoding="utf-8") as meta_file:
+            json.dump(meta, meta_file)
+        os.replace(self._temp_directory, self.directory)
+        self._temp_directory = None
+
+    def discard(self) -> None:
+        """
+        Stops writing and deletes everything written so far.
+        """
+        if self._temp_directory is None:
+            return
+        for file in self._files.values():
+            file.close()
+        shutil.rmtree(self._temp_directory, ignore_errors=True)
+        self._temp_directory = None
+
+
+def _map(path: str, dtype: np.dtype | str, count: int) -> np.ndarray:
+    # np.memmap can not map an empty file.
+    if count == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+
+class TrajectoryDataset:
+    """
+    Trajectories in the flat arrays described at the top of the module. Use `load` to memory-map a dataset written by
+    a `TrajectoryWriter`.
+    """
+
+    def __init__(
+        self,
+        sigmas: np.ndarray,
+        offsets: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        episodes: np.ndarray,
+    ):
+        self.sigmas = sigmas
+        self.offsets = offsets
+        self.actions = actions
+        self.rewards = rewards
+        self.episodes = episodes
+
+    @classmethod
+    def load(cls, directory: str) -> "TrajectoryDataset":
+        """
+        Memory-maps a dataset written by a `TrajectoryWriter`, without reading the columns.
+        """
+        with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as meta_file:
+            meta = json.load(meta_file)
+        if meta["version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported dataset version {meta['version']}, expected {FORMAT_VERSION}")
+        steps = meta["steps"]
+        counts = (meta["sigma_count"], steps + 1, steps, steps, meta["episodes"] + 1)
+        sigma_dtype = np.dtype(meta["sigma_dtype"]).newbyteorder("<")
+        dtypes: tuple[np.dtype | str, ...] = (sigma_dtype, "<i8", "<i8", "<f4", "<i8")
+        return cls(
+            *(
+                _map(os.path.join(directory, f"{name}.bin"), dtype, count)
+                for name, dtype, count in zip(_COLUMNS, dtypes, counts)
+            )
+        )
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    @property
+    def episode_count(self) -> int:
+        return len(self.episodes) - 1
+
+    def episode(self, index: int) -> range:
+        """
+        Returns the steps of the index-th episode.
+        """
+        return range(int(self.episodes[index]), int(self.episodes[index + 1]))
+
+    def braid(self, step: int) -> Braid:
+        """
+        Returns the state of a step.
+        """
+        start, end = int(self.offsets[step]), int(self.offsets[step + 1])
+        return Braid(np.array(self.sigmas[start:end], dtype=SIGMA_DTYPE), copy_sigmas=False)
+
+    def braids(self, start: int = 0, stop: int | None = None) -> Iterator[Braid]:
+        """
+        Yields the states of the steps in `range(start, stop)` one by one.
+        """
+        for step in range(start, len(self) if stop is None else stop):
+            yield self.braid(step)
+
+    def padded(self, steps: np.ndarray | Sequence[int], max_len: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Gathers the states of the given steps into a padded sigma matrix with max_len columns (by default the length
+        of the longest one). Only the sigmas of these states are read from the files.
+
+        Returns: the padded sigma matrix and the lengths.
+        """
+        steps = np.asarray(steps, dtype=np.int64)
+        starts = np.asarray(self.offsets[steps])
+        lengths = np.asarray(self.offsets[steps + 1]) - starts
+        longest = int(lengths.max()) if len(steps) > 0 else 0
+        if max_len is None:
+            max_len = longest
+        if max_len < longest:
+            raise ValueError(f"max_len ({max_len}) is smaller than the longest braid ({longest})")
+        columns = np.arange(max_len)
+        inside = columns < lengths[:, None]
+        padded = np.zeros((len(steps), max_len), dtype=SIGMA_DTYPE)
+        padded[inside] = self.sigmas[(starts[:, None] + columns)[inside]]
+        return padded, lengths
+
+    def batches(
+        self,
+        batch_size: int,
+        max_len: int | None = None,
+        shuffle: bool = False,
+        seed: int | None = None,
+        as_torch: bool = False,
+    ) -> Iterator[TrajectoryBatch]:
+        """
+        Yields the steps in batches of batch_size (the last one might be smaller), each gathered when it is needed.
+
+        max_len: number of columns of the sigma matrices, by default the length of the longest braid of the batch.
+        shuffle: yield the steps in a random order, drawn from a generator seeded with seed.
+        as_torch: yield torch tensors instead of NumPy arrays.
+        """
+        order = np.random.default_rng(seed).permutation(len(self)) if shuffle else np.arange(len(self))
+        for start in range(0, len(self), batch_size):
+            steps = order[start : start + batch_size]
+            sigmas, lengths = self.padded(steps, max_len)
+            batch = TrajectoryBatch(sigmas, lengths, np.asarray(self.actions[steps]), np.asarray(self.rewards[steps]))
+            if as_torch:
+                import torch  # pylint: disable=import-outside-toplevel
+
+                batch = TrajectoryBatch(*(torch.from_numpy(array) for array in batch))
+            yield batch
@@ -0,0 +1,183 @@
+from typing import Any, Sequence, TYPE_CHECKING
+import numpy as np
+from .actions import ActionSpace
+from .braid import SIGMA_DTYPE
+from .braid_batch import BraidBatch, strand_counts_of
+from .data_utils import knot_table
+
+if TYPE_CHECKING:
+    import torch
+
+type Observation = np.ndarray | "torch.Tensor"
+
+
+def table_pool(
+    max_len: int, max_strands: int, knots: Sequence[str] | None
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Collects the braid notations of the knot table (or of the given knots only) that fit in max_len crossings and
+    max_strands strands, as a padded sigma matrix, a length vector and the ids of the notations in the table.
+    """
+    table = knot_table()
+    if knots is None:
+        notations = np.arange(len(table.notation_offsets) - 1)
+    else:
+        notations = np.array([i for name in knots for i in table.notation_ids(name)], dtype=np.int64)
+    starts = table.notation_offsets[notations]
+    lengths = table.notation_offsets[notations + 1] - starts
+
+    columns = np.arange(max_len)[None, :]
+    inside = columns < lengths[:, None]
+    source = np.where(inside, starts[:, None] + columns, 0)
+    sigmas = np.where(inside, np.asarray(table.sigmas)[source], 0).astype(SIGMA_DTYPE)
+    fits = (lengths <= max_len) & (strand_counts_of(sigmas) <= max_strands)
+    return sigmas[fits], lengths[fits], notations[fits]
+
+
+class BraidVecEnv:
+    """
+    Vectorized environment stepping num_envs braids at once, in the style of gymnasium vector environments.
+
+    Observations are padded sigma matrices of shape (num_envs, max_len). Actions are ids of the discrete
+    `ActionSpace(max_len, max_strands)`, the legal ones are given by `info["action_mask"]`. Illegal actions leave the
+    braid unchanged. An episode terminates when the braid becomes trivial (no crossings left) and is truncated after
+    max_steps steps, then the environment is reset automatically: the returned observation is the first observation
+    of the new episode and the last one of the finished episode is in `info["final_observation"]`.
+
+    The reward of a step is the decrease of the number of crossings, minus step_penalty, minus
+    illegal_action_penalty for illegal actions.
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        max_len: int = 32,
+        max_strands: int = 8,
+        knots: Sequence[str] | None = None,
+        pool: BraidBatch | None = None,
+        max_steps: int = 100,
+        step_penalty: float = 0.1,
+        illegal_action_penalty: float = 1.0,
+        as_torch: bool = False,
+        seed: int | None = None,
+    ):
+        """
+        num_envs: number of braids stepped together.
+        max_len, max_strands: bounds of the braids, define the observation shape and the action space.
+        knots: names of the knots episodes start from, defaults to every knot of the table that fits the bounds.
+        pool: braids to start episodes from, instead of the knot table.
+        as_torch: return observations, masks and rewards as torch tensors (sharing memory with the NumPy arrays).
+        """
+        self.num_envs = num_envs
+        self.action_space = ActionSpace(max_len, max_strands)
+        self.max_steps = max_steps
+        self.step_penalty = step_penalty
+        self.illegal_action_penalty = illegal_action_penalty
+        self.as_torch = as_torch
+
+        if pool is not None:
+            self._pool_sigmas = np.zeros((len(pool), max_len), dtype=SIGMA_DTYPE)
+            width = min(pool.capacity, max_len)
+            self._pool_sigmas[:, :width] = pool.sigmas[:, :width]
+            fits = (pool.lengths <= max_len) & (pool.strand_counts <= max_strands)
+            self._pool_sigmas, self._pool_lengths = self._pool_sigmas[fits], pool.lengths[fits]
+        else:
+            self._pool_sigmas, self._pool_lengths, _ = table_pool(max_len, max_strands, knots)
+        if len(self._pool_lengths) == 0:
+            raise ValueError(f"No starting braid fits in max_len = {max_len} and max_strands = {max_strands}")
+
+        self._rng = np.random.default_rng(seed)
+        self._sigmas = np.zeros((num_envs, max_len), dtype=SIGMA_DTYPE)
+        self._lengths = np.zeros(num_envs, dtype=np.int64)
+        self._strand_counts = np.ones(num_envs, dtype=np.int64)
+        self._steps = np.zeros(num_envs, dtype=np.int64)
+        self._masks = self.action_masks()
+
+    @property
+    def max_len(self) -> int:
+        return self.action_space.max_len
+
+    @property
+    def max_strands(self) -> int:
+        return self.action_space.max_strands
+
+    @property
+    def braids(self) -> BraidBatch:
+        """
+        Current braids of the environments (shares memory with the environment state).
+        """
+        return BraidBatch.from_padded(self._sigmas, self._lengths, copy_sigmas=False)
+
+    def _reset_rows(self, rows: np.ndarray) -> None:
+        picked = self._rng.integers(0, len(self._pool_lengths), len(rows))
+        self._sigmas[rows] = self._pool_sigmas[picked]
+        self._lengths[rows] = self._pool_lengths[picked]
+        self._strand_counts[rows] = strand_counts_of(self._sigmas[rows])
+        self._steps[rows] = 0
+
+    def action_masks(self) -> np.ndarray:
+        return self.action_space.masks(self._sigmas, self._lengths, self._strand_counts)
+
+    def _convert(self, array: np.ndarray) -> Observation:
+        if not self.as_torch:
+            return array
+        import torch  # pylint: disable=import-outside-toplevel
+
+        return torch.from_numpy(array)
+
+    def _info(self, mask: np.ndarray) -> dict[str, Any]:
+        return {
+            "action_mask": self._convert(mask),
+            "lengths": self._lengths.copy(),
+            "strand_counts": self._strand_counts.copy(),
+        }
+
+    def reset(self, seed: int | None = None) -> tuple[Observation, dict[str, Any]]:
+        if seed is not None:
+            self._rng = np.random.default_rng(seed)
+        self._reset_rows(np.arange(self.num_envs))
+        self._masks = self.action_masks()
+        return self._convert(self._sigmas.copy()), self._info(self._masks)
+
+    def step(
+        self, actions: np.ndarray | Sequence[int]
+    ) -> tuple[Observation, Observation, Observation, Observation, dict[str, Any]]:
+        """
+        Performs one action in every environment.
+
+        Returns: observations, rewards, terminated, truncated, info, like gymnasium vector environments.
+        """
+        actions = np.asarray(actions, dtype=np.int64).reshape(self.num_envs)
+        rows = np.arange(self.num_envs)
+        legal = self._masks[rows, actions]
+
+        moves, indices, values = self.action_space.decode(actions)
+        moves[~legal] = -1  # Not a move, so the braid stays the same.
+        transformed, _ = BraidBatch.from_padded(self._sigmas, self._lengths, copy_sigmas=False).apply(
+            moves, indices, values
+        )
+
+        rewards = (self._lengths - transformed.lengths) - self.step_penalty - self.illegal_action_penalty * ~legal
+        self._sigmas[:] = transformed.sigmas[:, : self.max_len]
+        self._lengths[:] = transformed.lengths
+        self._strand_counts[:] = transformed.strand_counts
+        self._steps += 1
+
+        terminated = self._lengths == 0
+        truncated = ~terminated & (self._steps >= self.max_steps)
+        done = terminated | truncated
+        final_observation = self._sigmas.copy()
+        if np.any(done):
+            self._reset_rows(np.nonzero(done)[0])
+
+        self._masks = self.action_masks()
+        info = self._info(self._masks)
+        info["final_observation"] = self._convert(final_observation)
+        info["_final_observation"] = done
+        return (
+            self._convert(self._sigmas.copy()),
+            self._convert(rewards.astype(np.float32)),
+            self._convert(terminated),
+            self._convert(truncated),
+            info,
+        )
@@ -0,0 +1,140 @@
+import numpy as np
+
+# Garside left normal form of braids, see e.g. Epstein et al., Word Processing in Groups, chapter 9, or El-Rifai and
+# Morton, Algorithms for positive braids (1994).
+#
+# Simple elements (positive braids in which every two strands cross at most once) are stored as permutations: `w[p]`
+# is the strand (numbered by its starting position) that ends at position p, reading the braid word from left to
+# right, where sigma i crosses the strands at positions i - 1 and i. The half twist Δ is the reversal permutation.
+
+
+def _delta(strand_count: int) -> list[int]:
+    return list(range(strand_count - 1, -1, -1))
+
+
+def _tau(w: list[int]) -> list[int]:
+    """
+    Conjugation by Δ, maps sigma i to sigma n - i
+    """
+    n = len(w)
+    return [n - 1 - w[n - 1 - p] for p in range(n)]
+
+
+def _inverse(w: list[int]) -> list[int]:
+    inverse = [0] * len(w)
+    for position, strand in enumerate(w):
+        inverse[strand] = position
+    return inverse
+
+
+def _letter_factor(sigma: int, strand_count: int) -> list[int]:
+    """
+    Returns sigma i for positive sigmas and `Δ sigma i^-1` for negative ones, so that `sigma i^-1 = Δ^-1 (Δ sigma
+    i^-1)`.
+    """
+    i = abs(sigma)
+    if not 0 < i < strand_count:
+        raise ValueError(f"Sigma {sigma} is not a generator of the braid group on {strand_count} strands")
+    w = list(range(strand_count)) if sigma > 0 else _delta(strand_count)
+    w[i - 1], w[i] = w[i], w[i - 1]
+    return w
+
+
+def _left_weight(a: list[int], b: list[int]) -> bool:
+    """
+    Makes the pair of simple elements (a, b) left-weighted in place, by moving the crossings that can start b to the
+    end of a while the product of the pair stays the same. Returns whether anything changed.
+    """
+    n = len(a)
+    b_inverse = _inverse(b)
+    changed = False
+    i = 1
+    while i < n:
+        # Sigma i is a left divisor of b and a sigma i is still simple.
+        if b_inverse[i - 1] > b_inverse[i] and a[i - 1] < a[i]:
+            a[i - 1], a[i] = a[i], a[i - 1]
+            b_inverse[i - 1], b_inverse[i] = b_inverse[i], b_inverse[i - 1]
+            changed = True
+            i = 1
+        else:
+            i += 1
+    if changed:
+        b[:] = _inverse(b_inverse)
+    return changed
+
+
+def left_normal_form(sigmas: np.ndarray | list[int], strand_count: int) -> tuple[int, np.ndarray]:
+    """
+    Computes the Garside left normal form `Δ^infimum A_1 A_2 ... A_k` of the braid in the braid group on strand_count
+    strands, where the A_i are simple elements different from Δ and the identity, and every pair (A_i, A_i+1) is
+    left-weighted. Two braid words are equal in the braid group if and only if their normal forms are equal.
+
+    Each letter is multiplied to the normal form of the previous letters, which takes one right-to-left pass over the
+    factors, so the running time is at most quadratic in the length of the word.
+
+    Returns: infimum and the factors as a (k, strand_count) matrix of permutations (see the top of this module)
+    """
+    delta = _delta(strand_count)
+    identity = list(range(strand_count))
+    # sigma i^-1 = Δ^-1 (Δ sigma i^-1) and X Δ^-1 = Δ^-1 τ(X), so moving every Δ^-1 to the front applies τ to a letter
+    # as many times as there are negative letters after it.
+    remaining_negatives = sum(1 for sigma in sigmas if sigma < 0)
+    infimum = -remaining_negatives
+    factors: list[list[int]] = []
+    for sigma in sigmas:
+        sigma = int(sigma)
+        if sigma < 0:
+            remaining_negatives -= 1
+        factor = _letter_factor(sigma, strand_count)
+        factors.append(_tau(factor) if remaining_negatives % 2 == 1 else factor)
+
+        j = len(factors) - 1
+        while j > 0 and _left_weight(factors[j - 1], factors[j]):
+            j -= 1
+        while factors and factors[0] == delta:
+            factors.pop(0)
+            infimum += 1
+        while factors and factors[-1] == identity:
+            factors.pop()
+
+    return infimum, np.array(factors, dtype=np.int32).reshape(len(factors), strand_count)
+
+
+def simple_word(w: np.ndarray | list[int]) -> list[int]:
+    """
+    Returns a positive braid word of the simple element w.
+    """
+    w = list(w)
+    word: list[int] = []
+    i = 1
+    while i < len(w):
+        if w[i - 1] > w[i]:
+            w[i - 1], w[i] = w[i], w[i - 1]
+            word.append(i)
+            i = 1
+        else:
+            i += 1
+    return word[::-1]
+
+
+def normal_form_word(infimum: int, factors: np.ndarray, strand_count: int) -> list[int]:
+    """
+    Returns the braid word of a left normal form, `Δ^infimum` written as a power of
+    `sigma 1 sigma 2 ... sigma n-1 sigma 1 ... sigma n-2 ... sigma 1` followed by the words of the factors.
+    """
+    delta = [i for top in range(strand_count - 1, 0, -1) for i in range(1, top + 1)]
+    if infimum >= 0:
+        word = delta * infimum
+    else:
+        word = [-i for i in delta[::-1]] * -infimum
+    for factor in factors:
+        word.extend(simple_word(factor))
+    return word
+
+
+def normal_form_key_sigmas(infimum: int, factors: np.ndarray, strand_count: int) -> np.ndarray:
+    """
+    Flattens a left normal form to the array `[strand_count, infimum, *factors]`, used as `BraidKey` of the normal
+    form.
+    """
+    return np.concatenate(([strand_count, infimum], np.asarray(factors).reshape(-1))).astype(np.int32)
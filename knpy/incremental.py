@@ -0,0 +1,186 @@
+from typing import Callable
+import numpy as np
+from .actions import braid_relation1_mask, braid_relation2_mask, remove_sigma_inverse_pair_mask
+from .braid import Braid
+
+type MaskUpdate = Callable[[np.ndarray], np.ndarray]
+
+
+# Performability of the moves at a single position p of the circular braid s, see the corresponding `Braid` member
+# functions.
+def _braid_relation1_at(s: np.ndarray, p: int) -> bool:
+    n = len(s)
+    if n < 3:
+        return False
+    a, b, c = int(s[p]), int(s[(p + 1) % n]), int(s[(p + 2) % n])
+    return abs(a) == abs(c) and abs(abs(b) - abs(a)) == 1 and not ((b > 0) != (a > 0) and (b > 0) != (c > 0))
+
+
+def _braid_relation2_at(s: np.ndarray, p: int) -> bool:
+    return abs(abs(int(s[p])) - abs(int(s[(p + 1) % len(s)]))) >= 2
+
+
+def _remove_sigma_inverse_pair_at(s: np.ndarray, p: int) -> bool:
+    return int(s[p]) == -int(s[(p + 1) % len(s)])
+
+
+# (check, number of crossings the move at a position reads) of every cached mask, in the order of `_masks`
+_MASK_CHECKS = ((_braid_relation1_at, 3), (_braid_relation2_at, 2), (_remove_sigma_inverse_pair_at, 2))
+
+
+class IncrementalBraid(Braid):
+    """
+    `Braid` that keeps the masks of the positions where braid relation 1, braid relation 2 and the removal of a sigma
+    inverse pair are performable, and the number of occurrences of every generator (used for destabilization).
+
+    Moves return `IncrementalBraid` objects too. Their masks are copied from the original braid and only recomputed at
+    the few positions whose chunk contains a changed crossing, so checking whether a move is performable is O(1) and
+    the `*_performable_indices` functions do not loop in Python. This pays off for long braids, like the ones in
+    `benchmark.csv`, and when many moves are checked per state (e.g. `performable_moves` and `legal_action_mask`).
+    """
+
+    def __init__(self, sigmas: np.ndarray | list[int] | str, notation_index: int = 0, copy_sigmas: bool = True):
+        super().__init__(sigmas, notation_index, copy_sigmas)
+        padded, lengths = self._braid[None, :], np.array([len(self)])
+        self._masks: tuple[np.ndarray, np.ndarray, np.ndarray] = (
+            braid_relation1_mask(padded, lengths)[0],
+            braid_relation2_mask(padded, lengths)[0],
+            remove_sigma_inverse_pair_mask(padded, lengths)[0],
+        )
+        self._counts = np.bincount(np.abs(self._braid), minlength=self._n)
+
+    def _derived(
+        self, braid: Braid, update: MaskUpdate, changed: list[int], seams: list[int], counts: np.ndarray
+    ) -> "IncrementalBraid":
+        """
+        Creates the result of a move from the `Braid` computed by the base class.
+
+        update: maps a mask of this braid to the mask of the result, e.g. inserting elements where crossings are
+            inserted (the value of these elements does not matter).
+        changed: positions of the result where the crossing is new or different.
+        seams: positions of the result which are preceded by a crossing that was not there before them (because
+            crossings were removed in between).
+        counts: occurrences of the absolute values of the sigmas of the result, might be longer than its strand count.
+        """
+        s, n = braid.notation(copy=False), len(braid)
+        masks = []
+        for mask, (check, width) in zip(self._masks, _MASK_CHECKS):
+            mask = update(mask)
+            if n > 0:
+                positions = {(c - t) % n for c in changed for t in range(width)}
+                positions.update((seam - t) % n for seam in seams for t in range(1, width))
+                for p in positions:
+                    mask[p] = check(s, p)
+            masks.append(mask)
+        return IncrementalBraid._from_braid(braid, (masks[0], masks[1], masks[2]), counts[: braid.strand_count])
+
+    @classmethod
+    def _from_braid(
+        cls, braid: Braid, masks: tuple[np.ndarray, np.ndarray, np.ndarray], counts: np.ndarray
+    ) -> "IncrementalBraid":
+        obj = cls.__new__(cls)
+        # Takes over every attribute of braid, so the Braid constructor is not repeated.
+        obj.__dict__.update(braid.__dict__)
+        obj._masks = masks
+        obj._counts = counts
+        return obj
+
+    def shift_left(self, amount: int = 1) -> "IncrementalBraid":
+        shifted = super().shift_left(amount)
+        return self._derived(shifted, lambda mask: np.roll(mask, -amount), [], [], self._counts)
+
+    def shift_right(self, amount: int = 1) -> "IncrementalBraid":
+        return self.shift_left(-amount)
+
+    def braid_relation1(self, index: int) -> "IncrementalBraid":
+        transformed = super().braid_relation1(index)
+        i = index % len(self)
+        counts = self._counts.copy()
+        counts[abs(self._braid[i])] -= 1
+        counts[abs(self._braid[(i + 1) % len(self)])] += 1
+        return self._derived(transformed, np.copy, [i, i + 1, i + 2], [], counts)
+
+    def braid_relation2(self, index: int) -> "IncrementalBraid":
+        transformed = super().braid_relation2(index)
+        i = index % len(self)
+        return self._derived(transformed, np.copy, [i, i + 1], [], self._counts)
+
+    def conjugation(self, value: int, index: int) -> "IncrementalBraid":
+        conjugated = super().conjugation(value, index)
+        counts = self._counts.copy()
+        counts[abs(value)] += 2
+        if index == len(self) + 1:
+            return self._derived(conjugated, lambda mask: np.pad(mask, 1), [0, len(self) + 1], [], counts)
+        return self._derived(
+            conjugated, lambda mask: np.insert(mask, index, [False, False]), [index, index + 1], [], counts
+        )
+
+    def stabilization(self, index: int | None = None, on_top=False, inverse: bool = False) -> "IncrementalBraid":
+        stabilized = super().stabilization(index, on_top, inverse)
+        if index is None:
+            index = len(self)
+        # Stabilization on top increases every other sigma, which does not change the other chunks' performability.
+        counts = np.concatenate(([0, 1], self._counts[1:])) if on_top else np.append(self._counts, 1)
+        return self._derived(stabilized, lambda mask: np.insert(mask, index, False), [index], [], counts)
+
+    def destabilization(self, index: int) -> "IncrementalBraid":
+        destabilized = super().destabilization(index)
+        # Destabilization on top decreases every other sigma, which does not change the other chunks' performability.
+        removed = abs(int(self._braid[index]))
+        counts = self._counts.copy()
+        counts[removed] -= 1
+        if removed == 1:
+            counts = np.concatenate(([0], counts[2:]))
+        return self._derived(destabilized, lambda mask: np.delete(mask, index), [], [index], counts)
+
+    def remove_sigma_inverse_pair(self, index: int) -> "IncrementalBraid":
+        removed = super().remove_sigma_inverse_pair(index)
+        i = index % len(self)
+        counts = self._counts.copy()
+        counts[abs(self._braid[i])] -= 2
+        return self._derived(
+            removed,
+            lambda mask: np.delete(mask, [i, (i + 1) % len(self)]),
+            [],
+            [i if i < len(self) - 1 else 0],
+            counts,
+        )
+
+    def is_braid_relation1_performable(self, index: int) -> bool:
+        if len(self) < 3:
+            return False
+        if index >= 0:
+            index -= len(self)
+        return bool(self._masks[0][index])
+
+    def braid_relation1_performable_indices(self) -> np.ndarray:
+        return np.flatnonzero(self._masks[0])
+
+    def is_braid_relation2_performable(self, index: int) -> bool:
+        if not -len(self) <= index < len(self):
+            return super().is_braid_relation2_performable(index)  # Raises IndexOutOfRangeException
+        return bool(self._masks[1][index])
+
+    def braid_relation2_performable_indices(self) -> np.ndarray:
+        return np.flatnonzero(self._masks[1])
+
+    def is_remove_sigma_inverse_pair_performable(self, index: int) -> bool:
+        if not -len(self) <= index < len(self):
+            return super().is_remove_sigma_inverse_pair_performable(index)  # Raises IndexOutOfRangeException
+        return bool(self._masks[2][index])
+
+    def remove_sigma_inverse_pair_performable_indices(self) -> np.ndarray:
+        return np.flatnonzero(self._masks[2])
+
+    def is_destabilization_performable(self, index: int) -> bool:
+        if not 0 <= index < len(self):
+            return False
+        removed = abs(int(self._braid[index]))
+        return removed in (1, self._n - 1) and self._counts[removed] == 1
+
+    def destabilization_performable_indices(self) -> np.ndarray:
+        # The sigmas are only scanned when the top or bottom generator is unique.
+        unique = [value for value in (1, self._n - 1) if 0 < value < len(self._counts) and self._counts[value] == 1]
+        if not unique:
+            return np.array([], dtype=np.int64)
+        return np.flatnonzero(np.isin(np.abs(self._braid), unique))
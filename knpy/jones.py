@@ -0,0 +1,385 @@
+from collections import OrderedDict
+from collections.abc import Hashable
+from functools import lru_cache
+from typing import NamedTuple
+import numpy as np
+from .braid_key import BraidKey
+from .data_utils import knot_table
+from .polynomial import LaurentPolynomial
+from .rotation import least_rotation
+
+# Exact Jones polynomial of the closure of a braid, through the Temperley–Lieb representation of the Kauffman bracket.
+# Every crossing is smoothed in two ways,
+#
+#     σ_i    = A + A^-1 e_i
+#     σ_i^-1 = A^-1 + A e_i
+#
+# so a braid word is an element of the Temperley–Lieb algebra: a combination of the crossingless diagrams on 2m points
+# (m at the top, m at the bottom) with Laurent polynomials in A as coefficients. Composing diagrams can close a loop,
+# which is replaced by δ = -A^2 - A^-2. Closing the braid turns every diagram into some loops, so the bracket is
+#
+#     <β> = Σ_D c_D δ^(loops(D) - 1)
+#
+# and the Jones polynomial is V(t) = (-A^3)^-w <β> at A = t^(-1/4), with w the writhe of the braid.
+#
+# The number of diagrams grows like the Catalan numbers of the number of strands, so the word is multiplied on a window
+# of strands only: a strand is opened (as a straight line) when the first sigma touches it, and the leftmost or
+# rightmost strand of the window is closed (traced out, as in the closure of the braid) after the last sigma touching
+# it. For the 10 and 12 strand braids of the knot table this divides the work by 3 to 10.
+#
+# The diagrams of an element are rows of an array, each one listing the partner of every point, and the coefficients
+# are dense rows over the exponents of A, so one sigma is a few numpy operations on the whole element. The elements of
+# the prefixes of a word are kept in `prefix_cache`, so the words of consecutive states of an episode, which share most
+# of their prefix, only multiply the sigmas after the first difference.
+
+_INT64_LIMIT = float(1 << 60)  # Total magnitude of the coefficients that can still be tripled without overflow
+
+
+class TemperleyLiebElement(NamedTuple):
+    diagrams: np.ndarray  # (R, 2m): partner of each point, top points 0..m-1 and bottom points m..2m-1 (left to right)
+    coefficients: np.ndarray  # (R, W): coefficient of A^(lowest + 2j) of diagram r, int64 or object (exact big ints)
+    lowest: int
+
+    @property
+    def strand_count(self) -> int:
+        return self.diagrams.shape[1] // 2
+
+    @property
+    def nbytes(self) -> int:
+        return self.diagrams.nbytes + self.coefficients.nbytes
+
+    @classmethod
+    def identity(cls, strand_count: int) -> "TemperleyLiebElement":
+        diagram = np.concatenate((np.arange(strand_count, 2 * strand_count), np.arange(strand_count)))
+        return cls(diagram.astype(np.int16)[None, :], np.ones((1, 1), dtype=np.int64), 0)
+
+    def multiply(self, sigma: int) -> "TemperleyLiebElement":
+        """
+        Returns the element multiplied on the right (below) by the sigma.
+        """
+        diagrams, coefficients = self.diagrams, self.coefficients
+        rows, width = coefficients.shape
+        strand_count = self.strand_count
+        i = abs(sigma)
+        if not 0 < i < strand_count:
+            raise ValueError(f"Sigma {sigma} is not a generator of the braid group on {strand_count} strands")
+        # e_i joins the bottom points a and b of the diagram (closing a loop if they were already partners) and adds a
+        # new pair a, b at the bottom.
+        a, b = strand_count + i - 1, strand_count + i
+        loop = diagrams[:, a] == b
+        joined = _join(diagrams, a, b, loop)
+        joined[:, a], joined[:, b] = b, a
+
+        # The identity part gets A^±1 and the e_i part A^∓1, times δ for closed loops. All the exponents change parity,
+        # the new lowest one is 3 smaller and the window of exponents grows by 3 columns, trimmed in `_combine`.
+        identity_column, e_column = (2, 1) if sigma > 0 else (1, 2)
+        new_coefficients = np.zeros((2 * rows, width + 3), dtype=coefficients.dtype)
+        new_coefficients[:rows, identity_column : identity_column + width] = coefficients
+        new_coefficients[rows:, e_column : e_column + width] = coefficients
+        _multiply_delta(new_coefficients[rows:], coefficients, loop, e_column)
+        return _combine(np.concatenate((diagrams, joined)), new_coefficients, self.lowest - 3)
+
+    def widen(self, left: int, right: int) -> "TemperleyLiebElement":
+        """
+        Returns the element with straight strands added on the left and on the right.
+        """
+        strand_count = self.strand_count
+        new_count = strand_count + left + right
+        points = np.arange(2 * strand_count)
+        relabel = np.where(points < strand_count, points + left, points - strand_count + new_count + left)
+        diagrams = np.empty((len(self.diagrams), 2 * new_count), dtype=self.diagrams.dtype)
+        diagrams[:] = np.concatenate((np.arange(new_count, 2 * new_count), np.arange(new_count)))
+        diagrams[:, relabel] = relabel[self.diagrams]
+        return TemperleyLiebElement(diagrams, self.coefficients, self.lowest)
+
+    def close(self, left: bool) -> "TemperleyLiebElement":
+        """
+        Returns the element with its leftmost (or rightmost) strand closed, i.e. its top and bottom points joined
+        around the side of the diagrams. This is the partial trace: closing the remaining strands gives the same loops.
+        """
+        diagrams, coefficients = self.diagrams, self.coefficients
+        strand_count = self.strand_count
+        top = 0 if left else strand_count - 1
+        bottom = top + strand_count
+        loop = diagrams[:, top] == bottom
+        joined = _join(diagrams, top, bottom, loop)
+        kept = np.delete(np.arange(2 * strand_count), [top, bottom])
+        relabel = np.full(2 * strand_count, -1, dtype=diagrams.dtype)
+        relabel[kept] = np.arange(len(kept))
+
+        new_coefficients = np.zeros((len(diagrams), coefficients.shape[1] + 2), dtype=coefficients.dtype)
+        new_coefficients[:, 1:-1] = coefficients
+        _multiply_delta(new_coefficients, coefficients, loop, 1)
+        return _combine(relabel[joined[:, kept]], new_coefficients, self.lowest - 2)
+
+    def bracket(self, extra_loops: int = 0) -> LaurentPolynomial:
+        """
+        Returns the Kauffman bracket (in A) of the closure of the element, normalized so the unknot has bracket 1, with
+        extra_loops more unknotted components.
+        """
+        loops = _closure_loops(self.diagrams) + extra_loops
+        total = LaurentPolynomial()
+        for count in np.unique(loops):
+            coefficients = self.coefficients[loops == count].sum(axis=0)
+            terms = {self.lowest + 2 * j: int(c) for j, c in enumerate(coefficients)}
+            total += LaurentPolynomial(terms) * _delta_power(int(count) - 1)
+        return total
+
+
+def _join(diagrams: np.ndarray, a: int, b: int, loop: np.ndarray) -> np.ndarray:
+    """
+    Returns a copy of the diagrams where the partners of points a and b are partners, except for the rows of loop where
+    a and b are partners.
+    """
+    joined = diagrams.copy()
+    rows = np.flatnonzero(~loop)
+    x, y = diagrams[rows, a], diagrams[rows, b]
+    joined[rows, x] = y
+    joined[rows, y] = x
+    return joined
+
+
+def _multiply_delta(target: np.ndarray, coefficients: np.ndarray, loop: np.ndarray, column: int) -> None:
+    """
+    Replaces the coefficients, placed from column of target, by their product with δ = -A^2 - A^-2 in the rows of loop.
+    """
+    rows = np.flatnonzero(loop)
+    if len(rows) == 0:
+        return
+    width = coefficients.shape[1]
+    looped = coefficients[rows]
+    target[rows] = 0
+    target[rows, column - 1 : column - 1 + width] -= looped
+    target[rows, column + 1 : column + 1 + width] -= looped
+
+
+def _combine(diagrams: np.ndarray, coefficients: np.ndarray, lowest: int) -> TemperleyLiebElement:
+    """
+    Sums the coefficients of equal diagrams, drops the zero rows and trims the zero columns.
+    """
+    keys = np.ascontiguousarray(diagrams).view(np.dtype((np.void, diagrams.dtype.itemsize * diagrams.shape[1])))[:, 0]
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1])))
+    # Sums of the runs of equal keys as differences of the cumulative sums (much faster than `np.add.reduceat` on
+    # rows), which cannot overflow since they are bounded by the total magnitude of the coefficients.
+    cumulative = np.cumsum(coefficients[order], axis=0)
+    summed = cumulative[np.append(starts[1:], len(order)) - 1]
+    summed[1:] -= cumulative[starts[1:] - 1]
+    nonzero_rows = np.flatnonzero(summed.any(axis=1))
+    summed, diagrams = summed[nonzero_rows], diagrams[order[starts[nonzero_rows]]]
+    columns = np.flatnonzero(summed.any(axis=0))
+    if len(columns) == 0:
+        raise ArithmeticError("The Temperley–Lieb element vanished")
+    summed = summed[:, columns[0] : columns[-1] + 1]
+    if summed.dtype != object and float(np.abs(summed).sum(dtype=np.float64)) > _INT64_LIMIT:
+        summed = summed.astype(object)
+    return TemperleyLiebElement(diagrams, summed, lowest + 2 * int(columns[0]))
+
+
+def _closure_loops(diagrams: np.ndarray) -> np.ndarray:
+    """
+    Returns the number of loops of the closure (top point i joined to bottom point i) of every diagram.
+    """
+    points = diagrams.shape[1]
+    strand_count = points // 2
+    rows = np.arange(len(diagrams))[:, None]
+    closure = (np.arange(points) + strand_count) % points
+    labels = np.broadcast_to(np.arange(points), diagrams.shape).copy()
+    while True:
+        # Every loop ends up labeled by its smallest point.
+        new_labels = np.minimum(np.minimum(labels, labels[rows, diagrams]), labels[:, closure])
+        if np.array_equal(new_labels, labels):
+            return (labels == np.arange(points)).sum(axis=1)
+        labels = new_labels
+
+
+@lru_cache(maxsize=None)
+def _delta_power(exponent: int) -> LaurentPolynomial:
+    if exponent == 0:
+        return LaurentPolynomial(1)
+    return _delta_power(exponent - 1) * LaurentPolynomial({-2: -1, 2: -1})
+
+
+class Window(NamedTuple):
+    """
+    Strands of a braid on strand_count strands after a prefix of its word: lo..hi-1 are open, the strands left of
+    closed_left and from closed_right on are closed and the others are not opened yet.
+    """
+
+    lo: int
+    hi: int
+    closed_left: int
+    closed_right: int
+
+
+def windows(sigmas: list[int], strand_count: int) -> list[Window]:
+    """
+    Returns the window of open strands after each prefix of the word (from the empty one) on which the element of the
+    prefix is computed. A strand is closed after the last sigma touching it, when it is on the side of the window and
+    all the strands beyond it are closed, so the window of open strands stays contiguous. The last open strand is
+    never closed.
+    """
+    last_use = [-1] * strand_count
+    for index, sigma in enumerate(sigmas):
+        last_use[abs(sigma) - 1] = last_use[abs(sigma)] = index
+    window = Window(0, 0, 0, strand_count)
+    result = [window]
+    for index, sigma in enumerate(sigmas):
+        lo, hi, closed_left, closed_right = window
+        i = abs(sigma)
+        lo, hi = (i - 1, i + 1) if lo == hi else (min(lo, i - 1), max(hi, i + 1))
+        while lo == closed_left and hi - lo > 1 and last_use[lo] <= index:
+            lo, closed_left = lo + 1, closed_left + 1
+        while hi == closed_right and hi - lo > 1 and last_use[hi - 1] <= index:
+            hi, closed_right = hi - 1, closed_right - 1
+        window = Window(lo, hi, closed_left, closed_right)
+        result.append(window)
+    return result
+
+
+class PrefixCache:
+    """
+    LRU cache of the Temperley–Lieb elements of braid word prefixes, bounded by the memory of the elements.
+    """
+
+    def __init__(self, max_bytes: int = 64 << 20):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, TemperleyLiebElement] = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: Hashable) -> TemperleyLiebElement | None:
+        element = self._entries.get(key)
+        if element is not None:
+            self._entries.move_to_end(key)
+        return element
+
+    def put(self, key: Hashable, element: TemperleyLiebElement) -> None:
+        if key in self._entries or element.nbytes > self.max_bytes:
+            return
+        self._entries[key] = element
+        self._bytes += element.nbytes
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+
+prefix_cache = PrefixCache()
+
+
+def _strand_count(sigmas: np.ndarray, strand_count: int | None) -> int:
+    largest = int(np.abs(sigmas).max(initial=0))
+    if strand_count is None:
+        return largest + 1
+    if strand_count <= largest:
+        raise ValueError(f"The braid does not fit on {strand_count} strands")
+    return strand_count
+
+
+def _bracket(sigmas: list[int], strand_count: int) -> LaurentPolynomial:
+    """
+    Returns the Kauffman bracket, starting from the longest prefix of the word whose element is in `prefix_cache`.
+    """
+    prefix_windows = windows(sigmas, strand_count)
+    # The element of a prefix also depends on the strands closed so far, which depend on the rest of the word.
+    keys = [(strand_count, window, tuple(sigmas[:length])) for length, window in enumerate(prefix_windows)]
+    start, element = 0, TemperleyLiebElement.identity(1)
+    for length in range(len(sigmas), 0, -1):
+        cached = prefix_cache.get(keys[length])
+        if cached is not None:
+            start, element = length, cached
+            break
+    for length in range(start + 1, len(sigmas) + 1):
+        sigma, previous, window = sigmas[length - 1], prefix_windows[length - 1], prefix_windows[length]
+        i = abs(sigma)
+        if previous.lo == previous.hi:
+            element, lo = element.widen(0, 1), i - 1
+        else:
+            lo = min(previous.lo, i - 1)
+            element = element.widen(previous.lo - lo, max(previous.hi, i + 1) - previous.hi)
+        element = element.multiply(sigma - lo if sigma > 0 else sigma + lo)
+        for _ in range(window.closed_left - previous.closed_left):
+            element = element.close(left=True)
+        for _ in range(previous.closed_right - window.closed_right):
+            element = element.close(left=False)
+        prefix_cache.put(keys[length], element)
+    window = prefix_windows[-1]
+    opened = max(window.hi - window.lo, 1) + window.closed_left + strand_count - window.closed_right
+    return element.bracket(extra_loops=strand_count - opened)
+
+
+def kauffman_bracket(sigmas: np.ndarray | list[int], strand_count: int | None = None) -> LaurentPolynomial:
+    """
+    Returns the Kauffman bracket (a Laurent polynomial in A, with the unknot normalized to 1) of the closure of the
+    braid on strand_count strands (by default one more than the largest absolute value of the sigmas).
+    """
+    sigmas = np.asarray(sigmas)
+    strand_count = _strand_count(sigmas, strand_count)
+    return _bracket([int(s) for s in sigmas], strand_count)
+
+
+def _compute(sigmas: list[int], strand_count: int) -> LaurentPolynomial:
+    writhe = sum(1 if sigma > 0 else -1 for sigma in sigmas)
+    bracket = _bracket(sigmas, strand_count).shift(-3 * writhe)
+    if any(exponent % 4 for exponent in bracket.terms):
+        raise ValueError(
+            "The closure of the braid is a link with an even number of components, its Jones polynomial has "
+            "half-integer exponents (see `kauffman_bracket`)"
+        )
+    sign = -1 if writhe % 2 else 1
+    return LaurentPolynomial({-exponent // 4: sign * coefficient for exponent, coefficient in bracket.terms.items()})
+
+
+_MAX_RESULTS = 1 << 16
+# LRU cache of the results, keyed on the least rotation of the notation and the strand count
+_results: OrderedDict[tuple[BraidKey, int], LaurentPolynomial] = OrderedDict()
+
+
+def jones_polynomial(sigmas: np.ndarray | list[int], strand_count: int | None = None) -> LaurentPolynomial:
+    """
+    Returns the Jones polynomial in t of the closure of the braid on strand_count strands (by default one more than the
+    largest absolute value of the sigmas), with the conventions of KnotInfo (t+t^3-t^4 for the trefoil `[1, 1, 1]`).
+    Raises ValueError for links whose Jones polynomial has half-integer exponents.
+
+    Results are cached, keyed on the least rotation of the notation (see `knpy.rotation`), so rotations of a braid share
+    one result. A result that is not cached is computed on the word as given, which shares its prefixes (in
+    `prefix_cache`) with the words of the previous states of an episode.
+    """
+    sigmas = np.asarray(sigmas)
+    strand_count = _strand_count(sigmas, strand_count)
+    amount = least_rotation(sigmas.tolist())
+    key = (BraidKey(np.concatenate((sigmas[amount:], sigmas[:amount]))), strand_count)
+    result = _results.get(key)
+    if result is not None:
+        _results.move_to_end(key)
+        return result
+    result = _compute([int(s) for s in sigmas], strand_count)
+    _results[key] = result
+    if len(_results) > _MAX_RESULTS:
+        _results.popitem(last=False)
+    return result
+
+
+@lru_cache(maxsize=None)
+def knot_jones_polynomial(name: str, notation_index: int = 0) -> LaurentPolynomial:
+    """
+    Returns the Jones polynomial of a knot of the table, by its name as used by `Braid`, e.g. "8_19".
+    """
+    return jones_polynomial(knot_table().notation(name, notation_index))
+
+
+def clear_cache() -> None:
+    _results.clear()
+    knot_jones_polynomial.cache_clear()
+    prefix_cache.clear()
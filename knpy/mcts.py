@@ -0,0 +1,451 @@
+import math
+import multiprocessing
+import multiprocessing.synchronize
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, NamedTuple
+import numpy as np
+from .actions import ActionSpace, action_space
+from . import braid_vec
+from .braid import Braid, SIGMA_DTYPE
+from .braid_batch import BraidBatch, notation_of
+from .braid_key import BraidKey
+
+# Monte Carlo tree search over the actions of `knpy.actions.ActionSpace`, with the rewards of `knpy.env.BraidVecEnv`:
+# the decrease of the number of crossings minus a step penalty, ending when no crossing is left.
+#
+# A node is the least rotation of a braid (see `Braid.canonical_rotation`), so all rotations of a notation share one
+# node and the actions of a node refer to its least rotation. Nodes are stored in a `TranspositionTable` keyed by the
+# hash of their `BraidKey`, which is the same in every process, so the table can be shared by threads (one lock) and by
+# processes (shared memory). Statistics are kept per node, not per edge: the value of an action is its reward plus the
+# mean return of the child it leads to, wherever that child was reached from.
+#
+# Simulations are run in batches: batch_size paths are selected (with a virtual loss on the nodes they pass through, so
+# they spread over the tree), then all their leaves are scored with one call of the evaluator, e.g. one forward pass of
+# a policy and value network, and the returns are backed up.
+
+# Scores a batch of leaves: takes the leaves and their (N, action count) legal action masks, returns the (N, action
+# count) prior probabilities of the actions and the (N,) values of the leaves.
+type Evaluator = Callable[[BraidBatch, np.ndarray], tuple[np.ndarray, np.ndarray]]
+
+
+def uniform_evaluator(leaves: BraidBatch, masks: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Evaluator without knowledge: uniform priors over the legal actions and zero values.
+    """
+    # pylint: disable=unused-argument
+    priors = masks / np.maximum(masks.sum(axis=1, keepdims=True), 1)
+    return priors, np.zeros(len(masks))
+
+
+class TranspositionTable:
+    """
+    Open addressing hash table (linear probing) of MCTS node statistics, in numpy arrays of capacity slots. A slot is
+    identified by the hash of the `BraidKey` of its node, braids with the same hash share a slot. The arrays
+    can be read directly (e.g. `table.visits[slot]`), they should only be modified with `lock` held.
+
+    With shared=True the arrays live in one shared memory block, and passing the table to a process when it is started
+    (e.g. as an argument of a process pool initializer) attaches to the same block there. The creator of the table
+    should call `close` when done with it, which also frees the block.
+    """
+
+    def __init__(self, capacity: int, action_count: int, shared: bool = False):
+        if capacity < 1 or capacity & (capacity - 1):
+            raise ValueError("The capacity must be a power of two")
+        self.capacity = capacity
+        self.action_count = action_count
+        size = self._layout(capacity, action_count)[1]
+        self._memory: shared_memory.SharedMemory | None
+        self._lock: threading.Lock | multiprocessing.synchronize.Lock
+        buffer: memoryview | bytearray | None  # SharedMemory.buf is only None after close
+        if shared:
+            self._memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+            self._lock = multiprocessing.get_context("spawn").Lock()
+            buffer = self._memory.buf
+        else:
+            self._memory = None
+            self._lock = threading.Lock()
+            buffer = bytearray(size)
+        self._owner = True
+        self._set_arrays(buffer)
+
+    @staticmethod
+    def _layout(capacity: int, action_count: int) -> tuple[list[tuple[str, np.dtype, tuple[int, ...], int]], int]:
+        fields = [
+            ("hashes", np.dtype(np.int64), (capacity,)),  # 0 marks an empty slot
+            ("visits", np.dtype(np.int64), (capacity,)),
+            ("value_sums", np.dtype(np.float64), (capacity,)),
+            ("expanded", np.dtype(np.bool_), (capacity,)),  # The priors of the node are set
+            ("priors", np.dtype(np.float32), (capacity, action_count)),
+        ]
+        layout, offset = [], 0
+        for name, dtype, shape in fields:
+            offset = -(-offset // 8) * 8
+            layout.append((name, dtype, shape, offset))
+            offset += dtype.itemsize * math.prod(shape)
+        return layout, offset
+
+    def _set_arrays(self, buffer) -> None:
+        layout, _ = self._layout(self.capacity, self.action_count)
+        arrays: dict[str, np.ndarray] = {
+            name: np.ndarray(shape, dtype, buffer=buffer, offset=offset) for name, dtype, shape, offset in layout
+        }
+        self.hashes: np.ndarray = arrays["hashes"]
+        self.visits: np.ndarray = arrays["visits"]
+        self.value_sums: np.ndarray = arrays["value_sums"]
+        self.expanded: np.ndarray = arrays["expanded"]
+        self.priors: np.ndarray = arrays["priors"]
+
+    @classmethod
+    def _attach(cls, name: str, capacity: int, action_count: int, lock) -> "TranspositionTable":
+        obj = cls.__new__(cls)
+        obj.capacity, obj.action_count = capacity, action_count
+        obj._memory = shared_memory.SharedMemory(name=name)
+        obj._lock = lock
+        obj._owner = False
+        obj._set_arrays(obj._memory.buf)
+        return obj
+
+    def __reduce__(self):
+        if self._memory is None:
+            raise TypeError("Only shared transposition tables can be pickled")
+        return (TranspositionTable._attach, (self._memory.name, self.capacity, self.action_count, self._lock))
+
+    @property
+    def lock(self):
+        return self._lock
+
+    @staticmethod
+    def slot_hash(keys: list[BraidKey]) -> np.ndarray:
+        """
+        Returns the nonzero hashes the table uses for keys.
+        """
+        hashes = np.array([hash(key) for key in keys], dtype=np.int64)
+        hashes[hashes == 0] = 1
+        return hashes
+
+    def find(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Returns the slots of the hashes, -1 for the ones not in the table.
+        """
+        mask = self.capacity - 1
+        slots = hashes & mask
+        result = np.full(len(hashes), -1, dtype=np.int64)
+        pending = np.arange(len(hashes))
+        for _ in range(self.capacity):
+            stored = self.hashes[slots[pending]]
+            found = stored == hashes[pending]
+            result[pending[found]] = slots[pending[found]]
+            pending = pending[~found & (stored != 0)]
+            if len(pending) == 0:
+                break
+            slots[pending] = (slots[pending] + 1) & mask
+        return result
+
+    def insert(self, hash_value: int) -> int:
+        """
+        Returns the slot of the hash, taking an empty slot if it is not in the table yet. Call it with `lock` held.
+        """
+        slot = hash_value & (self.capacity - 1)
+        for _ in range(self.capacity):
+            stored = self.hashes[slot]
+            if stored == hash_value:
+                return slot
+            if stored == 0:
+                self.hashes[slot] = hash_value
+                return slot
+            slot = (slot + 1) & (self.capacity - 1)
+        raise RuntimeError(f"The transposition table is full ({self.capacity} nodes)")
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.hashes))
+
+    def clear(self) -> None:
+        with self._lock:
+            self.hashes[:] = 0
+            self.visits[:] = 0
+            self.value_sums[:] = 0
+            self.expanded[:] = False
+
+    def close(self) -> None:
+        """
+        Releases the shared memory block (and frees it if this table created it).
+        """
+        if self._memory is not None:
+            # The arrays must not outlive the buffer they point into.
+            del self.hashes, self.visits, self.value_sums, self.expanded, self.priors
+            self._memory.close()
+            if self._owner:
+                self._memory.unlink()
+            self._memory = None
+
+
+class _Children(NamedTuple):
+    actions: np.ndarray  # (k,) legal action ids of the node
+    hashes: np.ndarray  # (k,) table hashes of the children
+    sigmas: np.ndarray  # (k, max_len) least rotations of the children
+    lengths: np.ndarray  # (k,)
+    rewards: np.ndarray  # (k,)
+
+
+class MCTSResult(NamedTuple):
+    braid: Braid  # Least rotation of the searched braid, the actions refer to it
+    actions: np.ndarray  # Legal action ids
+    visits: np.ndarray  # Number of visits of the child each action leads to
+    values: np.ndarray  # Reward of each action plus the mean return of its child (0 for children never visited)
+
+    def best_action(self) -> int:
+        """
+        Returns the most visited action, -1 if there is no legal action.
+        """
+        return int(self.actions[np.argmax(self.visits)]) if len(self.actions) > 0 else -1
+
+    def policy(self, temperature: float = 1.0) -> np.ndarray:
+        """
+        Returns the probabilities of the actions proportional to visits^(1 / temperature).
+        """
+        weights = self.visits.astype(np.float64) ** (1 / temperature)
+        total = weights.sum()
+        return weights / total if total > 0 else np.full(len(weights), 1 / max(len(weights), 1))
+
+
+class MCTS:
+    """
+    PUCT search: at a node the action maximizing `value + c_puct * prior * sqrt(node visits) / (1 + child visits)` is
+    selected. Any number of threads can call `search` of the same object, and searches in other processes can share
+    the table, see `parallel_search`.
+    """
+
+    def __init__(
+        self,
+        max_len: int = 32,
+        max_strands: int = 8,
+        evaluator: Evaluator = uniform_evaluator,
+        table: TranspositionTable | None = None,
+        c_puct: float = 1.5,
+        discount: float = 1.0,
+        step_penalty: float = 0.1,
+        virtual_loss: float = 1.0,
+        max_depth: int = 50,
+    ):
+        """
+        max_len, max_strands: bounds of the braids, define the action space.
+        evaluator: scores batches of leaves, see `Evaluator`.
+        table: transposition table, by default a table of 2^14 nodes used by this object only.
+        """
+        self.action_space: ActionSpace = action_space(max_len, max_strands)
+        self.evaluator = evaluator
+        self.table = table if table is not None else TranspositionTable(1 << 14, self.action_space.size)
+        if self.table.action_count != self.action_space.size:
+            raise ValueError(f"The table has {self.table.action_count} actions, not {self.action_space.size}")
+        self.c_puct = c_puct
+        self.discount = discount
+        self.step_penalty = step_penalty
+        self.virtual_loss = virtual_loss
+        self.max_depth = max_depth
+        # Children of the expanded nodes, computed by each process on first visit. Reads and writes of a dict are
+        # atomic, so threads can share it.
+        self._children: dict[int, _Children] = {}
+
+    def _root(self, braid: Braid | braid_vec.Braid | np.ndarray | list[int] | str) -> tuple[np.ndarray, int]:
+        root, _ = BraidBatch([braid], capacity=self.max_len).canonical_rotations()
+        if root.lengths[0] > self.max_len or root.strand_counts[0] > self.action_space.max_strands:
+            raise ValueError(f"The braid does not fit in {self.max_len} crossings and {self.max_strands} strands")
+        return root.sigmas[0, : self.max_len], int(TranspositionTable.slot_hash(root.keys())[0])
+
+    @property
+    def max_len(self) -> int:
+        return self.action_space.max_len
+
+    @property
+    def max_strands(self) -> int:
+        return self.action_space.max_strands
+
+    def _expand_children(self, hash_value: int, sigmas: np.ndarray, length: int) -> _Children:
+        children = self._children.get(hash_value)
+        if children is not None:
+            return children
+        if len(self._children) >= self.table.capacity:
+            self._children.clear()
+        lengths = np.array([length], dtype=np.int64)
+        strand_counts = np.array([int(np.abs(sigmas).max(initial=0)) + 1], dtype=np.int64)
+        actions = np.flatnonzero(self.action_space.masks(sigmas[None, :], lengths, strand_counts)[0])
+        moves, indices, values = self.action_space.decode(actions)
+        parents = BraidBatch.from_padded(np.repeat(sigmas[None, :], len(actions), axis=0), lengths.repeat(len(actions)))
+        transformed, _ = parents.apply(moves, indices, values, strict=True)
+        transformed, _ = transformed.canonical_rotations()
+        children = _Children(
+            actions,
+            TranspositionTable.slot_hash(transformed.keys()),
+            transformed.sigmas[:, : self.max_len],
+            transformed.lengths,
+            (length - transformed.lengths) - self.step_penalty,
+        )
+        self._children[hash_value] = children
+        return children
+
+    def _select(self, slot: int, children: _Children) -> int:
+        """
+        Returns the position of the selected action among the children.
+        """
+        table = self.table
+        child_slots = table.find(children.hashes)
+        known = child_slots >= 0
+        visits = np.where(known, table.visits[child_slots], 0)
+        value_sums = np.where(known, table.value_sums[child_slots], 0.0)
+        values = children.rewards + self.discount * value_sums / np.maximum(visits, 1)
+        priors = table.priors[slot, children.actions]
+        exploration = self.c_puct * priors * math.sqrt(max(int(table.visits[slot]), 1)) / (1 + visits)
+        return int(np.argmax(values + exploration))
+
+    def _descend(self, root_sigmas: np.ndarray, root_hash: int) -> tuple[list[int], list[float], np.ndarray, int]:
+        """
+        Selects a path from the root to a leaf and adds the virtual loss to its nodes. A child that does not fit in the
+        full table is not visited, the path ends at its parent instead.
+
+        Returns: the slots of the path, the rewards of its actions, the sigmas and the length of the leaf.
+        """
+        table = self.table
+        sigmas, length, hash_value = root_sigmas, int(np.count_nonzero(root_sigmas)), root_hash
+        slots: list[int] = []
+        rewards: list[float] = []
+        parent = (sigmas, length)
+        while True:
+            with table.lock:
+                try:
+                    slot = table.insert(hash_value)
+                except RuntimeError:
+                    # A root that does not fit means no path of the search is in the table, nothing to undo.
+                    if not slots:
+                        raise
+                    slot = -1
+                else:
+                    table.visits[slot] += 1
+                    table.value_sums[slot] -= self.virtual_loss
+            if slot < 0:
+                rewards.pop()
+                return slots, rewards, *parent
+            slots.append(slot)
+            if length == 0 or not table.expanded[slot] or len(slots) > self.max_depth:
+                return slots, rewards, sigmas, length
+            children = self._expand_children(hash_value, sigmas, length)
+            if len(children.actions) == 0:
+                return slots, rewards, sigmas, length
+            position = self._select(slot, children)
+            rewards.append(float(children.rewards[position]))
+            parent = (sigmas, length)
+            sigmas, length = children.sigmas[position], int(children.lengths[position])
+            hash_value = int(children.hashes[position])
+
+    def _run_batch(self, root_sigmas: np.ndarray, root_hash: int, batch_size: int) -> None:
+        paths = [self._descend(root_sigmas, root_hash) for _ in range(batch_size)]
+        # Terminal leaves (no crossing left) have value 0, the others are scored once each.
+        leaves: dict[int, int] = {}  # Slot of the leaf: row of the batch
+        rows: list[int] = []  # Row of the leaf of each path, -1 for terminal leaves
+        leaf_paths: list[tuple[list[int], list[float], np.ndarray, int]] = []
+        for path in paths:
+            slots, _, _, length = path
+            if length > 0 and slots[-1] not in leaves:
+                leaves[slots[-1]] = len(leaf_paths)
+                leaf_paths.append(path)
+            rows.append(leaves[slots[-1]] if length > 0 else -1)
+        values = np.zeros(len(paths))
+        if leaves:
+            sigmas = np.stack([path[2] for path in leaf_paths])
+            lengths = np.array([path[3] for path in leaf_paths], dtype=np.int64)
+            batch = BraidBatch.from_padded(sigmas, lengths, copy_sigmas=False)
+            priors, leaf_values = self.evaluator(batch, self.action_space.batch_masks(batch))
+            path_rows = np.array(rows)
+            values[path_rows >= 0] = np.asarray(leaf_values, dtype=np.float64)[path_rows[path_rows >= 0]]
+            with self.table.lock:
+                for leaf, row in leaves.items():
+                    if not self.table.expanded[leaf]:
+                        self.table.priors[leaf] = priors[row]
+                        self.table.expanded[leaf] = True
+
+        with self.table.lock:
+            for (slots, rewards, _, _), value in zip(paths, values.tolist()):
+                total = value
+                self.table.value_sums[slots[-1]] += self.virtual_loss + total
+                for slot, reward in zip(reversed(slots[:-1]), reversed(rewards)):
+                    total = reward + self.discount * total
+                    self.table.value_sums[slot] += self.virtual_loss + total
+
+    def search(
+        self,
+        braid: Braid | braid_vec.Braid | np.ndarray | list[int] | str,
+        simulations: int = 256,
+        batch_size: int = 16,
+    ) -> MCTSResult:
+        """
+        Runs simulations simulations from braid, batch_size at a time, and returns the statistics of the actions of its
+        least rotation (including the simulations of other searches sharing the table).
+
+        Every simulation adds at most one node to the table. Once the table is full (`table.capacity` nodes, 2^14 by
+        default) simulations stop at nodes whose children are not in it and score them as leaves again, so pass a
+        larger table for long searches. Raises RuntimeError if the table is full before the root is in it.
+        """
+        root_sigmas, root_hash = self._root(braid)
+        for start in range(0, simulations, batch_size):
+            self._run_batch(root_sigmas, root_hash, min(batch_size, simulations - start))
+        return self.result(braid)
+
+    def result(self, braid: Braid | braid_vec.Braid | np.ndarray | list[int] | str) -> MCTSResult:
+        """
+        Returns the statistics of the actions of the least rotation of braid in the table, without searching.
+        """
+        root_sigmas, root_hash = self._root(braid)
+        length = int(np.count_nonzero(root_sigmas))
+        root = Braid(root_sigmas[:length].astype(SIGMA_DTYPE))
+        if length == 0:
+            return MCTSResult(root, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0))
+        children = self._expand_children(root_hash, root_sigmas, length)
+        child_slots = self.table.find(children.hashes)
+        known = child_slots >= 0
+        visits = np.where(known, self.table.visits[child_slots], 0)
+        value_sums = np.where(known, self.table.value_sums[child_slots], 0.0)
+        values = children.rewards + self.discount * value_sums / np.maximum(visits, 1)
+        return MCTSResult(root, children.actions, visits, values)
+
+
+_worker_mcts: MCTS | None = None
+
+
+def _init_worker(table: TranspositionTable, options: dict) -> None:
+    global _worker_mcts  # pylint: disable=global-statement
+    _worker_mcts = MCTS(table=table, **options)
+
+
+def _worker_search(notation: list[int], simulations: int, batch_size: int) -> None:
+    assert _worker_mcts is not None
+    _worker_mcts.search(notation, simulations, batch_size)
+
+
+def parallel_search(
+    braid: Braid | braid_vec.Braid | np.ndarray | list[int] | str,
+    simulations: int = 1024,
+    processes: int = 2,
+    batch_size: int = 16,
+    max_len: int = 32,
+    max_strands: int = 8,
+    capacity: int = 1 << 14,
+    **options,
+) -> MCTSResult:
+    """
+    Runs simulations simulations from braid, split over a pool of processes sharing one transposition table of capacity
+    nodes in shared memory. options are passed to `MCTS`, the evaluator must be picklable (e.g. a module level
+    function).
+    """
+    notation = notation_of(braid).tolist()
+    options = {"max_len": max_len, "max_strands": max_strands, **options}
+    table = TranspositionTable(capacity, action_space(max_len, max_strands).size, shared=True)
+    try:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(processes, context, _init_worker, (table, options)) as executor:
+            shares = [simulations // processes + (i < simulations % processes) for i in range(processes)]
+            for future in [executor.submit(_worker_search, notation, share, batch_size) for share in shares]:
+                future.result()
+        return MCTS(table=table, **options).result(notation)
+    finally:
+        table.close()
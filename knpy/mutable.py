@@ -0,0 +1,288 @@
+import numpy as np
+from .actions import (
+    action_space,
+    braid_relation1_mask,
+    braid_relation2_mask,
+    destabilization_mask,
+    remove_sigma_inverse_pair_mask,
+)
+from .braid import Braid, SIGMA_DTYPE
+from .exceptions import IllegalTransformationException, IndexOutOfRangeException
+from .incremental import _braid_relation1_at, _braid_relation2_at, _remove_sigma_inverse_pair_at
+
+
+class MutableBraid:
+    """
+    Braid whose moves modify it in place, for hot loops (e.g. rollouts) that do not keep the intermediate braids.
+
+    The sigmas are stored at the start of a preallocated buffer of `capacity` elements. Moves only copy within the
+    buffer (through a second buffer of the same size, used as scratch space), so they do not allocate new arrays until
+    the braid grows longer than the capacity, when the buffers are doubled. The strand count is kept up to date from
+    the number of occurrences of every generator instead of rescanning the sigmas.
+
+    The moves and their arguments are the same as the ones of `Braid`, but they return None.
+    """
+
+    def __init__(
+        self, sigmas: Braid | np.ndarray | list[int] | str, capacity: int | None = None, notation_index: int = 0
+    ):
+        """
+        sigmas: a `Braid` (of either implementation) or anything the `Braid` constructor accepts.
+        capacity: number of sigmas the braid can grow to without reallocation, by default twice the current length (and
+            at least 16).
+        """
+        if isinstance(sigmas, (str, list, np.ndarray)):
+            sigmas = Braid(sigmas, notation_index)
+        notation = sigmas.notation(copy=False)
+        length = len(notation)
+        if capacity is None:
+            capacity = max(2 * length, 16)
+        if capacity < length:
+            raise ValueError(f"Capacity ({capacity}) is smaller than the length of the braid ({length})")
+
+        self._buffer = np.zeros(capacity, dtype=SIGMA_DTYPE)
+        self._scratch = np.zeros(capacity, dtype=SIGMA_DTYPE)
+        self._buffer[:length] = notation
+        self._length = length
+        self._n = int(sigmas.strand_count)
+        # Occurrences of the absolute values of the sigmas, with room for one more strand per crossing.
+        self._counts = np.zeros(max(self._n, capacity) + 2, dtype=np.int64)
+        self._counts_scratch = np.zeros_like(self._counts)
+        self._counts[: self._n] = np.bincount(np.abs(notation), minlength=self._n)
+
+    @property
+    def strand_count(self) -> int:
+        return self._n
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buffer)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def notation(self, copy=True) -> np.ndarray:
+        """
+        Returns numpy array of sigmas. Without copy it is a view of the buffer, which changes with the next move.
+        """
+        if copy:
+            return self._buffer[: self._length].copy()
+        return self._buffer[: self._length]
+
+    def to_braid(self) -> Braid:
+        return Braid(self.notation(), copy_sigmas=False)
+
+    def copy(self) -> "MutableBraid":
+        return MutableBraid(self.notation(copy=False), capacity=self.capacity)
+
+    def __eq__(self, value: object) -> bool:
+        if isinstance(value, MutableBraid):
+            return np.array_equal(self.notation(copy=False), value.notation(copy=False))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def _reserve(self, length: int, largest_sigma: int) -> None:
+        if length > len(self._buffer):
+            capacity = max(length, 2 * len(self._buffer))
+            self._buffer = np.concatenate((self._buffer, np.zeros(capacity - len(self._buffer), dtype=SIGMA_DTYPE)))
+            self._scratch = np.zeros(capacity, dtype=SIGMA_DTYPE)
+        if largest_sigma + 2 > len(self._counts):
+            size = max(largest_sigma + 2, 2 * len(self._counts))
+            self._counts = np.concatenate((self._counts, np.zeros(size - len(self._counts), dtype=np.int64)))
+            self._counts_scratch = np.zeros(size, dtype=np.int64)
+
+    def _add_count(self, absolute: int, amount: int) -> None:
+        self._counts[absolute] += amount
+        self._n = max(self._n, absolute + 1)
+
+    def _remove_count(self, absolute: int, amount: int) -> None:
+        self._counts[absolute] -= amount
+        while self._n > 1 and self._counts[self._n - 1] == 0:
+            self._n -= 1
+
+    def _shift_counts(self, offset: int) -> None:
+        """
+        Moves the occurrences of every generator to the next (offset = 1) or previous (offset = -1) generator, when
+        every sigma is increased or decreased.
+        """
+        counts, shifted = self._counts, self._counts_scratch
+        shifted[:] = 0
+        if offset > 0:
+            shifted[2 : self._n + 1] = counts[1 : self._n]
+        else:
+            shifted[1 : self._n - 1] = counts[2 : self._n]
+        self._counts, self._counts_scratch = shifted, counts
+        self._n += offset
+
+    def _move_tail(self, start: int, destination: int) -> None:
+        """
+        Moves the sigmas from start to the end of the braid to destination (through the scratch buffer, since the
+        ranges might overlap).
+        """
+        count = self._length - start
+        self._scratch[:count] = self._buffer[start : self._length]
+        self._buffer[destination : destination + count] = self._scratch[:count]
+
+    def _add_sign(self, amount: int) -> None:
+        """
+        Increases the absolute value of every sigma by amount.
+        """
+        sigmas, signs = self._buffer[: self._length], self._scratch[: self._length]
+        np.sign(sigmas, out=signs)
+        signs *= amount
+        sigmas += signs
+
+    # Moves, see the member functions of `Braid` for details
+
+    def shift_left(self, amount: int = 1) -> None:
+        n = self._length
+        if amount >= n or amount <= -n:
+            raise IllegalTransformationException(f"amount = {amount} not in range ({-n}, {n})")
+        amount %= n
+        self._scratch[: n - amount] = self._buffer[amount:n]
+        self._scratch[n - amount : n] = self._buffer[:amount]
+        self._buffer, self._scratch = self._scratch, self._buffer
+
+    def shift_right(self, amount: int = 1) -> None:
+        if amount >= self._length or amount <= -self._length:
+            raise IllegalTransformationException(f"amount = {amount} not in range ({-self._length}, {self._length})")
+        self.shift_left(-amount)
+
+    def braid_relation1(self, index: int) -> None:
+        if not self.is_braid_relation1_performable(index):
+            raise IllegalTransformationException(f"Braid relation 1 is not performable at index {index}")
+        n, buffer = self._length, self._buffer
+        positions = (index % n, (index + 1) % n, (index + 2) % n)
+        a, b, c = (int(buffer[p]) for p in positions)
+        buffer[positions[0]] = abs(b) if c > 0 else -abs(b)
+        buffer[positions[1]] = abs(a) if b > 0 else -abs(a)
+        buffer[positions[2]] = abs(b) if a > 0 else -abs(b)
+        self._add_count(abs(b), 1)
+        self._remove_count(abs(a), 1)
+
+    def braid_relation2(self, index: int) -> None:
+        if not self.is_braid_relation2_performable(index):
+            raise IllegalTransformationException(f"Braid relation 2 is not performable at index {index}")
+        first, second = index % self._length, (index + 1) % self._length
+        self._buffer[first], self._buffer[second] = self._buffer[second], self._buffer[first]
+
+    def conjugation(self, value: int, index: int) -> None:
+        self.is_conjugation_performable(value, index)
+        n = self._length
+        self._reserve(n + 2, self._n)
+        if index == n + 1:
+            self._move_tail(0, 1)
+            self._buffer[0], self._buffer[n + 1] = -value, value
+        else:
+            self._move_tail(index, index + 2)
+            self._buffer[index], self._buffer[index + 1] = value, -value
+        self._length += 2
+        self._add_count(abs(value), 2)
+
+    def stabilization(self, index: int | None = None, on_top=False, inverse: bool = False) -> None:
+        if index is None:
+            index = self._length
+        if index < 0 or index > self._length:
+            raise IndexOutOfRangeException("Index must be between 0 and length of braid")
+        self._reserve(self._length + 1, self._n)
+        if on_top:
+            self._add_sign(1)
+            self._shift_counts(1)
+            new_sigma = 1
+        else:
+            new_sigma = self._n
+        self._move_tail(index, index + 1)
+        self._buffer[index] = -new_sigma if inverse else new_sigma
+        self._length += 1
+        self._add_count(new_sigma, 1)
+
+    def destabilization(self, index: int) -> None:
+        if not self.is_destabilization_performable(index):
+            raise IllegalTransformationException(f"Destabilization is not performable at index {index}")
+        removed = abs(int(self._buffer[index]))
+        self._move_tail(index + 1, index)
+        self._length -= 1
+        self._remove_count(removed, 1)
+        if removed == 1 and self._length > 0:
+            self._add_sign(-1)
+            self._shift_counts(-1)
+
+    def remove_sigma_inverse_pair(self, index: int) -> None:
+        if not self.is_remove_sigma_inverse_pair_performable(index):
+            raise IllegalTransformationException(f"Sigma inverse pair is not removable at index {index}")
+        index %= self._length
+        removed = abs(int(self._buffer[index]))
+        if index == self._length - 1:
+            # The pair is the last and the first sigma.
+            self._length -= 1
+            self._move_tail(1, 0)
+            self._length -= 1
+        else:
+            self._move_tail(index + 2, index)
+            self._length -= 2
+        self._remove_count(removed, 2)
+
+    # Check whether a move is performable or not
+
+    def _check_index(self, index: int) -> None:
+        if not -self._length <= index < self._length:
+            raise IndexOutOfRangeException(f"index = {index} not in range [{-self._length}, {self._length})")
+
+    def is_braid_relation1_performable(self, index: int) -> bool:
+        self._check_index(index)
+        return _braid_relation1_at(self.notation(copy=False), index % self._length)
+
+    def is_braid_relation2_performable(self, index: int) -> bool:
+        self._check_index(index)
+        return _braid_relation2_at(self.notation(copy=False), index % self._length)
+
+    def is_remove_sigma_inverse_pair_performable(self, index: int) -> bool:
+        self._check_index(index)
+        return _remove_sigma_inverse_pair_at(self.notation(copy=False), index % self._length)
+
+    def is_destabilization_performable(self, index: int) -> bool:
+        if not 0 <= index < self._length:
+            return False
+        removed = abs(int(self._buffer[index]))
+        return removed in (1, self._n - 1) and self._counts[removed] == 1
+
+    def is_conjugation_performable(self, value: int, index: int) -> bool:
+        """
+        Either returns True or raises an exception, like `Braid.is_conjugation_performable`.
+        """
+        if value == 0:
+            raise ValueError("Sigma can't be zero")
+        if value <= -self._n or value >= self._n:
+            raise ValueError(f"Sigma (σ_{{{value}}}) must be in range (-n, n) where n is the number of threads")
+        if index < 0 or index > self._length + 1:
+            raise IndexOutOfRangeException(f"Conjugation index {index} not in range [0, {self._length + 1}]")
+        return True
+
+    def _padded(self) -> tuple[np.ndarray, np.ndarray]:
+        return self._buffer[None, : self._length], np.array([self._length])
+
+    def braid_relation1_performable_indices(self) -> np.ndarray:
+        return np.flatnonzero(braid_relation1_mask(*self._padded())[0])
+
+    def braid_relation2_performable_indices(self) -> np.ndarray:
+        return np.flatnonzero(braid_relation2_mask(*self._padded())[0])
+
+    def remove_sigma_inverse_pair_performable_indices(self) -> np.ndarray:
+        return np.flatnonzero(remove_sigma_inverse_pair_mask(*self._padded())[0])
+
+    def destabilization_performable_indices(self) -> np.ndarray:
+        return np.flatnonzero(destabilization_mask(*self._padded(), np.array([self._n]))[0])
+
+    def legal_action_mask(self, max_len: int, max_strands: int) -> np.ndarray:
+        """
+        See `Braid.legal_action_mask`.
+        """
+        return action_space(max_len, max_strands).braid_mask(self)
+
+    def apply_action(self, action_id: int, max_len: int, max_strands: int) -> None:
+        """
+        Performs the action with id action_id of `knpy.actions.ActionSpace(max_len, max_strands)` in place, see
+        `Braid.apply_action`.
+        """
+        action_space(max_len, max_strands).apply(self, action_id)
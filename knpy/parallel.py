@@ -0,0 +1,104 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Iterator, Sequence
+import numpy as np
+from . import braid_vec
+from .braid import Braid, SIGMA_DTYPE
+from .braid_batch import BraidBatch, notation_of
+from .data_utils import knot_table
+
+# Parallel map over braids. The sigmas of all braids are concatenated into one shared memory block (an int64 offset
+# array followed by the sigmas), so the tasks sent to the worker processes are only ranges of braid positions. Every
+# worker attaches to the block and loads the knot table (from its memory-mapped cache, see `data_utils.get_table`)
+# once, when it starts.
+
+type BraidClass = type[Braid] | type[braid_vec.Braid]
+
+_worker_state: tuple[shared_memory.SharedMemory, np.ndarray, np.ndarray, BraidClass] | None = None
+
+
+def _pack(braids: BraidBatch | Sequence[Braid | braid_vec.Braid | np.ndarray | list[int] | str]) -> list[np.ndarray]:
+    if isinstance(braids, BraidBatch):
+        return [braids.sigmas[row, :length] for row, length in enumerate(braids.lengths.tolist())]
+    return [notation_of(b) for b in braids]
+
+
+def _views(buffer, count: int, sigma_count: int) -> tuple[np.ndarray, np.ndarray]:
+    offsets: np.ndarray = np.ndarray((count + 1,), dtype=np.int64, buffer=buffer)
+    sigmas: np.ndarray = np.ndarray((sigma_count,), dtype=SIGMA_DTYPE, buffer=buffer, offset=offsets.nbytes)
+    return offsets, sigmas
+
+
+def _init_worker(name: str, count: int, sigma_count: int, braid_class: BraidClass) -> None:
+    global _worker_state  # pylint: disable=global-statement
+    memory = shared_memory.SharedMemory(name=name)
+    offsets, sigmas = _views(memory.buf, count, sigma_count)
+    _worker_state = (memory, offsets, sigmas, braid_class)
+    knot_table()
+
+
+def _run(
+    fn: Callable[[Any], Any], offsets: np.ndarray, sigmas: np.ndarray, braid_class: BraidClass, start: int, stop: int
+) -> list[Any]:
+    return [
+        fn(braid_class(np.array(sigmas[offsets[i] : offsets[i + 1]]), copy_sigmas=False)) for i in range(start, stop)
+    ]
+
+
+def _worker_run(fn: Callable[[Any], Any], start: int, stop: int) -> list[Any]:
+    assert _worker_state is not None
+    _, offsets, sigmas, braid_class = _worker_state
+    return _run(fn, offsets, sigmas, braid_class, start, stop)
+
+
+def map(  # pylint: disable=redefined-builtin
+    fn: Callable[[Any], Any],
+    braids: BraidBatch | Sequence[Braid | braid_vec.Braid | np.ndarray | list[int] | str],
+    workers: int | None = None,
+    chunksize: int = 256,
+    braid_class: BraidClass = Braid,
+) -> Iterator[Any]:
+    """
+    Yields `fn(braid)` for every braid, in order, computed by a pool of worker processes. Results are yielded as soon
+    as the chunk they belong to (and every chunk before it) is done.
+
+    fn: must be picklable, e.g. a module level function. It gets the braids as braid_class objects.
+    braids: given as a `BraidBatch` or as anything the `Braid` constructor accepts (names are resolved in this
+        process).
+    workers: number of processes, by default the number of CPUs. With at most one the braids are mapped in this process.
+    chunksize: number of braids per task.
+    """
+    notations = _pack(braids)
+    lengths = np.array([len(notation) for notation in notations], dtype=np.int64)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(notations) <= chunksize:
+        offsets = np.zeros(len(notations) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        sigmas = np.concatenate(notations).astype(SIGMA_DTYPE) if notations else np.zeros(0, dtype=SIGMA_DTYPE)
+        yield from _run(fn, offsets, sigmas, braid_class, 0, len(notations))
+        return
+
+    count, sigma_count = len(notations), int(lengths.sum())
+    size = (count + 1) * np.dtype(np.int64).itemsize + sigma_count * np.dtype(SIGMA_DTYPE).itemsize
+    memory = shared_memory.SharedMemory(create=True, size=size)
+    try:
+        offsets, sigmas = _views(memory.buf, count, sigma_count)
+        offsets[0] = 0
+        np.cumsum(lengths, out=offsets[1:])
+        np.concatenate(notations, out=sigmas, casting="same_kind")
+        del offsets, sigmas  # The block can not be closed while arrays point into it.
+        knot_table()  # Writes the cache of the table if needed, so the workers do not parse the csv.
+
+        starts = range(0, count, chunksize)
+        stops = [min(start + chunksize, count) for start in starts]
+        context = multiprocessing.get_context("spawn")
+        initargs = (memory.name, count, sigma_count, braid_class)
+        with ProcessPoolExecutor(min(workers, len(starts)), context, _init_worker, initargs) as executor:
+            for results in executor.map(_worker_run, [fn] * len(starts), starts, stops):
+                yield from results
+    finally:
+        memory.close()
+        memory.unlink()
@@ -0,0 +1,171 @@
+from typing import Mapping, Sequence
+
+
+class LaurentPolynomial:
+    """
+    Immutable Laurent polynomial in t with integer coefficients (negative exponents are allowed), used for the exact
+    knot polynomials. Only the nonzero terms are stored, so the sparse matrices of braid representations are cheap.
+    """
+
+    __slots__ = ("_terms", "_hash")
+
+    def __init__(self, terms: Mapping[int, int] | Sequence[int] | int = 0, lowest: int = 0):
+        """
+        terms: {exponent: coefficient}, or the coefficients of the consecutive exponents starting from lowest, or a
+            constant.
+        """
+        if isinstance(terms, int):
+            items = [(0, terms)]
+        elif isinstance(terms, Mapping):
+            items = list(terms.items())
+        else:
+            items = [(lowest + i, coefficient) for i, coefficient in enumerate(terms)]
+        self._terms = {int(exponent): int(coefficient) for exponent, coefficient in items if coefficient != 0}
+        self._hash: int | None = None
+
+    @classmethod
+    def _of(cls, terms: dict[int, int]) -> "LaurentPolynomial":
+        """
+        Creates a polynomial from a dictionary of nonzero terms without copying it.
+        """
+        obj = cls.__new__(cls)
+        obj._terms = terms
+        obj._hash = None
+        return obj
+
+    @property
+    def terms(self) -> dict[int, int]:
+        return dict(self._terms)
+
+    @property
+    def lowest(self) -> int:
+        """
+        Smallest exponent with a nonzero coefficient (0 for the zero polynomial)
+        """
+        return min(self._terms, default=0)
+
+    @property
+    def highest(self) -> int:
+        """
+        Largest exponent with a nonzero coefficient (0 for the zero polynomial)
+        """
+        return max(self._terms, default=0)
+
+    def coefficients(self) -> list[int]:
+        """
+        Returns the coefficients of the exponents from lowest to highest.
+        """
+        return [self._terms.get(exponent, 0) for exponent in range(self.lowest, self.highest + 1)]
+
+    def __bool__(self) -> bool:
+        return bool(self._terms)
+
+    def __add__(self, other: "LaurentPolynomial | int") -> "LaurentPolynomial":
+        if isinstance(other, int):
+            other = LaurentPolynomial(other)
+        terms = dict(self._terms)
+        for exponent, coefficient in other._terms.items():
+            total = terms.get(exponent, 0) + coefficient
+            if total:
+                terms[exponent] = total
+            else:
+                terms.pop(exponent, None)
+        return LaurentPolynomial._of(terms)
+
+    __radd__ = __add__
+
+    def __neg__(self) -> "LaurentPolynomial":
+        return LaurentPolynomial._of({exponent: -coefficient for exponent, coefficient in self._terms.items()})
+
+    def __sub__(self, other: "LaurentPolynomial | int") -> "LaurentPolynomial":
+        return self + (-other)
+
+    def __rsub__(self, other: int) -> "LaurentPolynomial":
+        return -self + other
+
+    def __mul__(self, other: "LaurentPolynomial | int") -> "LaurentPolynomial":
+        if isinstance(other, int):
+            other = LaurentPolynomial(other)
+        terms: dict[int, int] = {}
+        for exponent, coefficient in self._terms.items():
+            for other_exponent, other_coefficient in other._terms.items():
+                product = exponent + other_exponent
+                terms[product] = terms.get(product, 0) + coefficient * other_coefficient
+        return LaurentPolynomial._of({exponent: coefficient for exponent, coefficient in terms.items() if coefficient})
+
+    __rmul__ = __mul__
+
+    def shift(self, amount: int) -> "LaurentPolynomial":
+        """
+        Returns the polynomial multiplied by t^amount.
+        """
+        return LaurentPolynomial._of({exponent + amount: coefficient for exponent, coefficient in self._terms.items()})
+
+    def exact_divide(self, divisor: "LaurentPolynomial") -> "LaurentPolynomial":
+        """
+        Returns the quotient of self and divisor, raises ValueError if divisor does not divide self.
+        """
+        if not divisor:
+            raise ZeroDivisionError("Division by the zero polynomial")
+        remainder, divisor_terms = dict(self._terms), divisor.terms
+        divisor_lowest = divisor.lowest
+        divisor_coefficient = divisor_terms[divisor_lowest]
+        span = divisor.highest - divisor_lowest
+        quotient = {}
+        while remainder:
+            lowest = min(remainder)
+            if max(remainder) - lowest < span:
+                raise ValueError(f"{divisor} does not divide {self}")
+            coefficient, rest = divmod(remainder[lowest], divisor_coefficient)
+            if rest:
+                raise ValueError(f"{divisor} does not divide {self}")
+            exponent = lowest - divisor_lowest
+            quotient[exponent] = coefficient
+            for divisor_exponent, divisor_term in divisor_terms.items():
+                key = exponent + divisor_exponent
+                value = remainder.get(key, 0) - coefficient * divisor_term
+                if value:
+                    remainder[key] = value
+                else:
+                    remainder.pop(key, None)
+        return LaurentPolynomial._of(quotient)
+
+    def __call__(self, t):
+        """
+        Evaluates the polynomial at t (a number or a numpy array).
+        """
+        return sum((coefficient * t**exponent for exponent, coefficient in self._terms.items()), start=0 * t)
+
+    def __eq__(self, value: object) -> bool:
+        if isinstance(value, LaurentPolynomial):
+            return self._terms == value._terms
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(frozenset(self._terms.items()))
+        return self._hash
+
+    def __reduce__(self):
+        return (LaurentPolynomial, (self._terms,))
+
+    def __str__(self) -> str:
+        """
+        Returns the polynomial in the notation of KnotInfo, e.g. `1-3*t+t^2`.
+        """
+        if not self._terms:
+            return "0"
+        text = ""
+        for exponent in sorted(self._terms):
+            coefficient = self._terms[exponent]
+            sign = "-" if coefficient < 0 else "+" if text else ""
+            magnitude = abs(coefficient)
+            if exponent == 0:
+                text += f"{sign}{magnitude}"
+                continue
+            power = "t" if exponent == 1 else f"t^({exponent})" if exponent < 0 else f"t^{exponent}"
+            text += f"{sign}{power}" if magnitude == 1 else f"{sign}{magnitude}*{power}"
+        return text
+
+    def __repr__(self) -> str:
+        return f"LaurentPolynomial({dict(sorted(self._terms.items()))})"
@@ -0,0 +1,67 @@
+import numpy as np
+
+# Greedy simplification with the moves that only remove crossings. `free_reduce` cancels every sigma inverse pair in
+# one pass with a stack and then the pairs of the last and first sigma, which gives the word that calling
+# `Braid.remove_sigma_inverse_pair` until no pair is left gives (up to rotation). `simplify_greedy` alternates it with
+# destabilizations (on top first) until neither applies. `batch_simplify` does the same for every row of a padded sigma
+# matrix, `braid_cpp_impl.simplify_batch` is the same in C++.
+
+
+def free_reduce(sigmas: np.ndarray | list[int]) -> list[int]:
+    """
+    Returns sigmas without sigma inverse pairs, also treating the last and first sigma as neighbours (linear time).
+    """
+    stack: list[int] = []
+    for sigma in sigmas:
+        if stack and stack[-1] == -sigma:
+            stack.pop()
+        else:
+            stack.append(sigma)
+    start, end = 0, len(stack)
+    while end - start >= 2 and stack[start] == -stack[end - 1]:
+        start += 1
+        end -= 1
+    return stack[start:end]
+
+
+def _destabilize(sigmas: list[int]) -> list[int] | None:
+    """
+    Performs a destabilization (on top if it is performable, else at the bottom), see `Braid.destabilization`. Returns
+    None if none is performable.
+    """
+    absolute = [abs(sigma) for sigma in sigmas]
+    if absolute.count(1) == 1:
+        index = absolute.index(1)
+        return [sigma - 1 if sigma > 0 else sigma + 1 for sigma in sigmas[:index] + sigmas[index + 1 :]]
+    largest = max(absolute, default=0)
+    if largest > 0 and absolute.count(largest) == 1:
+        index = absolute.index(largest)
+        return sigmas[:index] + sigmas[index + 1 :]
+    return None
+
+
+def simplify_greedy(sigmas: np.ndarray | list[int]) -> list[int]:
+    """
+    Returns sigmas after removing all sigma inverse pairs and performing destabilizations until neither is possible.
+    Every destabilization costs a pass over the word, so it takes O(k * n) time for k destabilizations.
+    """
+    sigmas = free_reduce([int(sigma) for sigma in sigmas])
+    while (destabilized := _destabilize(sigmas)) is not None:
+        sigmas = free_reduce(destabilized)
+    return sigmas
+
+
+def batch_simplify(sigmas: np.ndarray, lengths: np.ndarray, destabilize: bool = True) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Applies `simplify_greedy` (or only `free_reduce` if not destabilize) to every row of a padded sigma matrix.
+
+    Returns: the padded sigma matrix of the results (with the same capacity) and their lengths.
+    """
+    simplify = simplify_greedy if destabilize else free_reduce
+    result = np.zeros_like(sigmas)
+    result_lengths = np.empty(sigmas.shape[0], dtype=np.int64)
+    for row, length in enumerate(np.asarray(lengths).tolist()):
+        simplified = simplify(sigmas[row, :length].tolist())
+        result[row, : len(simplified)] = simplified
+        result_lengths[row] = len(simplified)
+    return result, result_lengths
@@ -0,0 +1,69 @@
+import numpy as np
+
+# Braids are treated as circular by the shifts, conjugation and the braid relations, so the rotations of a braid word
+# are the same state of a search. The functions below find the lexicographically least rotation, which is used as the
+# canonical representative of all rotations.
+
+
+def least_rotation(sigmas: np.ndarray | list[int]) -> int:
+    """
+    Returns the amount k such that `sigmas[k:] + sigmas[:k]` is the lexicographically least rotation of sigmas, using
+    Booth's algorithm (linear time). k is the smallest such amount, and 0 for the empty word.
+    """
+    s = list(sigmas)
+    n = len(s)
+    failure = [-1] * (2 * n)
+    k = 0
+    for j in range(1, 2 * n):
+        s_j = s[j % n]
+        i = failure[j - k - 1]
+        while i != -1 and s_j != s[(k + i + 1) % n]:
+            if s_j < s[(k + i + 1) % n]:
+                k = j - i - 1
+            i = failure[i]
+        if s_j != s[(k + i + 1) % n]:
+            # Here i == -1, so s[k + i + 1] is s[k].
+            if s_j < s[k % n]:
+                k = j
+            failure[j - k] = -1
+        else:
+            failure[j - k] = i + 1
+    return k % n if n > 0 else 0
+
+
+def _dense_ranks(keys: np.ndarray) -> np.ndarray:
+    """
+    Replaces every element of a row by the number of distinct smaller elements in the row.
+    """
+    order = np.argsort(keys, axis=1, kind="stable")
+    ordered = np.take_along_axis(keys, order, axis=1)
+    ranks_in_order = np.zeros(keys.shape, dtype=np.int64)
+    ranks_in_order[:, 1:] = np.cumsum(ordered[:, 1:] != ordered[:, :-1], axis=1)
+    ranks = np.empty_like(ranks_in_order)
+    np.put_along_axis(ranks, order, ranks_in_order, axis=1)
+    return ranks
+
+
+def batch_least_rotations(sigmas: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    Returns `least_rotation(sigmas[i, :lengths[i]])` for every row of a padded sigma matrix.
+
+    Rows are handled together by prefix doubling: after round r the rank of a position orders the rotations starting
+    there by their first 2^r sigmas, so about log2(capacity) sorts of the whole matrix are needed.
+    """
+    rows, capacity = sigmas.shape
+    lengths = np.asarray(lengths, dtype=np.int64)
+    if capacity == 0 or rows == 0:
+        return np.zeros(rows, dtype=np.int64)
+
+    columns = np.arange(capacity)[None, :]
+    outside = columns >= lengths[:, None]
+    safe_lengths = np.maximum(lengths, 1)[:, None]
+    # Padding gets the largest rank, so it is never the least rotation.
+    ranks = _dense_ranks(np.where(outside, np.iinfo(np.int64).max, sigmas.astype(np.int64)))
+    step = 1
+    while step < lengths.max(initial=0):
+        following = np.take_along_axis(ranks, (columns + step) % safe_lengths, axis=1)
+        ranks = _dense_ranks(np.where(outside, np.iinfo(np.int64).max, ranks * (capacity + 1) + following))
+        step *= 2
+    return np.argmin(ranks, axis=1).astype(np.int64)
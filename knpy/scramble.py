@@ -0,0 +1,149 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Mapping, NamedTuple, Sequence
+import numpy as np
+from .actions import ACTION_MOVES, ActionSpace, action_space
+from .braid import SIGMA_DTYPE
+from .braid_batch import BraidBatch, Move, strand_counts_of
+from .data_utils import knot_table
+from .env import table_pool
+
+# Training data generator: table knots scrambled by random legal actions of `ActionSpace(max_len, max_strands)`. Every
+# step draws one action for all rows of a batch (first a move, weighted among the moves legal in the row, then a
+# uniformly random legal position) and applies them with one `BraidBatch.apply` call. The moves are Markov moves, so a
+# scrambled braid still closes to the knot it came from.
+#
+# The rows are generated in chunks of chunk_size, each with its own random generator spawned from the seed, so the
+# result only depends on the seed and the arguments, not on how many processes generate the chunks.
+
+
+class Scrambles(NamedTuple):
+    sigmas: np.ndarray  # (N, max_len) padded sigmas
+    lengths: np.ndarray  # (N,)
+    knot_ids: np.ndarray  # (N,) position of the knot the row comes from in the knot table, see `names`
+
+    def names(self) -> np.ndarray:
+        """
+        Returns the names of the knots the rows come from.
+        """
+        return np.asarray(knot_table().names)[self.knot_ids]
+
+    def batch(self) -> BraidBatch:
+        return BraidBatch.from_padded(self.sigmas, self.lengths, copy_sigmas=False)
+
+
+def random_actions(
+    space: ActionSpace,
+    masks: np.ndarray,
+    rng: np.random.Generator,
+    move_weights: Mapping[Move, float] | None = None,
+) -> np.ndarray:
+    """
+    Draws one legal action per row of the (N, space.size) action masks: a move with probability proportional to its
+    weight among the moves with a legal action in the row (by default all moves weigh the same), then one of its legal
+    actions uniformly. Rows without legal actions (or only ones of moves of zero weight) get -1.
+    """
+    rows = masks.shape[0]
+    offsets = [space.offset(move) for move in ACTION_MOVES] + [space.size]
+    weights = np.array([1.0 if move_weights is None else move_weights.get(move, 0.0) for move in ACTION_MOVES])
+    available = np.stack([masks[:, start:end].any(axis=1) for start, end in zip(offsets, offsets[1:])], axis=1)
+    available = available * weights
+    totals = available.sum(axis=1)
+    # Uniform in (0, 1], so moves of zero weight before the drawn one are skipped
+    threshold = (1 - rng.random(rows)) * totals
+    blocks = (np.cumsum(available, axis=1) < threshold[:, None]).sum(axis=1)
+
+    actions = np.full(rows, -1, dtype=np.int64)
+    for b in range(len(ACTION_MOVES)):
+        selected = np.flatnonzero((blocks == b) & (totals > 0))
+        if len(selected) == 0:
+            continue
+        # The k-th legal action of the block, k uniform below the number of legal actions
+        legal_before = np.cumsum(masks[selected, offsets[b] : offsets[b + 1]], axis=1)
+        k = (rng.random(len(selected)) * legal_before[:, -1]).astype(np.int64)
+        actions[selected] = offsets[b] + np.argmax(legal_before > k[:, None], axis=1)
+    return actions
+
+
+def scramble(
+    sigmas: np.ndarray,
+    lengths: np.ndarray,
+    moves: int,
+    rng: np.random.Generator,
+    max_len: int = 32,
+    max_strands: int = 8,
+    move_weights: Mapping[Move, float] | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Applies moves random legal actions (see `random_actions`) to every row of a padded sigma matrix of braids within
+    the bounds.
+
+    Returns: the scrambled (N, max_len) sigma matrix and the lengths.
+    """
+    space = action_space(max_len, max_strands)
+    padded = np.zeros((sigmas.shape[0], max_len), dtype=sigmas.dtype)
+    padded[:, : min(sigmas.shape[1], max_len)] = sigmas[:, :max_len]
+    sigmas, lengths = padded, np.asarray(lengths, dtype=np.int64)
+    for _ in range(moves):
+        actions = random_actions(space, space.masks(sigmas, lengths, strand_counts_of(sigmas)), rng, move_weights)
+        move_ids, indices, values = space.decode(np.maximum(actions, 0))
+        move_ids[actions < 0] = -1  # Not a move, so the braid stays the same.
+        transformed, _ = BraidBatch.from_padded(sigmas, lengths, copy_sigmas=False).apply(move_ids, indices, values)
+        sigmas, lengths = transformed.sigmas[:, :max_len], transformed.lengths
+    return sigmas, lengths
+
+
+def _chunk(
+    count: int,
+    seed: np.random.SeedSequence,
+    moves: int,
+    max_len: int,
+    max_strands: int,
+    knots: Sequence[str] | None,
+    move_weights: Mapping[Move, float] | None,
+) -> Scrambles:
+    pool_sigmas, pool_lengths, notation_ids = table_pool(max_len, max_strands, knots)
+    if len(pool_lengths) == 0:
+        raise ValueError(f"No knot fits in max_len = {max_len} and max_strands = {max_strands}")
+    rng = np.random.default_rng(seed)
+    picked = rng.integers(0, len(pool_lengths), count)
+    sigmas, lengths = scramble(
+        pool_sigmas[picked], pool_lengths[picked], moves, rng, max_len, max_strands, move_weights=move_weights
+    )
+    knot_ids = np.searchsorted(knot_table().knot_offsets, notation_ids[picked], side="right") - 1
+    return Scrambles(sigmas, lengths, knot_ids)
+
+
+def random_scrambles(
+    count: int,
+    moves: int = 10,
+    max_len: int = 32,
+    max_strands: int = 8,
+    knots: Sequence[str] | None = None,
+    move_weights: Mapping[Move, float] | None = None,
+    seed: int | None = None,
+    processes: int = 1,
+    chunk_size: int = 4096,
+) -> Scrambles:
+    """
+    Returns count table knots (every notation that fits the bounds, or the notations of the given knots only), each
+    scrambled by moves random legal actions.
+
+    move_weights: relative probabilities of the moves, see `random_actions`.
+    seed: seed of the generator, the same seed gives the same scrambles for any number of processes.
+    processes: number of processes generating the chunks of chunk_size rows.
+    """
+    sizes = [min(chunk_size, count - start) for start in range(0, count, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    arguments = [
+        (size, chunk_seed, moves, max_len, max_strands, knots, move_weights) for size, chunk_seed in zip(sizes, seeds)
+    ]
+    if processes <= 1 or len(sizes) <= 1:
+        chunks = [_chunk(*chunk_arguments) for chunk_arguments in arguments]
+    else:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(min(processes, len(sizes)), context) as executor:
+            chunks = list(executor.map(_chunk, *zip(*arguments)))
+    if not chunks:
+        return Scrambles(np.zeros((0, max_len), dtype=SIGMA_DTYPE), np.zeros(0, np.int64), np.zeros(0, np.int64))
+    return Scrambles(*(np.concatenate(columns) for columns in zip(*chunks)))
@@ -0,0 +1,244 @@
+import heapq
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, NamedTuple, Sequence
+import numpy as np
+from .actions import (
+    braid_relation1_mask,
+    braid_relation2_mask,
+    destabilization_mask,
+    remove_sigma_inverse_pair_mask,
+)
+from . import braid_vec
+from .braid import Braid, SIGMA_DTYPE
+from .braid_batch import BraidBatch, Move, notation_of
+from .braid_key import BraidKey
+
+# Searches for the shortest braid reachable from a braid with the moves that never make it longer: removing sigma
+# inverse pairs, destabilization and the two braid relations. The shifts only rotate the notation and all of these
+# moves treat the braid as circular, so a state is the least rotation of a notation (see `Braid.canonical_rotation`)
+# and the shifts are applied implicitly. The visited set holds the `BraidKey` of every state seen, with the state it was
+# first reached from.
+#
+# Frontiers are expanded in batches: every move at every performable position of up to batch_size states is applied
+# with one `BraidBatch.apply` call. `simplify_many` runs one search per braid on a process pool.
+
+SEARCH_MOVES = (Move.REMOVE_SIGMA_INVERSE_PAIR, Move.DESTABILIZATION, Move.BRAID_RELATION1, Move.BRAID_RELATION2)
+
+
+class SearchResult(NamedTuple):
+    braid: Braid  # Shortest braid found (fewest strands among the shortest), as its least rotation
+    path: list[Braid]  # States from the least rotation of the start to braid, each one move from the previous
+    expanded: int  # Number of states whose moves were applied
+    visited: int  # Number of distinct states seen
+    exhausted: bool  # Every reachable state was expanded, so braid is as short as these moves can make it
+
+
+def heuristic(lengths: np.ndarray, strand_counts: np.ndarray) -> np.ndarray:
+    """
+    Returns the estimate of how far states are from simplified used by beam search and A*: length plus strand count.
+    """
+    return np.asarray(lengths, dtype=np.int64) + np.asarray(strand_counts, dtype=np.int64)
+
+
+def _expand(states: BraidBatch) -> tuple[BraidBatch, np.ndarray]:
+    """
+    Applies every search move at every position of every state where it is performable.
+
+    Returns: the least rotations of the resulting braids and the row of the state each of them comes from.
+    """
+    sigmas, lengths = states.sigmas, states.lengths
+    masks = (
+        remove_sigma_inverse_pair_mask(sigmas, lengths),
+        destabilization_mask(sigmas, lengths, states.strand_counts),
+        braid_relation1_mask(sigmas, lengths),
+        braid_relation2_mask(sigmas, lengths),
+    )
+    move_rows, moves, indices = [], [], []
+    for move, mask in zip(SEARCH_MOVES, masks):
+        performable_rows, performable_indices = np.nonzero(mask)
+        move_rows.append(performable_rows)
+        moves.append(np.full(len(performable_rows), move, dtype=np.int64))
+        indices.append(performable_indices)
+    rows = np.concatenate(move_rows)
+    if len(rows) == 0:
+        return BraidBatch.from_padded(sigmas[:0], lengths[:0], copy_sigmas=False), rows
+    parents = BraidBatch.from_padded(sigmas[rows], lengths[rows], copy_sigmas=False)
+    children, _ = parents.apply(np.concatenate(moves), np.concatenate(indices), strict=True)
+    children, _ = children.canonical_rotations()
+    return children, rows
+
+
+class _Search:
+    """
+    Visited set and best state of one search. States are passed around as lists of keys, their sigmas are unpacked
+    from the keys into a padded batch of a fixed capacity when they are expanded (no move makes a braid longer).
+    """
+
+    def __init__(self, braid: Braid | braid_vec.Braid | np.ndarray | list[int] | str, target_length: int):
+        start, _ = BraidBatch([braid]).canonical_rotations()
+        self.capacity = max(1, start.capacity)
+        self.start = start.keys()[0]
+        self.parents: dict[BraidKey, BraidKey | None] = {self.start: None}
+        self.best = self.start
+        self.best_size = (int(start.lengths[0]), int(start.strand_counts[0]))
+        self.target_length = target_length
+        self.expanded = 0
+
+    @property
+    def done(self) -> bool:
+        return self.best_size[0] <= self.target_length
+
+    def batch(self, keys: Sequence[BraidKey]) -> BraidBatch:
+        sigmas = np.zeros((len(keys), self.capacity), dtype=SIGMA_DTYPE)
+        lengths = np.empty(len(keys), dtype=np.int64)
+        for row, key in enumerate(keys):
+            lengths[row] = len(key)
+            sigmas[row, : len(key)] = key.notation()
+        return BraidBatch.from_padded(sigmas, lengths, copy_sigmas=False)
+
+    def expand(self, keys: Sequence[BraidKey]) -> tuple[list[BraidKey], np.ndarray]:
+        """
+        Expands the states, records the ones not seen before in the visited set and updates the best state.
+
+        Returns: the keys of the new states and their heuristic values.
+        """
+        children, rows = _expand(self.batch(keys))
+        self.expanded += len(keys)
+        new_rows, new_keys = [], []
+        for row, (key, parent) in enumerate(zip(children.keys(), rows.tolist())):
+            if key not in self.parents:
+                self.parents[key] = keys[parent]
+                new_rows.append(row)
+                new_keys.append(key)
+        lengths, strand_counts = children.lengths[new_rows], children.strand_counts[new_rows]
+        if len(new_rows) > 0:
+            row = int(np.lexsort((strand_counts, lengths))[0])
+            size = (int(lengths[row]), int(strand_counts[row]))
+            if size < self.best_size:
+                self.best, self.best_size = new_keys[row], size
+        return new_keys, heuristic(lengths, strand_counts)
+
+    def result(self, exhausted: bool) -> SearchResult:
+        path: list[Braid] = []
+        key: BraidKey | None = self.best
+        while key is not None:
+            path.append(Braid(key.notation().astype(SIGMA_DTYPE)))
+            key = self.parents[key]
+        path.reverse()
+        return SearchResult(path[-1], path, self.expanded, len(self.parents), exhausted)
+
+
+def bfs(
+    braid: Braid | braid_vec.Braid | np.ndarray | list[int] | str,
+    max_states: int = 100_000,
+    batch_size: int = 4096,
+    target_length: int = 0,
+) -> SearchResult:
+    """
+    Breadth-first search, expanding the states level by level. It stops when a braid of at most target_length crossings
+    is found, when every reachable state was expanded or when more than max_states states were seen.
+    """
+    search = _Search(braid, target_length)
+    # States are expanded in first in, first out order, so a batch can hold the end of a level and the next level.
+    queue = deque([search.start])
+    while queue and not search.done and len(search.parents) <= max_states:
+        new_keys, _ = search.expand([queue.popleft() for _ in range(min(batch_size, len(queue)))])
+        queue.extend(new_keys)
+    return search.result(exhausted=not queue)
+
+
+def beam_search(
+    braid: Braid | braid_vec.Braid | np.ndarray | list[int] | str,
+    beam_width: int = 256,
+    patience: int = 32,
+    batch_size: int = 4096,
+    target_length: int = 0,
+) -> SearchResult:
+    """
+    Beam search: breadth-first search keeping only the beam_width new states of smallest `heuristic` at every level.
+    It stops when a braid of at most target_length crossings is found, when a level has no new states or when the best
+    braid did not get shorter in the last patience levels.
+    """
+    search = _Search(braid, target_length)
+    beam = [search.start]
+    pruned = False
+    stale = 0  # Number of levels since the best braid got shorter
+    while beam and not search.done and stale < patience:
+        best_size = search.best_size
+        level_keys, level_scores = [], []
+        for start in range(0, len(beam), batch_size):
+            new_keys, scores = search.expand(beam[start : start + batch_size])
+            level_keys.extend(new_keys)
+            level_scores.append(scores)
+        order = np.argsort(np.concatenate(level_scores), kind="stable")
+        pruned |= len(order) > beam_width
+        beam = [level_keys[i] for i in order[:beam_width].tolist()]
+        stale = 0 if search.best_size < best_size else stale + 1
+    return search.result(exhausted=not beam and not pruned)
+
+
+def astar(
+    braid: Braid | braid_vec.Braid | np.ndarray | list[int] | str,
+    max_expansions: int = 100_000,
+    batch_size: int = 64,
+    weight: float = 1.0,
+    target_length: int = 0,
+) -> SearchResult:
+    """
+    A* search with the priority `depth + weight * heuristic`, where depth is the number of moves from the start. The
+    batch_size states of smallest priority are expanded together. It stops when a braid of at most target_length
+    crossings is found, when the open set is empty or after max_expansions expansions.
+    """
+    search = _Search(braid, target_length)
+    depths = {search.start: 0}
+    counter = 0  # Breaks ties in insertion order, keys are not comparable
+    start_score = heuristic(np.array([search.best_size[0]]), np.array([search.best_size[1]]))[0]
+    open_set = [(weight * float(start_score), counter, search.start)]
+    while open_set and not search.done and search.expanded < max_expansions:
+        keys = [heapq.heappop(open_set)[2] for _ in range(min(batch_size, len(open_set)))]
+        new_keys, scores = search.expand(keys)
+        for key, score in zip(new_keys, scores.tolist()):
+            parent = search.parents[key]
+            assert parent is not None  # Only the start has no parent and it is never new
+            depth = depths[parent] + 1
+            depths[key] = depth
+            counter += 1
+            heapq.heappush(open_set, (depth + weight * score, counter, key))
+    return search.result(exhausted=not open_set)
+
+
+SEARCHES: dict[str, Callable[..., SearchResult]] = {"bfs": bfs, "beam": beam_search, "astar": astar}
+
+
+def _run(arguments: tuple[str, list[int], dict]) -> SearchResult:
+    method, notation, options = arguments
+    return SEARCHES[method](notation, **options)
+
+
+def simplify_many(
+    braids: Sequence[Braid | braid_vec.Braid | np.ndarray | list[int] | str],
+    method: str = "beam",
+    processes: int | None = None,
+    **options,
+) -> list[SearchResult]:
+    """
+    Simplifies every braid with one search each, fanned out over a pool of processes (by default one per CPU). The
+    results are in the order of braids. With processes=1 the searches run in the calling process.
+
+    method: "bfs", "beam" or "astar", options are passed to the search function.
+    """
+    if method not in SEARCHES:
+        raise ValueError(f"Unknown search method {method!r}, expected one of {list(SEARCHES)}")
+    notations = [notation_of(b).tolist() for b in braids]
+    tasks = [(method, notation, options) for notation in notations]
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(processes, len(tasks))
+    if processes <= 1:
+        return [_run(task) for task in tasks]
+    # Workers are spawned rather than forked, forking a process with threads (e.g. of BLAS) can deadlock.
+    with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return list(executor.map(_run, tasks))
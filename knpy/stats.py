@@ -0,0 +1,128 @@
+from typing import NamedTuple
+import numpy as np
+
+# Cheap statistics of braid words, used as observation features: the writhe, the permutation of the strands (whose
+# cycles are the components of the closure) and the number of occurrences of every generator. All of them take one
+# pass over the sigmas. `batch_stats` computes them for every row of a padded sigma matrix with one numpy operation per
+# column, `braid_cpp_impl.stats_batch` is the same in C++.
+
+
+class BraidStats(NamedTuple):
+    writhe: int  # Number of positive minus number of negative sigmas
+    permutation: np.ndarray  # (n,): the strand starting at position i at the top ends at position permutation[i]
+    component_count: int  # Number of cycles of the permutation, the number of components of the closure
+    generator_counts: np.ndarray  # (n - 1, 2): occurrences of sigma_i and of sigma_i^-1 in row i - 1
+
+
+class BatchStats(NamedTuple):
+    """
+    `BraidStats` of the rows of a batch, all on the same strand count n (extra strands are fixed by the permutations
+    and count as components).
+    """
+
+    writhes: np.ndarray  # (N,)
+    permutations: np.ndarray  # (N, n)
+    component_counts: np.ndarray  # (N,)
+    generator_counts: np.ndarray  # (N, n - 1, 2)
+
+    def row(self, row: int) -> BraidStats:
+        """
+        Returns the stats of one row.
+        """
+        return BraidStats(
+            int(self.writhes[row]),
+            self.permutations[row],
+            int(self.component_counts[row]),
+            self.generator_counts[row],
+        )
+
+
+def _read_only(*arrays: np.ndarray) -> None:
+    for array in arrays:
+        array.setflags(write=False)
+
+
+def braid_stats(sigmas: np.ndarray | list[int], strand_count: int | None = None) -> BraidStats:
+    """
+    Returns the stats of a braid word on strand_count strands (by default one more than the largest absolute value of
+    the sigmas). The arrays of the result are read-only, since `Braid.stats` caches it.
+    """
+    sigmas = np.asarray(sigmas, dtype=np.int64)
+    largest = int(np.abs(sigmas).max(initial=0))
+    if strand_count is None:
+        strand_count = largest + 1
+    if strand_count <= largest:
+        raise ValueError(f"The braid does not fit on {strand_count} strands")
+
+    generator_counts = np.zeros((max(strand_count - 1, 0), 2), dtype=np.int64)
+    np.add.at(generator_counts, (np.abs(sigmas) - 1, (sigmas < 0).astype(np.int64)), 1)
+    strand_at = list(range(strand_count))  # Strand (by its starting position) at each position
+    for sigma in sigmas.tolist():
+        i = abs(sigma)
+        strand_at[i - 1], strand_at[i] = strand_at[i], strand_at[i - 1]
+    permutation = np.empty(strand_count, dtype=np.int64)
+    permutation[strand_at] = np.arange(strand_count)
+
+    component_count = 0
+    visited = [False] * strand_count
+    for start in range(strand_count):
+        if not visited[start]:
+            component_count += 1
+            position = start
+            while not visited[position]:
+                visited[position] = True
+                position = strand_at[position]
+    _read_only(permutation, generator_counts)
+    writhe = int(generator_counts[:, 0].sum() - generator_counts[:, 1].sum())
+    return BraidStats(writhe, permutation, component_count, generator_counts)
+
+
+def cycle_counts(permutations: np.ndarray) -> np.ndarray:
+    """
+    Returns the number of cycles of every row of permutations, with pointer jumping (log2(n) rounds).
+    """
+    rows, size = permutations.shape
+    labels = np.broadcast_to(np.arange(size), (rows, size)).copy()
+    jump = permutations.astype(np.int64)
+    row_indices = np.arange(rows)[:, None]
+    step = 1
+    while step < size:
+        # After this round labels[i] is the smallest position within 2 * step applications of the permutation.
+        labels = np.minimum(labels, labels[row_indices, jump])
+        jump = jump[row_indices, jump]
+        step *= 2
+    return (labels == np.arange(size)).sum(axis=1)
+
+
+def batch_stats(sigmas: np.ndarray, lengths: np.ndarray, strand_count: int | None = None) -> BatchStats:
+    """
+    Returns the stats of every row of a padded sigma matrix, on strand_count strands (by default the largest strand
+    count of the rows).
+    """
+    rows, capacity = sigmas.shape
+    lengths = np.asarray(lengths, dtype=np.int64)
+    inside = np.arange(capacity)[None, :] < lengths[:, None]
+    sigmas = np.where(inside, sigmas, 0).astype(np.int64)
+    largest = int(np.abs(sigmas).max(initial=0))
+    if strand_count is None:
+        strand_count = largest + 1
+    if strand_count <= largest:
+        raise ValueError(f"The braids do not fit on {strand_count} strands")
+
+    writhes = np.sign(sigmas).sum(axis=1)
+    generator_counts = np.zeros((rows, max(strand_count - 1, 0), 2), dtype=np.int64)
+    row_indices, columns = np.nonzero(sigmas)
+    used = sigmas[row_indices, columns]
+    np.add.at(generator_counts, (row_indices, np.abs(used) - 1, (used < 0).astype(np.int64)), 1)
+
+    strand_at = np.broadcast_to(np.arange(strand_count), (rows, strand_count)).copy()
+    all_rows = np.arange(rows)
+    for column in range(capacity):
+        active = np.flatnonzero(inside[:, column])
+        if len(active) == 0:
+            break
+        left = np.abs(sigmas[active, column]) - 1
+        strand_at[active, left], strand_at[active, left + 1] = strand_at[active, left + 1], strand_at[active, left]
+    permutations = np.empty_like(strand_at)
+    permutations[all_rows[:, None], strand_at] = np.arange(strand_count)
+    return BatchStats(writhes, permutations, cycle_counts(permutations), generator_counts)
@@ -0,0 +1,69 @@
+import pytest
+import numpy as np
+
+# IMPORTANT: knpy should be installed first
+from knpy.braid import Braid
+from knpy.braid_batch import BraidBatch, Move
+from knpy.actions import ActionSpace, ACTION_MOVES
+
+
+class TestActionSpace:
+    def test_size(self) -> None:
+        space = ActionSpace(max_len=5, max_strands=3)
+        assert space.size == 5 + 4 * 5 + 4 * 5 + 3 * 5
+        assert space.offset(ACTION_MOVES[0]) == 0
+        assert space.offset(Move.REMOVE_SIGMA_INVERSE_PAIR) == space.size - 5
+
+    def test_invalid_bounds(self) -> None:
+        with pytest.raises(ValueError):
+            ActionSpace(max_len=0, max_strands=3)
+
+    def test_encode_decode_roundtrip(self) -> None:
+        space = ActionSpace(max_len=6, max_strands=4)
+        action_ids = np.arange(space.size)
+        moves, indices, values = space.decode(action_ids)
+        assert np.array_equal(space.encode(moves, indices, values), action_ids)
+
+    def test_decode(self) -> None:
+        space = ActionSpace(max_len=6, max_strands=4)
+        moves, indices, values = space.decode(space.offset(Move.CONJUGATION) + 6 + 2)
+        assert (moves, indices, values) == (Move.CONJUGATION, 2, -2)
+        moves, indices, values = space.decode(space.offset(Move.STABILIZATION) + 4 * 3 + 2)
+        assert (moves, indices, values) == (Move.STABILIZATION, 3, 2)
+        with pytest.raises(ValueError):
+            space.decode(space.size)
+
+    def test_encode_outside(self) -> None:
+        space = ActionSpace(max_len=6, max_strands=4)
+        assert np.all(space.encode([Move.SHIFT_LEFT, Move.DESTABILIZATION, Move.CONJUGATION], [0, 6, 0], [0, 0, 4]) == -1)
+
+
+class TestActionMasks:
+    def test_bounds(self) -> None:
+        space = ActionSpace(max_len=4, max_strands=3)
+        mask = space.batch_masks(BraidBatch([[1, 2, 1]]))[0]
+        moves, _, _ = space.decode(np.nonzero(mask)[0])
+        # Stabilization would create a fourth strand and conjugation a fifth crossing.
+        assert not np.any((moves == Move.STABILIZATION) | (moves == Move.CONJUGATION))
+        assert np.any(moves == Move.BRAID_RELATION1)
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_masks_match_performable_moves(self, seed) -> None:
+        rng = np.random.default_rng(seed)
+        space = ActionSpace(max_len=10, max_strands=6)
+        for _ in range(20):
+            sigmas = rng.integers(1, 5, rng.integers(0, 8))
+            braid = Braid(sigmas * rng.choice([-1, 1], len(sigmas)))
+            action_ids = np.nonzero(space.batch_masks(BraidBatch([braid]))[0])[0]
+
+            batch = BraidBatch([braid] * len(action_ids))
+            states, performed = batch.apply(*space.decode(action_ids))
+            assert np.all(performed)
+
+            expected = [move() for move in braid.performable_moves()]
+            states = states.to_braids()
+            assert len(states) == len(expected)
+            for state in states:
+                assert state in expected
+            for state in expected:
+                assert state in states
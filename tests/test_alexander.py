@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+
+# IMPORTANT: knpy should be installed first
+from knpy import alexander, braid, braid_vec
+from knpy.braid import Braid
+from knpy.braid_batch import BraidBatch
+from knpy.burau import alexander_value
+from knpy.polynomial import LaurentPolynomial
+
+T = np.exp(0.7j)
+
+# Alexander polynomials from KnotInfo
+KNOWN = {
+    "3_1": [1, -1, 1],
+    "4_1": [1, -3, 1],
+    "5_1": [1, -1, 1, -1, 1],
+    "8_19": [1, -1, 0, 1, 0, -1, 1],
+    "10_136": [1, -4, 5, -4, 1],
+}
+
+
+class TestAlexander:
+    @pytest.mark.parametrize("name", KNOWN)
+    def test_known_knots(self, name) -> None:
+        assert Braid(name).alexander_polynomial() == LaurentPolynomial(KNOWN[name])
+        assert alexander.knot_alexander_polynomial(name) == LaurentPolynomial(KNOWN[name])
+
+    def test_links(self) -> None:
+        assert Braid([]).alexander_polynomial() == LaurentPolynomial(1)
+        assert Braid([1, 1]).alexander_polynomial() == LaurentPolynomial([1, -1])
+        # Split links
+        assert not Braid([1, -1]).alexander_polynomial()
+        assert not alexander.alexander_polynomial([1, 1, 1], strand_count=3)
+        with pytest.raises(ValueError):
+            alexander.alexander_polynomial([1, 3], strand_count=3)
+
+    def test_matches_burau(self) -> None:
+        for name in ("7_4", "9_42", "11n_34", "12a_100"):
+            b = Braid(name)
+            value = alexander_value(b.burau_matrix(T), T)
+            assert np.isclose(abs(b.alexander_polynomial()(T)), abs(value))
+
+    def test_determinant(self) -> None:
+        t = LaurentPolynomial({1: 1})
+        one = LaurentPolynomial(1)
+        matrix = [[LaurentPolynomial(), one, t], [one, t, one], [t, LaurentPolynomial(), one]]
+        assert alexander.determinant(matrix) == LaurentPolynomial({0: -1, 1: 1, 3: -1})
+        assert alexander.determinant([]) == one
+
+    @pytest.mark.parametrize("braid_class", [braid.Braid, braid_vec.Braid])
+    def test_markov_invariance(self, braid_class) -> None:
+        rng = np.random.default_rng(0)
+        b = braid_class("8_19")
+        for _ in range(30):
+            moves = b.performable_moves()
+            b = moves[int(rng.integers(len(moves)))]()
+            assert b.alexander_polynomial() == LaurentPolynomial(KNOWN["8_19"])
+
+    def test_cache(self) -> None:
+        alexander.clear_cache()
+        Braid([1, 2, -1, 2]).alexander_polynomial()
+        Braid([2, -1, 2, 1]).alexander_polynomial()  # A rotation
+        info = alexander._cached.cache_info()  # pylint: disable=protected-access
+        assert (info.hits, info.misses) == (1, 1)
+
+    def test_batch(self) -> None:
+        braids = [Braid("3_1"), Braid("4_1"), Braid([]), Braid("3_1").shift_left(1)]
+        batch = BraidBatch(braids, capacity=10)
+        assert batch.alexander_polynomials() == [b.alexander_polynomial() for b in braids]
@@ -0,0 +1,44 @@
+import json
+import pytest
+
+# IMPORTANT: knpy should be installed first
+from knpy import benchmark
+from knpy.benchmark import BenchmarkResult
+
+
+class TestBenchmark:
+    def test_run_covers_every_operation(self) -> None:
+        results = benchmark.run(datasets=["benchmark"], repeat=1)
+        assert {result.backend for result in results} == set(benchmark.BACKENDS)
+        operations = {result.operation for result in results}
+        # None of the benchmark braids allows braid relation 1.
+        assert operations == set(benchmark.OPERATIONS) - {"braid_relation1"}
+        for result in results:
+            assert result.calls == len(benchmark.dataset_notations("benchmark"))
+            assert result.seconds_per_call > 0
+            assert result.bytes_per_call > 0
+
+    def test_sample(self) -> None:
+        assert len(benchmark.dataset_notations("knots", sample=10)) == 10
+        with pytest.raises(ValueError):
+            benchmark.dataset_notations("unknown")
+
+    def test_regressions(self) -> None:
+        baseline = [BenchmarkResult("braid", "knots", "shift_left", 10, 1e-5, 1000.0)]
+        assert not benchmark.regressions([baseline[0]._replace(seconds_per_call=1.2e-5)], baseline)
+        slower = benchmark.regressions([baseline[0]._replace(seconds_per_call=2e-5)], baseline)
+        assert len(slower) == 1 and slower[0][1] == pytest.approx(2)
+
+    def test_main(self, tmp_path, capsys) -> None:
+        path = str(tmp_path / "results.json")
+        arguments = ["--backend", "braid", "--dataset", "knots", "--operation", "shift_left", "--sample", "5"]
+        assert benchmark.main([*arguments, "--repeat", "1", "--json", path]) == 0
+        assert "shift_left" in capsys.readouterr().out
+        assert benchmark.load(path)[0].calls == 5
+
+        with open(path, "r") as file:
+            results = json.load(file)
+        results[0]["seconds_per_call"] = 1e-12
+        with open(path, "w") as file:
+            json.dump(results, file)
+        assert benchmark.main([*arguments, "--repeat", "1", "--compare", path]) == 1
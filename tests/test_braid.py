@@ -3,7 +3,7 @@ import pytest
 import numpy as np
 
 # IMPORTANT: knpy should be installed first
-from knpy.braid import Braid, BraidTransformation
+from knpy.braid import Braid, BraidTransformation, SIGMA_DTYPE
 from knpy import IllegalTransformationException, InvalidBraidException, IndexOutOfRangeException
 
 
@@ -12,20 +12,20 @@ class TestBraidClassBraidRelationsInit:
         braid = Braid([])
         assert braid.strand_count == 1
         assert braid.notation(False).shape[0] == 0
-        assert braid.notation(False).dtype == np.int32
+        assert braid.notation(False).dtype == SIGMA_DTYPE
 
     def test_init(self) -> None:
         braid = Braid([1, 2, 3])
         assert braid.strand_count == 4
         assert braid.notation(False).shape[0] == 3
-        assert braid.notation(False).dtype == np.int32
+        assert braid.notation(False).dtype == SIGMA_DTYPE
 
     def test_init_from_database(self) -> None:
         braid = Braid("3_1")
         assert braid.strand_count == 2
         assert braid.notation(False).shape[0] == 3
         assert np.all(braid.notation(False) == np.array([1, 1, 1]))
-        assert braid.notation(False).dtype == np.int32
+        assert braid.notation(False).dtype == SIGMA_DTYPE
 
     def test_values(self) -> None:
         braid = Braid([1, 2, 3])
@@ -36,6 +36,19 @@ class TestBraidClassBraidRelationsInit:
         with pytest.raises(InvalidBraidException):
             Braid([1, 0, -1, 2, 3])
 
+    def test_init_out_of_range(self) -> None:
+        for sigmas in ([40000], np.array([1, 65537]), np.array([-32768], dtype=np.int32)):
+            with pytest.raises(InvalidBraidException):
+                Braid(sigmas)
+        assert Braid(np.array([1, -32767])).strand_count == 32768
+
+    def test_init_copy_sigmas(self) -> None:
+        sigmas = np.array([1, 2, 3], dtype=SIGMA_DTYPE)
+        assert Braid(sigmas, copy_sigmas=False).notation(False) is sigmas
+        assert not np.shares_memory(Braid(sigmas).notation(False), sigmas)
+        # Other dtypes are converted even without copy_sigmas.
+        assert Braid(sigmas.astype(np.int64), copy_sigmas=False).notation(False).dtype == SIGMA_DTYPE
+
 
 class TestBraidClassBraidRelationsStabilizationDestabilization:
     def test_is_destabilization_performable_negative_index(self) -> None:
@@ -673,3 +686,40 @@ class TestBraidPerformableMoves:
                 assert state in all_states
             for state in all_states:
                 assert state in states
+
+
+class TestBraidActionMask:
+    @pytest.mark.parametrize("sigmas", [[], [1, -1], [1, 2, 3, 4, 5], [-2, 4, 8, -5, 3, 1, 2], [1, 2, 1, -2, -1, -1]])
+    def test_destabilization_performable_indices(self, sigmas):
+        braid = Braid(sigmas)
+        expected = [i for i in range(len(braid)) if braid.is_destabilization_performable(i)]
+        assert np.array_equal(braid.destabilization_performable_indices(), expected)
+
+    @pytest.mark.parametrize("sigmas", [[1, 2, 3, 4, 5], [-2, 4, 8, -5, 3, 1, 2], [1, -1, 2, 1, 2]])
+    def test_legal_action_mask_matches_performable_moves(self, sigmas):
+        braid = Braid(sigmas)
+        mask = braid.legal_action_mask(max_len=12, max_strands=10)
+        states = [braid.apply_action(action_id, max_len=12, max_strands=10) for action_id in np.nonzero(mask)[0]]
+        expected = [move() for move in braid.performable_moves()]
+        assert len(states) == len(expected)
+        for state in states:
+            assert state in expected
+        for state in expected:
+            assert state in states
+
+    def test_legal_action_mask_bounds(self):
+        braid = Braid([1, 2, 1])
+        mask = braid.legal_action_mask(max_len=4, max_strands=3)
+        assert mask.shape == (4 + 4 * 4 + 4 * 4 + 3 * 4,)
+        assert mask.sum() == len(braid.braid_relation1_performable_indices()) + len(
+            braid.braid_relation2_performable_indices()
+        ) + len(braid.remove_sigma_inverse_pair_performable_indices()) + len(
+            braid.destabilization_performable_indices()
+        )
+
+    def test_apply_action_illegal(self):
+        braid = Braid([1, 2, 1])
+        mask = braid.legal_action_mask(max_len=4, max_strands=3)
+        for action_id in np.nonzero(~mask)[0]:
+            with pytest.raises((IllegalTransformationException, IndexOutOfRangeException, ValueError)):
+                braid.apply_action(action_id, max_len=4, max_strands=3)
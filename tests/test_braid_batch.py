@@ -0,0 +1,201 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import numpy as np
+
+# IMPORTANT: knpy should be installed first
+from knpy.braid import Braid, SIGMA_DTYPE
+from knpy.braid_batch import BraidBatch, Move
+from knpy import braid_batch, braid_vec
+from knpy import IllegalTransformationException, IndexOutOfRangeException, InvalidBraidException
+
+
+def apply_reference(braid: Braid, move: int, index: int, value: int) -> Braid | None:
+    """
+    Applies a batch action to a single braid using the member functions of `Braid`, returns None if the action is
+    not performable.
+    """
+    length, index, value = len(braid), int(index), int(value)
+    try:
+        if move == Move.SHIFT_LEFT and 0 <= index < length:
+            return braid.shift_left(index)
+        if move == Move.SHIFT_RIGHT and 0 <= index < length:
+            return braid.shift_right(index)
+        if move == Move.BRAID_RELATION1 and 0 <= index < length:
+            return braid.braid_relation1(index)
+        if move == Move.BRAID_RELATION2 and 0 <= index < length:
+            return braid.braid_relation2(index)
+        if move == Move.CONJUGATION:
+            return braid.conjugation(value=value, index=index)
+        if move == Move.STABILIZATION and 0 <= value < 4:
+            return braid.stabilization(index=index, on_top=bool(value & 2), inverse=bool(value & 1))
+        if move == Move.DESTABILIZATION:
+            return braid.destabilization(index)
+        if move == Move.REMOVE_SIGMA_INVERSE_PAIR and 0 <= index < length:
+            return braid.remove_sigma_inverse_pair(index)
+    except (IllegalTransformationException, IndexOutOfRangeException, ValueError):
+        return None
+    return None
+
+
+def random_batch(rng: np.random.Generator, size: int, max_length: int, max_sigma: int) -> list[Braid]:
+    braids = []
+    for _ in range(size):
+        sigmas = rng.integers(1, max_sigma + 1, rng.integers(0, max_length + 1))
+        braids.append(Braid(sigmas * rng.choice([-1, 1], len(sigmas))))
+    return braids
+
+
+def random_actions(rng: np.random.Generator, size: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    moves = rng.integers(0, len(Move), size)
+    indices = rng.integers(-1, 10, size)
+    values = rng.integers(-4, 5, size)
+    return moves, indices, values
+
+
+class TestBraidBatchInit:
+    def test_init(self) -> None:
+        batch = BraidBatch([[1, 2, 1], [], "4_1"])
+        assert len(batch) == 3
+        assert batch.capacity == 4
+        assert batch.sigmas.dtype == SIGMA_DTYPE
+        assert np.array_equal(batch.lengths, [3, 0, 4])
+        assert np.array_equal(batch.strand_counts, [3, 1, 3])
+        assert batch[0] == Braid([1, 2, 1])
+        assert batch[1] == Braid([])
+        assert batch[2] == Braid("4_1")
+
+    def test_init_braid_vec(self) -> None:
+        batch = BraidBatch([braid_vec.Braid([1, 1, 1]), Braid([2, -1]), braid_vec.Braid("4_1")])
+        assert np.array_equal(batch.lengths, [3, 2, 4])
+        assert batch[0] == Braid([1, 1, 1]) and batch[2] == Braid("4_1")
+
+    def test_init_capacity(self) -> None:
+        batch = BraidBatch([[1, 2, 1]], capacity=10)
+        assert batch.sigmas.shape == (1, 10)
+        assert np.all(batch.sigmas[0, 3:] == 0)
+        with pytest.raises(ValueError):
+            BraidBatch([[1, 2, 1]], capacity=2)
+
+    def test_from_padded(self) -> None:
+        batch = BraidBatch.from_padded(np.array([[1, -2, 0], [3, 0, 0]]), np.array([2, 1]))
+        assert batch.to_braids() == [Braid([1, -2]), Braid([3])]
+        assert np.array_equal(batch.strand_counts, [3, 4])
+        with pytest.raises(InvalidBraidException):
+            BraidBatch.from_padded(np.array([[1, 40000]]), np.array([2]))
+
+
+class TestBraidBatchApply:
+    def test_apply_single_moves(self) -> None:
+        batch = BraidBatch([[1, 2, 1], [1, -1, 3], [1, -2, 3]])
+        moves = [Move.BRAID_RELATION1, Move.REMOVE_SIGMA_INVERSE_PAIR, Move.DESTABILIZATION]
+        transformed, performed = batch.apply(moves, [0, 0, 2])
+        assert np.all(performed)
+        assert transformed.to_braids() == [Braid([2, 1, 2]), Braid([3]), Braid([1, -2])]
+
+    def test_apply_grows_capacity(self) -> None:
+        batch = BraidBatch([[1, 2], [1]])
+        transformed, performed = batch.apply([Move.CONJUGATION, Move.STABILIZATION], [2, 0], [-1, 2])
+        assert np.all(performed)
+        assert transformed.capacity == 4
+        assert transformed.to_braids() == [Braid([1, 2, -1, 1]), Braid([1, 2])]
+
+    def test_apply_broadcasts(self) -> None:
+        batch = BraidBatch([[1, 2, 3], [3, 2, 1]])
+        transformed, performed = batch.apply(Move.SHIFT_LEFT, 1)
+        assert np.all(performed)
+        assert transformed.to_braids() == [Braid([2, 3, 1]), Braid([2, 1, 3])]
+
+    def test_apply_illegal_keeps_row(self) -> None:
+        batch = BraidBatch([[1, 2, 3], [1, -1]])
+        transformed, performed = batch.apply(Move.BRAID_RELATION1, 0)
+        assert not np.any(performed)
+        assert transformed == batch
+
+    def test_apply_strict(self) -> None:
+        batch = BraidBatch([[1, 2, 1], [1, 2, 3]])
+        with pytest.raises(IllegalTransformationException):
+            batch.apply(Move.BRAID_RELATION1, 0, strict=True)
+
+    def test_apply_does_not_modify_original(self) -> None:
+        batch = BraidBatch([[1, 2, 1]])
+        batch.apply(Move.BRAID_RELATION1, 0)
+        assert batch[0] == Braid([1, 2, 1])
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_apply_matches_braid(self, seed) -> None:
+        rng = np.random.default_rng(seed)
+        braids = random_batch(rng, 300, 8, 4)
+        moves, indices, values = random_actions(rng, len(braids))
+        transformed, performed = BraidBatch(braids).apply(moves, indices, values)
+
+        for row, braid in enumerate(braids):
+            expected = apply_reference(braid, moves[row], indices[row], values[row])
+            assert performed[row] == (expected is not None)
+            assert transformed[row] == (braid if expected is None else expected)
+            assert transformed.strand_counts[row] == transformed[row].strand_count
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_cpp_kernel_matches_numpy(self, seed) -> None:
+        B = pytest.importorskip("knpy.braid_cpp_impl")
+        rng = np.random.default_rng(seed)
+        batch = BraidBatch(random_batch(rng, 300, 8, 4))
+        moves, indices, values = random_actions(rng, len(batch))
+
+        sigmas, lengths, performed = B.apply_moves_batch(batch.sigmas, batch.lengths, moves, indices, values)
+        expected = braid_batch._apply_numpy(batch.sigmas, batch.lengths, batch.strand_counts, moves, indices, values)
+        assert np.array_equal(sigmas, expected[0])
+        assert np.array_equal(lengths, expected[1])
+        assert np.array_equal(performed, expected[2])
+
+
+class TestCppThreads:
+    def test_batch_kernels(self) -> None:
+        B = pytest.importorskip("knpy.braid_cpp_impl")
+        rng = np.random.default_rng(0)
+        # Enough rows for the kernels to split them over the threads
+        batch = BraidBatch(random_batch(rng, 20_000, 10, 5))
+        moves, indices, values = random_actions(rng, len(batch))
+        kernels = [
+            lambda threads: B.apply_moves_batch(batch.sigmas, batch.lengths, moves, indices, values, threads),
+            lambda threads: (B.least_rotations_batch(batch.sigmas, batch.lengths, threads=threads),),
+            lambda threads: B.stats_batch(batch.sigmas, batch.lengths, threads=threads),
+            lambda threads: B.simplify_batch(batch.sigmas, batch.lengths, threads=threads),
+        ]
+        for kernel in kernels:
+            expected = kernel(1)
+            for threads in (0, 3):
+                assert all(np.array_equal(a, b) for a, b in zip(kernel(threads), expected))
+
+    def test_single_braid_kernels_from_threads(self) -> None:
+        B = pytest.importorskip("knpy.braid_cpp_impl")
+        rng = np.random.default_rng(1)
+        notations = [b.notation() for b in random_batch(rng, 200, 12, 5)]
+
+        def run(notation: np.ndarray) -> tuple:
+            strand_count = int(np.abs(notation).max(initial=0)) + 1
+            return (
+                B.shift_left(notation, 1).tolist(),
+                B.braid_relation1_performable_indices(notation).tolist(),
+                B.destabilization_performable_indices(notation, strand_count).tolist(),
+                B.simplify_greedy(notation).tolist(),
+                B.least_rotation(notation),
+            )
+
+        with ThreadPoolExecutor(4) as executor:
+            assert list(executor.map(run, notations)) == [run(notation) for notation in notations]
+
+    def test_batch_from_sliced_matrix(self, monkeypatch) -> None:
+        pytest.importorskip("knpy.braid_cpp_impl")
+        monkeypatch.setattr(braid_batch, "_USE_CPP", True)
+        rng = np.random.default_rng(2)
+        batch = BraidBatch(random_batch(rng, 50, 8, 5), capacity=16)
+        moves, indices, values = random_actions(rng, len(batch))
+        expected, expected_success = batch.apply(moves, indices, values)
+        # Sliced and int64, the batch converts it once so the kernel takes it as it is
+        sliced = BraidBatch.from_padded(batch.sigmas.astype(np.int64)[:, :8], batch.lengths)
+        assert sliced.sigmas.dtype == SIGMA_DTYPE and sliced.sigmas.flags.c_contiguous
+        transformed, success = sliced.apply(moves, indices, values)
+        assert transformed.sigmas.dtype == SIGMA_DTYPE
+        assert np.array_equal(success, expected_success)
+        assert np.array_equal(transformed.sigmas[:, :8], expected.sigmas[:, :8])
+        assert np.array_equal(transformed.lengths, expected.lengths)
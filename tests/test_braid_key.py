@@ -0,0 +1,72 @@
+import pickle
+import subprocess
+import sys
+import numpy as np
+
+# IMPORTANT: knpy should be installed first
+from knpy import braid, braid_vec
+from knpy.braid_batch import BraidBatch
+from knpy.braid_key import BraidKey, batch_keys
+
+
+class TestBraidKey:
+    def test_equality(self) -> None:
+        key = BraidKey([1, -2, 3])
+        assert key == BraidKey(np.array([1, -2, 3], dtype=np.int64))
+        assert hash(key) == hash(BraidKey(np.array([1, -2, 3], dtype=np.int8)))
+        assert key != BraidKey([1, -2])
+        assert key != BraidKey([1, 2, 3])
+        assert len({key, BraidKey([1, -2, 3]), BraidKey([])}) == 2
+
+    def test_packing(self) -> None:
+        assert BraidKey([1, -2, 3]).data == np.array([1, -2, 3], dtype=np.int8).tobytes()
+        assert BraidKey([1, -200]).dtype == np.int16
+        assert np.array_equal(BraidKey([1, -200]).notation(), [1, -200])
+        assert len(BraidKey([1, -200])) == 2
+        assert BraidKey([1, -200]) != BraidKey([1, 200])
+
+    def test_pickle(self) -> None:
+        key = BraidKey([1, 2, -1])
+        assert pickle.loads(pickle.dumps(key)) == key
+
+    def test_hash_is_stable_across_processes(self) -> None:
+        code = "from knpy.braid_key import BraidKey; print(hash(BraidKey([1, 2, -1])))"
+        results = [
+            subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+            for _ in range(2)
+        ]
+        assert results[0] == results[1] == f"{hash(BraidKey([1, 2, -1]))}\n"
+
+    def test_batch_keys(self) -> None:
+        sigmas = np.array([[1, 2, 0], [300, -1, 2], [0, 0, 0]])
+        keys = batch_keys(sigmas, np.array([2, 3, 0]))
+        assert keys == [BraidKey([1, 2]), BraidKey([300, -1, 2]), BraidKey([])]
+
+
+class TestBraidHash:
+    def test_braid_hash(self) -> None:
+        braids = {braid.Braid([1, 2, 1]), braid.Braid([1, 2, 1]), braid.Braid([2, 1, 2])}
+        assert len(braids) == 2
+        assert braid.Braid([1, 2, 1]) in braids
+
+    def test_key_is_cached(self) -> None:
+        b = braid.Braid("8_19")
+        assert b.key() is b.key()
+
+    def test_backends_have_the_same_keys(self) -> None:
+        fast = braid_vec.Braid([1, 2, 1]).braid_relation1(0)
+        assert fast.key() == braid.Braid([2, 1, 2]).key()
+        assert hash(fast) == hash(braid.Braid([2, 1, 2]))
+
+
+class TestBraidBatchKeys:
+    def test_keys(self) -> None:
+        batch = BraidBatch([[1, 2, 1], [], "4_1"], capacity=6)
+        assert batch.keys() == [b.key() for b in batch.to_braids()]
+
+    def test_unique(self) -> None:
+        batch = BraidBatch([[1, 2], [2, 1], [1, 2], [], [2, 1], []])
+        distinct, rows, inverse = batch.unique()
+        assert distinct.to_braids() == [braid.Braid([1, 2]), braid.Braid([2, 1]), braid.Braid([])]
+        assert np.array_equal(rows, [0, 1, 3])
+        assert np.array_equal(inverse, [0, 1, 0, 2, 1, 2])
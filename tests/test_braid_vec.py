@@ -4,7 +4,7 @@ import numpy as np
 
 # IMPORTANT: knpy should be installed first
 from knpy.braid_vec import Braid
-from knpy.braid import BraidTransformation
+from knpy.braid import BraidTransformation, SIGMA_DTYPE
 from knpy import IllegalTransformationException, InvalidBraidException, IndexOutOfRangeException
 
 
@@ -13,20 +13,20 @@ class TestBraidClassBraidRelationsInit:
         braid = Braid([])
         assert braid.strand_count == 1
         assert braid.notation(False).shape[0] == 0
-        assert braid.notation(False).dtype == np.int32
+        assert braid.notation(False).dtype == SIGMA_DTYPE
 
     def test_init(self) -> None:
         braid = Braid([1, 2, 3])
         assert braid.strand_count == 4
         assert braid.notation(False).shape[0] == 3
-        assert braid.notation(False).dtype == np.int32
+        assert braid.notation(False).dtype == SIGMA_DTYPE
 
     def test_init_from_database(self) -> None:
         braid = Braid("3_1")
         assert braid.strand_count == 2
         assert braid.notation(False).shape[0] == 3
         assert np.all(braid.notation(False) == np.array([1, 1, 1]))
-        assert braid.notation(False).dtype == np.int32
+        assert braid.notation(False).dtype == SIGMA_DTYPE
 
     def test_values(self) -> None:
         braid = Braid([1, 2, 3])
@@ -37,6 +37,19 @@ class TestBraidClassBraidRelationsInit:
         with pytest.raises(InvalidBraidException):
             Braid([1, 0, -1, 2, 3])
 
+    def test_init_out_of_range(self) -> None:
+        for sigmas in ([40000], np.array([1, 65537]), np.array([-32768], dtype=np.int32)):
+            with pytest.raises(InvalidBraidException):
+                Braid(sigmas)
+        assert Braid(np.array([1, -32767])).strand_count == 32768
+
+    def test_init_copy_sigmas(self) -> None:
+        sigmas = np.array([1, 2, 3], dtype=SIGMA_DTYPE)
+        assert Braid(sigmas, copy_sigmas=False).notation(False) is sigmas
+        assert not np.shares_memory(Braid(sigmas).notation(False), sigmas)
+        # Other dtypes are converted even without copy_sigmas.
+        assert Braid(sigmas.astype(np.int64), copy_sigmas=False).notation(False).dtype == SIGMA_DTYPE
+
 
 class TestBraidClassBraidRelationsStabilizationDestabilization:
     def test_is_destabilization_performable_negative_index(self) -> None:
@@ -684,3 +697,64 @@ class TestBraidPerformableMoves:
                 assert state in all_states
             for state in all_states:
                 assert state in states
+
+
+class TestBraidActionMask:
+    @pytest.mark.parametrize("sigmas", [[], [1, -1], [1, 2, 3, 4, 5], [-2, 4, 8, -5, 3, 1, 2], [1, 2, 1, -2, -1, -1]])
+    def test_destabilization_performable_indices(self, sigmas):
+        braid = Braid(sigmas)
+        expected = [i for i in range(len(braid)) if braid.is_destabilization_performable(i)]
+        assert np.array_equal(braid.destabilization_performable_indices(), expected)
+
+    @pytest.mark.parametrize("sigmas", [[1, 2, 3, 4, 5], [-2, 4, 8, -5, 3, 1, 2], [1, -1, 2, 1, 2]])
+    def test_legal_action_mask_matches_performable_moves(self, sigmas):
+        braid = Braid(sigmas)
+        mask = braid.legal_action_mask(max_len=12, max_strands=10)
+        states = [braid.apply_action(action_id, max_len=12, max_strands=10) for action_id in np.nonzero(mask)[0]]
+        expected = [move() for move in braid.performable_moves()]
+        assert len(states) == len(expected)
+        for state in states:
+            assert state in expected
+        for state in expected:
+            assert state in states
+
+    def test_legal_action_mask_bounds(self):
+        braid = Braid([1, 2, 1])
+        mask = braid.legal_action_mask(max_len=4, max_strands=3)
+        assert mask.shape == (4 + 4 * 4 + 4 * 4 + 3 * 4,)
+        assert mask.sum() == len(braid.braid_relation1_performable_indices()) + len(
+            braid.braid_relation2_performable_indices()
+        ) + len(braid.remove_sigma_inverse_pair_performable_indices()) + len(
+            braid.destabilization_performable_indices()
+        )
+
+    def test_apply_action_illegal(self):
+        braid = Braid([1, 2, 1])
+        mask = braid.legal_action_mask(max_len=4, max_strands=3)
+        for action_id in np.nonzero(~mask)[0]:
+            with pytest.raises((IllegalTransformationException, IndexOutOfRangeException, ValueError)):
+                braid.apply_action(action_id, max_len=4, max_strands=3)
+
+
+class TestSigmaDtype:
+    def test_kernels_do_not_convert(self) -> None:
+        B = pytest.importorskip("knpy.braid_cpp_impl")
+        sigmas = np.array([1, 2, 1, -3], dtype=SIGMA_DTYPE)
+        assert B.shift_left(sigmas, 1).dtype == SIGMA_DTYPE
+        for dtype in (np.int32, np.int64, np.float64):
+            with pytest.raises(TypeError):
+                B.shift_left(sigmas.astype(dtype), 1)
+        with pytest.raises(TypeError):
+            B.least_rotation(np.repeat(sigmas, 2)[::2])
+        with pytest.raises(TypeError):
+            B.simplify_batch(np.zeros((2, 3), dtype=np.int32), np.zeros(2, dtype=np.int64))
+
+    def test_moves_keep_dtype(self) -> None:
+        for sigmas in ([1, 2, 1, -3], np.array([1, 2, 1, -3], dtype=np.int64), np.array([1, 2, 1, -3])[::-1]):
+            braid = Braid(sigmas)
+            assert braid.notation(False).dtype == SIGMA_DTYPE and braid.notation(False).flags.c_contiguous
+        braid = Braid([1, 2, 1, -3])
+        for move in braid.performable_moves():
+            transformed = move()
+            assert transformed.notation(False).dtype == SIGMA_DTYPE
+            assert transformed.canonical_rotation().notation(False).dtype == SIGMA_DTYPE
@@ -0,0 +1,142 @@
+import pytest
+import numpy as np
+
+# IMPORTANT: knpy should be installed first
+from knpy import braid, braid_vec
+from knpy.braid import Braid
+from knpy.braid_batch import BraidBatch
+from knpy.burau import (
+    BurauTracker,
+    alexander_value,
+    batch_alexander_values,
+    batch_burau,
+    burau_matrix,
+    reduce,
+)
+
+T = np.exp(0.7j)
+
+
+def naive_burau(sigmas: list[int], strand_count: int, t: complex) -> np.ndarray:
+    """
+    Product of the dense Burau matrices of the sigmas.
+    """
+    product = np.eye(strand_count, dtype=complex)
+    for sigma in sigmas:
+        generator = np.eye(strand_count, dtype=complex)
+        i = abs(sigma) - 1
+        block = np.array([[1 - t, t], [1, 0]])
+        generator[i : i + 2, i : i + 2] = block if sigma > 0 else np.linalg.inv(block)
+        product = product @ generator
+    return product
+
+
+class TestBurau:
+    def test_generators(self) -> None:
+        assert np.allclose(burau_matrix([1], T), [[-T]])
+        assert np.allclose(burau_matrix([2], T, strand_count=4), [[1, 0, 0], [1, -T, T], [0, 0, 1]])
+        assert np.allclose(burau_matrix([-2], T, strand_count=4), [[1, 0, 0], [1 / T, -1 / T, 1], [0, 0, 1]])
+        assert np.allclose(burau_matrix([1, -1, 2, -2], T), np.eye(2))
+        assert burau_matrix([], T).shape == (0, 0)
+        assert np.allclose(burau_matrix([], T, reduced=False), [[1]])
+        with pytest.raises(ValueError):
+            burau_matrix([3], T, strand_count=3)
+
+    def test_unreduced_and_reduced(self) -> None:
+        rng = np.random.default_rng(0)
+        for _ in range(10):
+            sigmas = [int(s) for s in rng.choice([-4, -3, -2, -1, 1, 2, 3, 4], 25)]
+            unreduced = burau_matrix(sigmas, T, strand_count=5, reduced=False)
+            assert np.allclose(unreduced, naive_burau(sigmas, 5, T))
+            assert np.allclose(reduce(unreduced, T), burau_matrix(sigmas, T, strand_count=5))
+
+    def test_braid_relations(self) -> None:
+        assert np.allclose(burau_matrix([1, 2, 1], T), burau_matrix([2, 1, 2], T))
+        assert np.allclose(burau_matrix([1, 3], T), burau_matrix([3, 1], T))
+        assert not np.allclose(burau_matrix([1, 2], T), burau_matrix([2, 1], T))
+
+    def test_real_t(self) -> None:
+        matrix = burau_matrix([1, -2, 1], 2.0)
+        assert matrix.dtype == np.float64
+        assert np.allclose(matrix, burau_matrix([1, -2, 1], 2 + 0j).real)
+
+    def test_batch(self) -> None:
+        braids = [Braid("3_1"), Braid("8_19"), Braid([]), Braid([-2, 1])]
+        batch = BraidBatch(braids, capacity=20)
+        for reduced in (True, False):
+            matrices = batch.burau_matrices(T, reduced=reduced)
+            n = int(batch.strand_counts.max())
+            for b, matrix in zip(braids, matrices):
+                assert np.allclose(matrix, burau_matrix(b.notation(), T, n, reduced))
+        assert batch_burau(np.zeros((0, 3), dtype=np.int32), [], T, 3).shape == (0, 2, 2)
+
+    @pytest.mark.parametrize("braid_class", [braid.Braid, braid_vec.Braid])
+    def test_braid_method(self, braid_class) -> None:
+        b = braid_class("8_19")
+        assert np.allclose(b.burau_matrix(T), burau_matrix(b.notation(), T))
+
+    def test_alexander_value(self) -> None:
+        # Alexander polynomials of the trefoil and of 8_19 (up to ±t^k)
+        assert np.isclose(alexander_value(burau_matrix([1, 1, 1], T), T), 1 - T + T**2)
+        value = alexander_value(Braid("8_19").burau_matrix(T), T)
+        assert np.isclose(abs(value), abs(1 - T + T**3 - T**5 + T**6))
+        assert np.isclose(alexander_value(burau_matrix([], T), T), 1)
+
+        braids = [Braid("3_1"), Braid("3_1").stabilization(), Braid("4_1"), Braid([1, -1])]
+        batch = BraidBatch(braids)
+        values = batch_alexander_values(batch.sigmas, batch.lengths, T)
+        assert np.isclose(abs(values[0]), abs(values[1]))
+        assert not np.isclose(abs(values[0]), abs(values[2]))
+        for b, value in zip(braids, values):
+            assert np.isclose(value, alexander_value(b.burau_matrix(T), T))
+
+
+class TestBurauTracker:
+    def assert_tracks(self, tracker: BurauTracker) -> None:
+        b = tracker.braid
+        assert np.allclose(tracker.matrix(reduced=False), burau_matrix(b.notation(), T, b.strand_count, False))
+        assert np.allclose(tracker.matrix(), b.burau_matrix(T))
+
+    def test_init(self) -> None:
+        tracker = BurauTracker(Braid("10_136"), T)
+        self.assert_tracks(tracker)
+        assert np.isclose(tracker.alexander_value(), alexander_value(tracker.matrix(), T))
+
+    def test_wrapping_moves(self) -> None:
+        tracker = BurauTracker(Braid([1, 2, -3, -1]), T)
+        self.assert_tracks(tracker.remove_sigma_inverse_pair(3))
+        self.assert_tracks(tracker.conjugation(-2, 5))
+        self.assert_tracks(tracker.shift_left(1))
+        self.assert_tracks(tracker.shift_right(3))
+        self.assert_tracks(tracker.stabilization(index=2, on_top=True, inverse=True))
+        self.assert_tracks(tracker.stabilization(index=0).destabilization(0))
+
+    @pytest.mark.parametrize("braid_class", [braid.Braid, braid_vec.Braid])
+    def test_wrapping_relations(self, braid_class) -> None:
+        self.assert_tracks(BurauTracker(braid_class([-1, 2, 3]), T).braid_relation2(2))
+        self.assert_tracks(BurauTracker(braid_class([1, 2, 1, 3]), T).braid_relation2(3))
+        self.assert_tracks(BurauTracker(braid_class([2, 1, 3, 2, 1]), T).braid_relation1(3))
+        self.assert_tracks(BurauTracker(braid_class([3, 2, -1, 2]), T).braid_relation1(3))
+
+    @pytest.mark.parametrize("braid_class", [braid.Braid, braid_vec.Braid])
+    @pytest.mark.parametrize("seed", range(5))
+    def test_random_walk(self, braid_class, seed) -> None:
+        rng = np.random.default_rng(seed)
+        tracker = BurauTracker(braid_class("8_19"), T)
+        for _ in range(40):
+            b = tracker.braid
+            moves = b.performable_moves()
+            choice = int(rng.integers(len(moves)))
+            if len(b) > 12:
+                shrinking = [i for i, move in enumerate(moves) if len(move()) < len(b)]
+                choice = shrinking[int(rng.integers(len(shrinking)))] if shrinking else choice
+            move = moves[choice]
+            tracker = getattr(tracker, move.func.__name__)(*move.args, **move.keywords)
+            assert tracker.braid == move()
+            self.assert_tracks(tracker)
+            # The Alexander polynomial does not change under Markov moves.
+            assert np.isclose(abs(tracker.alexander_value()), abs(1 - T + T**3 - T**5 + T**6))
+            if len(tracker.braid) > 1:
+                amount = int(rng.integers(len(tracker.braid)))
+                tracker = tracker.shift_left(amount)
+                self.assert_tracks(tracker)
@@ -0,0 +1,53 @@
+import pytest
+import numpy as np
+
+# IMPORTANT: knpy should be installed first
+import knpy
+from knpy import braid_vec
+from knpy.braid import Braid
+from knpy.braid_batch import BraidBatch
+
+torch = pytest.importorskip("torch")
+
+BRAIDS = [Braid([1, -2, 3]), braid_vec.Braid([-1]), np.array([2, 2], dtype=np.int32), []]
+
+
+class TestCollate:
+    def test_padding(self) -> None:
+        collated = knpy.collate(BRAIDS, pad=-9)
+        assert collated.sigmas.dtype == torch.int64 and collated.features is None
+        assert collated.sigmas.tolist() == [[1, -2, 3], [-1, -9, -9], [2, 2, -9], [-9, -9, -9]]
+        assert collated.lengths.tolist() == [3, 1, 2, 0]
+        assert collated.mask.tolist() == [[True] * 3, [True, False, False], [True, True, False], [False] * 3]
+        wide = knpy.collate(BRAIDS, max_len=5, dtype=torch.int32)
+        assert wide.sigmas.shape == (4, 5) and wide.sigmas.dtype == torch.int32
+        batch = BraidBatch([[1, -2, 3], [-1], [2, 2], []], capacity=7)
+        assert torch.equal(knpy.collate(batch, max_len=5).sigmas, wide.sigmas.long())
+        with pytest.raises(ValueError):
+            knpy.collate(BRAIDS, max_len=2)
+        with pytest.raises(ValueError):
+            knpy.collate(BRAIDS, dtype=torch.float32)
+
+    def test_encodings(self) -> None:
+        one_hot = knpy.collate(BRAIDS, encoding="one_hot").features
+        # 4 strands: channels of sigma 1, 2, 3, -1, -2, -3
+        assert one_hot.shape == (4, 3, 6)
+        assert one_hot[0].argmax(dim=1).tolist() == [0, 4, 2] and one_hot[0].sum().item() == 3
+        assert one_hot[1, 0].tolist() == [0, 0, 0, 1, 0, 0] and one_hot[1, 1:].sum().item() == 0
+        assert knpy.collate(BRAIDS, encoding="one_hot", max_strands=6).features.shape == (4, 3, 10)
+        with pytest.raises(ValueError):
+            knpy.collate(BRAIDS, encoding="one_hot", max_strands=3)
+        generator_sign = knpy.collate(BRAIDS, encoding="generator_sign").features
+        assert generator_sign[0].tolist() == [[1, 1], [2, -1], [3, 1]]
+        assert generator_sign[3].abs().sum().item() == 0
+        with pytest.raises(ValueError):
+            knpy.collate(BRAIDS, encoding="bits")
+
+    def test_data_loader(self) -> None:
+        dataset = [Braid(word) for word in ([1, 2], [-1], [3, -2, 1], [1])]
+        loader = torch.utils.data.DataLoader(dataset, batch_size=2, collate_fn=knpy.collate)
+        assert [batch.sigmas.shape for batch in loader] == [(2, 2), (2, 3)]
+
+    def test_empty(self) -> None:
+        collated = knpy.collate([], encoding="one_hot")
+        assert collated.sigmas.shape == (0, 0) and collated.lengths.shape == (0,)
@@ -0,0 +1,72 @@
+import os
+import subprocess
+import sys
+import pytest
+import numpy as np
+
+# IMPORTANT: knpy should be installed first
+from knpy import data_utils
+from knpy.data_utils import KnotTable, load_csv, get_table, PRIME_KNOTS_PATH, BENCHMARK_PATH
+
+
+@pytest.fixture(name="empty_cache")
+def fixture_empty_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("KNPY_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(data_utils, "_tables", {})
+    return tmp_path
+
+
+class TestKnotTable:
+    def test_from_dict(self) -> None:
+        table = KnotTable.from_dict({"a": [[1, 2]], "b": [[-1], [2, 2, 2]]})
+        assert len(table) == 2
+        assert "b" in table and "c" not in table
+        assert table.notation_count("b") == 2
+        assert np.array_equal(table.notation("a"), [1, 2])
+        assert np.array_equal(table.notation("b", 1), [2, 2, 2])
+        assert np.array_equal(table.notation("b", -1), [2, 2, 2])
+
+    def test_lookup_errors(self) -> None:
+        table = KnotTable.from_dict({"a": [[1, 2]]})
+        with pytest.raises(KeyError):
+            table.notation("b")
+        with pytest.raises(IndexError):
+            table.notation("a", 1)
+
+    @pytest.mark.parametrize("path", [PRIME_KNOTS_PATH, BENCHMARK_PATH])
+    def test_matches_csv(self, path) -> None:
+        assert KnotTable.from_csv(path).to_dict() == load_csv(path)
+
+    def test_save_load(self, tmp_path) -> None:
+        table = KnotTable.from_csv(BENCHMARK_PATH)
+        table.save(str(tmp_path / "table"))
+        loaded = KnotTable.load(str(tmp_path / "table"))
+        assert isinstance(loaded.sigmas, np.memmap)
+        assert loaded.to_dict() == table.to_dict()
+
+
+class TestGetTable:
+    def test_writes_and_reuses_cache(self, empty_cache) -> None:
+        table = get_table(PRIME_KNOTS_PATH)
+        assert not isinstance(table.sigmas, np.memmap)
+        assert len(os.listdir(empty_cache)) == 1
+
+        data_utils._tables.clear()
+        cached = get_table(PRIME_KNOTS_PATH)
+        assert isinstance(cached.sigmas, np.memmap)
+        assert np.array_equal(cached.notation("8_19"), table.notation("8_19"))
+        assert get_table(PRIME_KNOTS_PATH) is cached
+
+    def test_unwritable_cache(self, empty_cache, monkeypatch) -> None:
+        monkeypatch.setenv("KNPY_CACHE_DIR", str(empty_cache / "file"))
+        (empty_cache / "file").write_text("")
+        assert np.array_equal(get_table(PRIME_KNOTS_PATH).notation("3_1"), [1, 1, 1])
+
+    def test_lazy_dicts(self) -> None:
+        assert data_utils.knots_in_braid_notation_dict["4_1"] == [[1, -2, 1, -2]]
+        assert set(data_utils.benchmark_braids) == set(load_csv(BENCHMARK_PATH))
+
+    def test_import_does_not_load_tables(self) -> None:
+        code = "import knpy, knpy.data_utils as d; print(len(d._tables))"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == "0"
@@ -0,0 +1,84 @@
+import os
+import pytest
+import numpy as np
+
+# IMPORTANT: knpy should be installed first
+from knpy import braid_vec
+from knpy.braid import Braid
+from knpy.braid_batch import BraidBatch
+from knpy.dataset import TrajectoryDataset, TrajectoryWriter
+
+EPISODE = [Braid([1, -2, 3]), Braid([1, 3]), Braid([])]
+WORDS = [[2, -1], [1], [-3, 2, -1, 4], [1, 1, 1]]
+
+
+def write_dataset(directory: str, chunk_size: int = 2) -> None:
+    with TrajectoryWriter(directory, chunk_size=chunk_size) as writer:
+        writer.write(EPISODE, [4, 7, -1], [0.5, 1.0, 0.0])
+        writer.write(BraidBatch(WORDS, capacity=8), [1, 2, 3, -1], [1.0, 2.0, 3.0, 4.0], episode_lengths=[1, 3])
+
+
+class TestTrajectoryDataset:
+    def test_round_trip(self, tmp_path) -> None:
+        directory = os.path.join(tmp_path, "rollouts")
+        write_dataset(directory)
+        dataset = TrajectoryDataset.load(directory)
+        assert len(dataset) == 7 and dataset.episode_count == 3
+        assert isinstance(dataset.sigmas, np.memmap) and dataset.sigmas.dtype == np.int8
+        assert [b.notation().tolist() for b in dataset.braids()] == [b.notation().tolist() for b in EPISODE] + WORDS
+        assert dataset.braid(3) == Braid(WORDS[0])
+        assert list(dataset.episode(0)) == [0, 1, 2] and list(dataset.episode(2)) == [4, 5, 6]
+        assert dataset.actions.tolist() == [4, 7, -1, 1, 2, 3, -1]
+        assert dataset.rewards.tolist() == [0.5, 1.0, 0.0, 1.0, 2.0, 3.0, 4.0]
+
+    def test_batches(self, tmp_path) -> None:
+        directory = os.path.join(tmp_path, "rollouts")
+        write_dataset(directory)
+        dataset = TrajectoryDataset.load(directory)
+        batches = list(dataset.batches(3, max_len=6))
+        assert [len(batch.lengths) for batch in batches] == [3, 3, 1]
+        sigmas, lengths = dataset.padded([5, 0])
+        assert sigmas.tolist() == [[-3, 2, -1, 4], [1, -2, 3, 0]] and lengths.tolist() == [4, 3]
+        assert np.array_equal(batches[1].sigmas, dataset.padded([3, 4, 5], max_len=6)[0])
+        shuffled = list(dataset.batches(4, shuffle=True, seed=0))
+        assert sorted(np.concatenate([batch.actions for batch in shuffled]).tolist()) == sorted(dataset.actions.tolist())
+        with pytest.raises(ValueError):
+            dataset.padded([5], max_len=3)
+
+    def test_torch_batches(self, tmp_path) -> None:
+        torch = pytest.importorskip("torch")
+        directory = os.path.join(tmp_path, "rollouts")
+        write_dataset(directory)
+        batch = next(TrajectoryDataset.load(directory).batches(4, max_len=8, as_torch=True))
+        assert isinstance(batch.sigmas, torch.Tensor) and batch.sigmas.shape == (4, 8)
+        assert batch.rewards.dtype == torch.float32
+
+    def test_writer(self, tmp_path) -> None:
+        directory = os.path.join(tmp_path, "rollouts")
+        with pytest.raises(ValueError):
+            with TrajectoryWriter(directory) as writer:
+                writer.write([[200]], [0], [0.0])
+        # Nothing is left behind
+        assert os.listdir(tmp_path) == []
+        with TrajectoryWriter(directory, sigma_dtype=np.int16) as writer:
+            writer.write([[200]], [0], [0.0])
+            with pytest.raises(ValueError):
+                writer.write([[1]], [0, 1], [0.0])
+        assert TrajectoryDataset.load(directory).braid(0) == Braid([200])
+        with pytest.raises(FileExistsError):
+            TrajectoryWriter(directory)
+        with pytest.raises(ValueError):
+            TrajectoryWriter(os.path.join(tmp_path, "other"), sigma_dtype=np.int32)
+
+    def test_braid_vec_states(self, tmp_path) -> None:
+        directory = os.path.join(tmp_path, "rollouts")
+        with TrajectoryWriter(directory) as writer:
+            writer.write([braid_vec.Braid([1, -2, 3]), braid_vec.Braid([])], [0, 1], [0.5, 1.0])
+        assert list(TrajectoryDataset.load(directory).braids()) == [Braid([1, -2, 3]), Braid([])]
+
+    def test_empty(self, tmp_path) -> None:
+        directory = os.path.join(tmp_path, "rollouts")
+        TrajectoryWriter(directory).close()
+        dataset = TrajectoryDataset.load(directory)
+        assert len(dataset) == 0 and dataset.episode_count == 0
+        assert list(dataset.braids()) == [] and list(dataset.batches(4)) == []
@@ -0,0 +1,87 @@
+import pytest
+import numpy as np
+
+# IMPORTANT: knpy should be installed first
+from knpy.braid import Braid
+from knpy.braid_batch import BraidBatch, Move
+from knpy.env import BraidVecEnv
+
+
+def random_legal_actions(rng: np.random.Generator, mask: np.ndarray) -> np.ndarray:
+    return np.argmax(rng.random(mask.shape) * mask, axis=1)
+
+
+class TestBraidVecEnv:
+    def test_reset(self) -> None:
+        env = BraidVecEnv(8, max_len=12, max_strands=4, seed=0)
+        observations, info = env.reset()
+        assert observations.shape == (8, 12)
+        assert info["action_mask"].shape == (8, env.action_space.size)
+        assert np.all(info["lengths"] <= 12) and np.all(info["strand_counts"] <= 4)
+        for row in range(8):
+            assert np.all(observations[row, info["lengths"][row] :] == 0)
+
+    def test_reset_from_knots(self) -> None:
+        env = BraidVecEnv(4, max_len=8, max_strands=4, knots=["3_1"], seed=0)
+        observations, _ = env.reset()
+        assert np.all(observations[:, :3] == 1) and np.all(observations[:, 3:] == 0)
+
+    def test_no_fitting_braid(self) -> None:
+        with pytest.raises(ValueError):
+            BraidVecEnv(4, max_len=2, max_strands=4, knots=["3_1"])
+
+    def test_reproducible(self) -> None:
+        first, _ = BraidVecEnv(16, seed=3).reset()
+        second, _ = BraidVecEnv(16).reset(seed=3)
+        assert np.array_equal(first, second)
+
+    def test_step_matches_braid_moves(self) -> None:
+        rng = np.random.default_rng(0)
+        env = BraidVecEnv(16, max_len=16, max_strands=6, seed=0)
+        observations, info = env.reset()
+        for _ in range(20):
+            actions = random_legal_actions(rng, info["action_mask"])
+            before = env.braids.to_braids()
+            observations, rewards, terminated, truncated, info = env.step(actions)
+            moves, indices, values = env.action_space.decode(actions)
+            for row, braid in enumerate(before):
+                expected, performed = BraidBatch([braid]).apply(moves[row], indices[row], values[row])
+                assert performed[0]
+                if not (terminated[row] or truncated[row]):
+                    assert Braid(observations[row, : info["lengths"][row]]) == expected[0]
+                assert rewards[row] == pytest.approx(len(braid) - len(expected[0]) - env.step_penalty)
+
+    def test_illegal_action(self) -> None:
+        env = BraidVecEnv(1, max_len=8, max_strands=4, knots=["3_1"], seed=0)
+        observations, info = env.reset()
+        illegal = np.nonzero(~info["action_mask"][0])[0][0]
+        new_observations, rewards, _, _, _ = env.step([illegal])
+        assert np.array_equal(observations, new_observations)
+        assert rewards[0] == pytest.approx(-env.step_penalty - env.illegal_action_penalty)
+
+    def test_termination_and_autoreset(self) -> None:
+        env = BraidVecEnv(2, max_len=6, max_strands=3, pool=BraidBatch([[1, -1]]), seed=0)
+        env.reset()
+        action = env.action_space.encode(Move.REMOVE_SIGMA_INVERSE_PAIR, 0)
+        observations, rewards, terminated, truncated, info = env.step([action, action])
+        assert np.all(terminated) and not np.any(truncated)
+        assert np.all(rewards == pytest.approx(2 - env.step_penalty))
+        assert np.all(info["final_observation"] == 0)
+        assert np.array_equal(observations[:, :2], [[1, -1], [1, -1]])
+
+    def test_truncation(self) -> None:
+        rng = np.random.default_rng(0)
+        env = BraidVecEnv(4, max_len=12, max_strands=4, knots=["4_1"], max_steps=3, seed=0)
+        _, info = env.reset()
+        for step in range(3):
+            _, _, terminated, truncated, info = env.step(random_legal_actions(rng, info["action_mask"]))
+            assert not np.any(terminated)
+            assert np.all(truncated) == (step == 2)
+
+    def test_as_torch(self) -> None:
+        torch = pytest.importorskip("torch")
+        env = BraidVecEnv(4, max_len=12, max_strands=4, as_torch=True, seed=0)
+        observations, info = env.reset()
+        assert isinstance(observations, torch.Tensor) and isinstance(info["action_mask"], torch.Tensor)
+        _, rewards, terminated, _, _ = env.step(torch.argmax(info["action_mask"].int(), dim=1).numpy())
+        assert rewards.shape == (4,) and terminated.dtype == torch.bool
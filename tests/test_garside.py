@@ -0,0 +1,103 @@
+import pytest
+import numpy as np
+
+# IMPORTANT: knpy should be installed first
+from knpy import braid, braid_vec
+from knpy.braid import SIGMA_DTYPE
+from knpy.braid_batch import BraidBatch
+from knpy.garside import left_normal_form, normal_form_word, simple_word
+
+
+def burau(word: list[int], strand_count: int, t: complex = 0.7 + 0.3j) -> np.ndarray:
+    """
+    Unreduced Burau matrix of a braid word at a numeric t, equal braids have equal matrices.
+    """
+    matrix = np.eye(strand_count, dtype=complex)
+    for sigma in word:
+        i = abs(sigma)
+        generator = np.eye(strand_count, dtype=complex)
+        generator[i - 1 : i + 1, i - 1 : i + 1] = [[1 - t, t], [1, 0]]
+        matrix = matrix @ (generator if sigma > 0 else np.linalg.inv(generator))
+    return matrix
+
+
+def random_word(rng: np.random.Generator, strand_count: int, length: int) -> list[int]:
+    return (rng.integers(1, strand_count, length) * rng.choice([-1, 1], length)).tolist()
+
+
+class TestLeftNormalForm:
+    def test_braid_relations(self) -> None:
+        assert left_normal_form([1, 2, 1], 3)[0] == 1
+        assert left_normal_form([1, 2, 1], 3)[1].shape == (0, 3)
+        assert np.array_equal(left_normal_form([1, 3, 2], 4)[1], left_normal_form([3, 1, 2], 4)[1])
+        assert left_normal_form([1, -1, 2, -2], 3)[1].shape == (0, 3)
+
+    def test_inverse_letter(self) -> None:
+        infimum, factors = left_normal_form([-1], 3)
+        assert infimum == -1
+        assert simple_word(factors[0]) == [1, 2]
+
+    def test_invalid_sigma(self) -> None:
+        with pytest.raises(ValueError):
+            left_normal_form([1, 3], 3)
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_normal_form_word(self, seed) -> None:
+        rng = np.random.default_rng(seed)
+        for _ in range(200):
+            strand_count = int(rng.integers(2, 6))
+            word = random_word(rng, strand_count, int(rng.integers(0, 15)))
+            infimum, factors = left_normal_form(word, strand_count)
+            normal_word = normal_form_word(infimum, factors, strand_count)
+            assert np.allclose(burau(word, strand_count), burau(normal_word, strand_count))
+
+            normal_infimum, normal_factors = left_normal_form(normal_word, strand_count)
+            assert normal_infimum == infimum
+            assert np.array_equal(normal_factors, factors)
+
+            inverse_word = [-sigma for sigma in word[::-1]]
+            assert left_normal_form(word + inverse_word, strand_count)[0] == 0
+            assert len(left_normal_form(word + inverse_word, strand_count)[1]) == 0
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_cpp_matches_python(self, seed) -> None:
+        B = pytest.importorskip("knpy.braid_cpp_impl")
+        rng = np.random.default_rng(seed)
+        for _ in range(200):
+            strand_count = int(rng.integers(2, 7))
+            word = np.array(random_word(rng, strand_count, int(rng.integers(0, 20))), dtype=SIGMA_DTYPE)
+            infimum, factors = B.left_normal_form(word, strand_count)
+            expected_infimum, expected_factors = left_normal_form(word, strand_count)
+            assert infimum == expected_infimum
+            assert np.array_equal(factors, expected_factors)
+
+
+@pytest.mark.parametrize("Braid", [braid.Braid, braid_vec.Braid])
+class TestBraidNormalForm:
+    def test_normal_form(self, Braid) -> None:
+        assert Braid([1, 2, 1]).normal_form() == Braid([2, 1, 2]).normal_form()
+        assert Braid([1, -1, 2]).normal_form() == Braid([2])
+        assert Braid([1, 2, -1]).normal_form() != Braid([2, 1, -1]).normal_form()
+
+    def test_normal_form_key(self, Braid) -> None:
+        knot = Braid("8_19")
+        assert knot.normal_form_key() is knot.normal_form_key()
+        assert Braid([1, 2]).normal_form_key() != Braid([2, 1]).normal_form_key()
+        assert Braid([2, 1, 2]).normal_form_key() == Braid([1, 2, 1]).normal_form_key()
+        # Same element of the braid group, but on different numbers of strands.
+        assert Braid([1, 2, -2]).normal_form_key() != Braid([1]).normal_form_key()
+
+    def test_moves_inside_the_word_keep_the_key(self, Braid) -> None:
+        knot = Braid("10_136")
+        for index in knot.braid_relation1_performable_indices():
+            if index + 2 < len(knot):
+                assert knot.braid_relation1(index).normal_form_key() == knot.normal_form_key()
+        for index in knot.braid_relation2_performable_indices():
+            if index + 1 < len(knot):
+                assert knot.braid_relation2(index).normal_form_key() == knot.normal_form_key()
+
+    def test_batch_normal_form_keys(self, Braid) -> None:
+        braids = [Braid([1, 2, 1]), Braid([2, 1, 2]), Braid("4_1"), Braid([])]
+        keys = BraidBatch([b.notation() for b in braids]).normal_form_keys()
+        assert keys == [b.normal_form_key() for b in braids]
+        assert keys[0] == keys[1]
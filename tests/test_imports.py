@@ -0,0 +1,26 @@
+import subprocess
+import sys
+
+# IMPORTANT: knpy should be installed first
+
+IMPORT_TIME_BUDGET = 1.0  # seconds
+
+
+def run_python(code: str) -> str:
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.strip()
+
+
+class TestImports:
+    def test_heavy_dependencies_not_imported(self) -> None:
+        code = "import sys, knpy; print(sorted({'torch', 'braidvisualiser', 'matplotlib'} & set(sys.modules)))"
+        assert run_python(code) == "[]"
+
+    def test_import_time_budget(self) -> None:
+        code = "import time; start = time.perf_counter(); import knpy; print(time.perf_counter() - start)"
+        # Best of a few runs, so a busy machine does not make the test flaky.
+        elapsed = min(float(run_python(code)) for _ in range(3))
+        assert elapsed < IMPORT_TIME_BUDGET
+
+    def test_to_torch_imports_on_first_use(self) -> None:
+        code = "from knpy.braid import Braid; print(Braid([1, -2]).to_torch().tolist())"
+        assert run_python(code) == "[1, -2]"
@@ -0,0 +1,75 @@
+import pytest
+import numpy as np
+
+# IMPORTANT: knpy should be installed first
+from knpy.braid import Braid
+from knpy.incremental import IncrementalBraid
+from knpy import IllegalTransformationException, IndexOutOfRangeException
+
+
+def assert_same_performability(braid: IncrementalBraid) -> None:
+    """
+    Compares the cached masks of braid to the ones computed from scratch by `Braid`.
+    """
+    reference = Braid(braid.notation())
+    assert braid.strand_count == reference.strand_count
+    assert np.array_equal(braid.braid_relation1_performable_indices(), reference.braid_relation1_performable_indices())
+    assert np.array_equal(braid.braid_relation2_performable_indices(), reference.braid_relation2_performable_indices())
+    assert np.array_equal(
+        braid.remove_sigma_inverse_pair_performable_indices(), reference.remove_sigma_inverse_pair_performable_indices()
+    )
+    assert np.array_equal(
+        braid.destabilization_performable_indices(), reference.destabilization_performable_indices()
+    )
+    for index in range(-len(braid), len(braid)):
+        assert braid.is_braid_relation1_performable(index) == reference.is_braid_relation1_performable(index)
+        assert braid.is_braid_relation2_performable(index) == reference.is_braid_relation2_performable(index)
+        assert braid.is_remove_sigma_inverse_pair_performable(index) == (
+            reference.is_remove_sigma_inverse_pair_performable(index)
+        )
+        assert braid.is_destabilization_performable(index) == reference.is_destabilization_performable(index)
+
+
+class TestIncrementalBraid:
+    def test_init(self) -> None:
+        braid = IncrementalBraid("10_136")
+        assert braid == Braid("10_136")
+        assert_same_performability(braid)
+        assert_same_performability(IncrementalBraid([]))
+
+    def test_moves_return_incremental_braids(self) -> None:
+        braid = IncrementalBraid([1, 2, 1, -3])
+        assert isinstance(braid.braid_relation1(0), IncrementalBraid)
+        assert isinstance(braid.performable_moves()[0](), IncrementalBraid)
+        assert braid.braid_relation1(0) == Braid([1, 2, 1, -3]).braid_relation1(0)
+
+    def test_exceptions(self) -> None:
+        braid = IncrementalBraid([1, 2, 3])
+        with pytest.raises(IllegalTransformationException):
+            braid.braid_relation1(0)
+        with pytest.raises(IndexOutOfRangeException):
+            braid.is_braid_relation2_performable(3)
+        with pytest.raises(IndexOutOfRangeException):
+            braid.remove_sigma_inverse_pair(-4)
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_random_walk(self, seed) -> None:
+        rng = np.random.default_rng(seed)
+        braid = IncrementalBraid("8_19")
+        reference = Braid("8_19")
+        for _ in range(60):
+            moves = braid.performable_moves()
+            reference_moves = reference.performable_moves()
+            assert len(moves) == len(reference_moves)
+            # Prefer moves that keep the braid small, so every kind of move is performed.
+            choice = int(rng.integers(len(moves)))
+            if len(braid) > 12:
+                shrinking = [i for i, move in enumerate(moves) if len(move()) < len(braid)]
+                choice = shrinking[int(rng.integers(len(shrinking)))] if shrinking else choice
+            braid, reference = moves[choice](), reference_moves[choice]()
+            assert braid == reference
+            assert_same_performability(braid)
+            if len(braid) > 0 and rng.random() < 0.2:
+                amount = int(rng.integers(-len(braid) + 1, len(braid)))
+                braid, reference = braid.shift_left(amount), reference.shift_left(amount)
+                assert_same_performability(braid)
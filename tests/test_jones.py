@@ -0,0 +1,169 @@
+import itertools
+import pytest
+import numpy as np
+
+# IMPORTANT: knpy should be installed first
+from knpy import braid, braid_vec, jones
+from knpy.braid import Braid
+from knpy.braid_batch import BraidBatch
+from knpy.data_utils import knot_table
+from knpy.polynomial import LaurentPolynomial
+
+# Jones polynomials from KnotInfo, as {exponent: coefficient}
+KNOWN = {
+    "3_1": {1: 1, 3: 1, 4: -1},
+    "4_1": {-2: 1, -1: -1, 0: 1, 1: -1, 2: 1},
+    "5_1": {2: 1, 4: 1, 5: -1, 6: 1, 7: -1},
+    "5_2": {1: 1, 2: -1, 3: 2, 4: -1, 5: 1, 6: -1},
+    "8_19": {3: 1, 5: 1, 8: -1},
+}
+
+DELTA = LaurentPolynomial({-2: -1, 2: -1})
+
+
+def state_sum_bracket(sigmas: list[int], strand_count: int) -> LaurentPolynomial:
+    """
+    Kauffman bracket of the closure of the braid as the sum over all the smoothings of its crossings.
+    """
+    total = LaurentPolynomial()
+    for state in itertools.product((False, True), repeat=len(sigmas)):
+        # Points (level, strand), joined with a union find.
+        parent = list(range((len(sigmas) + 1) * strand_count))
+
+        def find(x: int) -> int:
+            while parent[x] != x:
+                x = parent[x]
+            return x
+
+        def union(x: int, y: int) -> None:
+            parent[find(x)] = find(y)
+
+        exponent = 0
+        for level, (sigma, horizontal) in enumerate(zip(sigmas, state)):
+            i = abs(sigma) - 1
+            top, bottom = level * strand_count, (level + 1) * strand_count
+            for strand in range(strand_count):
+                if not horizontal or strand not in (i, i + 1):
+                    union(top + strand, bottom + strand)
+            if horizontal:
+                union(top + i, top + i + 1)
+                union(bottom + i, bottom + i + 1)
+            exponent += (1 if sigma > 0 else -1) * (-1 if horizontal else 1)
+        for strand in range(strand_count):
+            union(strand, len(sigmas) * strand_count + strand)
+        loops = len({find(x) for x in range(len(parent))})
+        power = LaurentPolynomial(1)
+        for _ in range(loops - 1):
+            power *= DELTA
+        total += power.shift(exponent)
+    return total
+
+
+class TestJones:
+    @pytest.mark.parametrize("name", KNOWN)
+    def test_known_knots(self, name) -> None:
+        assert Braid(name).jones_polynomial() == LaurentPolynomial(KNOWN[name])
+        assert jones.knot_jones_polynomial(name) == LaurentPolynomial(KNOWN[name])
+
+    def test_mirror(self) -> None:
+        mirrored = jones.jones_polynomial([-1, -1, -1])
+        assert mirrored == LaurentPolynomial({-exponent: c for exponent, c in KNOWN["3_1"].items()})
+
+    def test_state_sum(self) -> None:
+        rng = np.random.default_rng(0)
+        for strand_count in range(1, 6):
+            for length in range(9):
+                sigmas = [int(s) for s in rng.integers(1, strand_count, length)] if strand_count > 1 else []
+                sigmas = [s if rng.random() < 0.5 else -s for s in sigmas]
+                expected = state_sum_bracket(sigmas, strand_count)
+                assert jones.kauffman_bracket(sigmas, strand_count) == expected
+
+    def test_links(self) -> None:
+        assert Braid([]).jones_polynomial() == LaurentPolynomial(1)
+        # Unlinks and the Hopf link
+        assert jones.kauffman_bracket([], strand_count=3) == DELTA * DELTA
+        # Two kinks of -A^3 each
+        assert jones.kauffman_bracket([1, 3], strand_count=5) == (DELTA * DELTA).shift(6)
+        assert jones.kauffman_bracket([1, 1]) == LaurentPolynomial({-4: -1, 4: -1})
+        with pytest.raises(ValueError):
+            jones.jones_polynomial([1, 1])
+        with pytest.raises(ValueError):
+            jones.jones_polynomial([1, 3], strand_count=3)
+        # Three components, integer exponents
+        assert jones.jones_polynomial([], strand_count=3) == LaurentPolynomial({-1: 1, 0: 2, 1: 1})
+
+    def test_notations(self) -> None:
+        table = knot_table()
+        for name in ("10_136", "11n_8", "12n_17"):
+            polynomials = [jones.jones_polynomial(table.notation(name, i)) for i in range(table.notation_count(name))]
+            assert len(set(polynomials)) == 1
+
+    def test_long_braids(self) -> None:
+        # 10 and 12 strand braids from the table, which need the window of open strands to be fast
+        value = jones.knot_jones_polynomial("13a_428")
+        assert value == LaurentPolynomial([1, -2, 5, -8, 11, -14, 16, -16, 15, -12, 9, -6, 3, -1], lowest=-1)
+        assert value(1) == 1
+        assert jones.knot_jones_polynomial("13a_3143")(1) == 1
+
+    def test_big_coefficients(self, monkeypatch) -> None:
+        monkeypatch.setattr(jones, "_INT64_LIMIT", 10.0)
+        sigmas = [int(s) for s in knot_table().notation("9_42")]
+        assert jones.kauffman_bracket(sigmas) == state_sum_bracket(sigmas, 4)
+
+    @pytest.mark.parametrize("braid_class", [braid.Braid, braid_vec.Braid])
+    def test_markov_invariance(self, braid_class) -> None:
+        rng = np.random.default_rng(0)
+        b = braid_class("8_19")
+        for _ in range(30):
+            moves = b.performable_moves()
+            b = moves[int(rng.integers(len(moves)))]()
+            assert b.jones_polynomial() == LaurentPolynomial(KNOWN["8_19"])
+
+    def test_windows(self) -> None:
+        windows = jones.windows([2, 1, 2, 3], 5)
+        assert windows[0] == jones.Window(0, 0, 0, 5)
+        assert windows[1] == jones.Window(1, 3, 0, 5)
+        # Strand 0 is closed after the last sigma 1
+        assert windows[2] == jones.Window(1, 3, 1, 5)
+        # Strands 1 and 2 too, strand 4 is never opened
+        assert windows[4] == jones.Window(3, 4, 3, 5)
+
+    def test_prefix_cache(self) -> None:
+        jones.clear_cache()
+        jones.kauffman_bracket([1, 2, 1, 2, -1, 2])
+        assert len(jones.prefix_cache) == 6
+        # Only the element of the whole word is new.
+        jones.kauffman_bracket([1, 2, 1, 2, -1, -2])
+        assert len(jones.prefix_cache) == 7
+        assert jones.prefix_cache.nbytes > 0
+
+        small = jones.PrefixCache(max_bytes=50)
+        element = jones.TemperleyLiebElement.identity(3)
+        small.put("a", element)
+        small.put("b", element)
+        assert small.get("a") is element
+        small.put("c", element)
+        assert small.get("b") is None and small.get("a") is element
+        assert small.nbytes <= 50
+
+    def test_cache(self) -> None:
+        jones.clear_cache()
+        Braid([1, 2, -1, 2]).jones_polynomial()
+        cached = len(jones.prefix_cache)
+        Braid([2, -1, 2, 1]).jones_polynomial()  # A rotation, nothing is computed
+        assert len(jones.prefix_cache) == cached
+
+    def test_consecutive_states_share_prefixes(self) -> None:
+        jones.clear_cache()
+        state = Braid([1, 2, -1, 2, 1, 3, 3])
+        state.jones_polynomial()
+        cached = len(jones.prefix_cache)
+        # The move keeps the first 4 sigmas, so only the 3 longer prefixes are new, although the least rotations of the
+        # states share a shorter prefix.
+        state.braid_relation2(4).jones_polynomial()
+        assert len(jones.prefix_cache) == cached + 3
+
+    def test_batch(self) -> None:
+        braids = [Braid("3_1"), Braid("4_1"), Braid([]), Braid("3_1").shift_left(1)]
+        batch = BraidBatch(braids, capacity=10)
+        assert batch.jones_polynomials() == [b.jones_polynomial() for b in braids]
@@ -0,0 +1,145 @@
+import multiprocessing
+import pickle
+import threading
+import pytest
+import numpy as np
+
+# IMPORTANT: knpy should be installed first
+from knpy import braid_vec, mcts
+from knpy.actions import action_space
+from knpy.braid import Braid
+from knpy.braid_batch import BraidBatch, Move
+
+# A trivial braid with 5 crossings, removing the sigma inverse pairs and destabilizing untangles it.
+TANGLED = Braid([1, -1, 2, 1, -2])
+
+
+def root_visits(search: mcts.MCTS, braid: Braid) -> int:
+    key = mcts.TranspositionTable.slot_hash([braid.canonical_rotation().key()])
+    return int(search.table.visits[search.table.find(key)[0]])
+
+
+def add_visits(table: mcts.TranspositionTable, hash_value: int) -> None:
+    with table.lock:
+        slot = table.insert(hash_value)
+        table.visits[slot] += 2
+    table.close()
+
+
+class TestTranspositionTable:
+    def test_insert_find(self) -> None:
+        table = mcts.TranspositionTable(4, 3)
+        # Colliding hashes are put in the next free slot.
+        assert table.insert(5) == 1 and table.insert(9) == 2 and table.insert(5) == 1
+        assert table.find(np.array([9, 5, 13], dtype=np.int64)).tolist() == [2, 1, -1]
+        table.insert(13)
+        table.insert(2)
+        assert len(table) == 4
+        with pytest.raises(RuntimeError):
+            table.insert(7)
+        table.clear()
+        assert len(table) == 0
+        with pytest.raises(ValueError):
+            mcts.TranspositionTable(6, 3)
+        with pytest.raises(TypeError):
+            pickle.dumps(table)
+
+    def test_shared(self) -> None:
+        table = mcts.TranspositionTable(8, 2, shared=True)
+        try:
+            process = multiprocessing.get_context("spawn").Process(target=add_visits, args=(table, 3))
+            process.start()
+            process.join()
+            assert process.exitcode == 0
+            slot = table.find(np.array([3], dtype=np.int64))[0]
+            assert slot >= 0 and table.visits[slot] == 2
+        finally:
+            table.close()
+
+
+class TestMCTS:
+    def test_search(self) -> None:
+        search = mcts.MCTS(max_len=12, max_strands=5)
+        result = search.search(TANGLED, simulations=200, batch_size=8)
+        assert result.braid == TANGLED.canonical_rotation()
+        assert result.visits.sum() <= 200 and root_visits(search, TANGLED) == 200
+        assert len(result.actions) == len(result.visits) == len(result.values)
+        moves, _, _ = search.action_space.decode(result.best_action())
+        assert moves in (Move.REMOVE_SIGMA_INVERSE_PAIR, Move.DESTABILIZATION)
+        assert result.values.max() > 4  # 5 crossings removed in a few steps
+        assert result.policy().sum() == pytest.approx(1)
+        # Another search continues from the same table.
+        assert search.search(TANGLED, simulations=10).visits.sum() > result.visits.sum()
+
+    def test_braid_vec(self) -> None:
+        search = mcts.MCTS(max_len=12, max_strands=5)
+        result = search.search(braid_vec.Braid(TANGLED.notation()), simulations=20)
+        assert result.braid == TANGLED.canonical_rotation() and root_visits(search, TANGLED) == 20
+
+    def test_full_table(self) -> None:
+        table = mcts.TranspositionTable(64, action_space(12, 5).size)
+        search = mcts.MCTS(max_len=12, max_strands=5, table=table, virtual_loss=1e9)
+        braid = Braid([1, 2, 1, 2, -3, 2, -1, 3])
+        result = search.search(braid, simulations=400, batch_size=8)
+        assert len(table) == 64 and root_visits(search, braid) == 400
+        assert result.visits.sum() <= 400
+        # Every virtual loss was taken back.
+        assert np.all(np.abs(table.value_sums) < 1e6)
+        with pytest.raises(RuntimeError):
+            search.search(TANGLED, simulations=8)
+
+    def test_rotations_share_nodes(self) -> None:
+        search = mcts.MCTS(max_len=12, max_strands=5)
+        search.search(TANGLED, simulations=50)
+        size = len(search.table)
+        assert search.result(TANGLED.shift_left(2)).visits.sum() == search.result(TANGLED).visits.sum()
+        assert len(search.table) == size
+
+    def test_batched_evaluation(self) -> None:
+        calls = []
+
+        def evaluator(leaves: BraidBatch, masks: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+            calls.append(len(leaves))
+            assert masks.shape == (len(leaves), action_space(12, 5).size)
+            assert np.array_equal(masks, action_space(12, 5).batch_masks(leaves))
+            return mcts.uniform_evaluator(leaves, masks)
+
+        search = mcts.MCTS(max_len=12, max_strands=5, evaluator=evaluator)
+        search.search(TANGLED, simulations=64, batch_size=16)
+        assert len(calls) <= 4 and calls[0] == 1
+        assert all(size <= 16 for size in calls)
+
+    def test_priors(self) -> None:
+        # All the prior on the first legal action
+        def evaluator(leaves: BraidBatch, masks: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+            priors = np.zeros(masks.shape, dtype=np.float32)
+            priors[np.arange(len(masks)), np.argmax(masks, axis=1)] = 1
+            return priors, np.zeros(len(masks))
+
+        search = mcts.MCTS(max_len=12, max_strands=5, evaluator=evaluator, c_puct=100)
+        result = search.search(Braid([1, 2, 3]), simulations=20, batch_size=1)
+        assert result.best_action() == result.actions[0]
+
+    def test_terminal(self) -> None:
+        search = mcts.MCTS(max_len=8, max_strands=4)
+        result = search.search(Braid([]), simulations=10)
+        assert len(result.actions) == 0 and result.best_action() == -1
+        with pytest.raises(ValueError):
+            search.search(Braid([1, 2, 3, 4]))
+
+    def test_threads(self) -> None:
+        search = mcts.MCTS(max_len=12, max_strands=5)
+        threads = [threading.Thread(target=search.search, args=(TANGLED, 60, 4)) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert root_visits(search, TANGLED) == 180
+        # Every virtual loss was removed again
+        assert search.result(TANGLED).values.max() > 4
+
+    def test_parallel_search(self) -> None:
+        result = mcts.parallel_search(TANGLED, simulations=100, processes=2, batch_size=4, max_len=12, max_strands=5)
+        assert result.visits.sum() <= 100
+        moves, _, _ = action_space(12, 5).decode(result.best_action())
+        assert moves in (Move.REMOVE_SIGMA_INVERSE_PAIR, Move.DESTABILIZATION)
@@ -0,0 +1,117 @@
+import tracemalloc
+import pytest
+import numpy as np
+
+# IMPORTANT: knpy should be installed first
+from knpy.braid import Braid
+from knpy.mutable import MutableBraid
+from knpy.actions import ActionSpace
+from knpy import IllegalTransformationException, IndexOutOfRangeException
+
+
+def assert_same_braid(braid: MutableBraid, reference: Braid) -> None:
+    assert np.array_equal(braid.notation(), reference.notation())
+    assert braid.strand_count == reference.strand_count
+    assert np.array_equal(braid.destabilization_performable_indices(), reference.destabilization_performable_indices())
+    for index in range(-len(braid), len(braid)):
+        assert braid.is_braid_relation1_performable(index) == reference.is_braid_relation1_performable(index)
+        assert braid.is_braid_relation2_performable(index) == reference.is_braid_relation2_performable(index)
+        assert braid.is_remove_sigma_inverse_pair_performable(index) == (
+            reference.is_remove_sigma_inverse_pair_performable(index)
+        )
+        assert braid.is_destabilization_performable(index) == reference.is_destabilization_performable(index)
+
+
+class TestMutableBraid:
+    def test_init(self) -> None:
+        braid = MutableBraid("10_136")
+        assert braid.to_braid() == Braid("10_136")
+        assert braid.capacity == 2 * len(braid)
+        assert MutableBraid(Braid([1, -3])).strand_count == 4
+        assert MutableBraid([], capacity=0).strand_count == 1
+        with pytest.raises(ValueError):
+            MutableBraid([1, 2, 3], capacity=2)
+
+    def test_moves_are_in_place(self) -> None:
+        braid = MutableBraid([1, 2, 1, -3])
+        copy = braid.copy()
+        assert braid.braid_relation1(0) is None
+        assert np.array_equal(braid.notation(), Braid([1, 2, 1, -3]).braid_relation1(0).notation())
+        assert copy.to_braid() == Braid([1, 2, 1, -3])
+        assert braid != copy
+
+    def test_exceptions(self) -> None:
+        braid = MutableBraid([1, 2, 3])
+        with pytest.raises(IllegalTransformationException):
+            braid.braid_relation1(0)
+        with pytest.raises(IndexOutOfRangeException):
+            braid.is_braid_relation2_performable(3)
+        with pytest.raises(IndexOutOfRangeException):
+            braid.remove_sigma_inverse_pair(-4)
+        with pytest.raises(IllegalTransformationException):
+            braid.shift_left(3)
+        with pytest.raises(ValueError):
+            braid.conjugation(4, 0)
+        with pytest.raises(IllegalTransformationException):
+            braid.destabilization(1)
+        assert braid.to_braid() == Braid([1, 2, 3])
+
+    def test_grows_past_capacity(self) -> None:
+        braid = MutableBraid([1], capacity=1)
+        reference = Braid([1])
+        for i in range(20):
+            index, on_top, inverse = i % (len(reference) + 1), i % 3 == 0, i % 2 == 0
+            braid.stabilization(index=index, on_top=on_top, inverse=inverse)
+            reference = reference.stabilization(index=index, on_top=on_top, inverse=inverse)
+            assert_same_braid(braid, reference)
+        assert braid.capacity >= 21
+
+    def test_no_allocation_per_move(self) -> None:
+        braid = MutableBraid(np.tile([1, 2, -1, 3], 2500), capacity=20000)
+        tracemalloc.start()
+        for index in range(100):
+            braid.stabilization(index=index, on_top=True)
+            braid.destabilization(index)
+            braid.conjugation(1, index)
+            braid.remove_sigma_inverse_pair(index)
+            braid.shift_left(7)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        # A copy of the sigmas would take 40000 bytes.
+        assert peak < 10000
+        assert len(braid) == 10000
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_random_walk(self, seed) -> None:
+        rng = np.random.default_rng(seed)
+        braid = MutableBraid("8_19", capacity=8)
+        reference = Braid("8_19")
+        for _ in range(60):
+            moves = reference.performable_moves()
+            # Prefer moves that keep the braid small, so every kind of move is performed.
+            choice = int(rng.integers(len(moves)))
+            if len(reference) > 12:
+                shrinking = [i for i, move in enumerate(moves) if len(move()) < len(reference)]
+                choice = shrinking[int(rng.integers(len(shrinking)))] if shrinking else choice
+            move = moves[choice]
+            getattr(braid, move.func.__name__)(*move.args, **move.keywords)
+            reference = move()
+            assert_same_braid(braid, reference)
+            if len(reference) > 0 and rng.random() < 0.2:
+                amount = int(rng.integers(-len(reference) + 1, len(reference)))
+                braid.shift_left(amount)
+                reference = reference.shift_left(amount)
+                assert_same_braid(braid, reference)
+
+    def test_actions(self) -> None:
+        space = ActionSpace(12, 6)
+        braid = MutableBraid([1, 2, -1, 3])
+        reference = Braid([1, 2, -1, 3])
+        rng = np.random.default_rng(0)
+        for _ in range(30):
+            mask = braid.legal_action_mask(12, 6)
+            assert np.array_equal(mask, reference.legal_action_mask(12, 6))
+            action = int(rng.choice(np.flatnonzero(mask)))
+            braid.apply_action(action, 12, 6)
+            reference = space.apply(reference, action)
+            assert np.array_equal(braid.notation(), reference.notation())
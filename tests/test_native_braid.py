@@ -0,0 +1,86 @@
+import pickle
+import pytest
+import numpy as np
+
+# IMPORTANT: knpy should be installed first
+from knpy import IllegalTransformationException
+from knpy import braid_vec
+from knpy.braid_batch import Move
+
+B = pytest.importorskip("knpy.braid_cpp_impl")
+
+
+def random_braids(seed: int, count: int) -> list[list[int]]:
+    rng = np.random.default_rng(seed)
+    return [(rng.integers(1, 5, int(n)) * rng.choice([-1, 1], int(n))).tolist() for n in rng.integers(0, 9, count)]
+
+
+def as_list(braid) -> list[int]:
+    return braid.notation().tolist()
+
+
+class TestNativeBraid:
+    def test_init(self) -> None:
+        b = B.NativeBraid([1, -3, 2])
+        assert len(b) == 3 and b.strand_count == 4
+        assert b.notation().dtype == np.int16 and as_list(b) == [1, -3, 2]
+        assert B.NativeBraid(np.array([2, -1], dtype=np.int64)) == B.NativeBraid([2, -1])
+        assert B.NativeBraid([]).strand_count == 1
+        assert repr(b) == "NativeBraid([1, -3, 2])"
+        with pytest.raises(ValueError):
+            B.NativeBraid([1, 0])
+        with pytest.raises(ValueError):
+            B.NativeBraid(np.ones((2, 2), dtype=np.int32))
+
+    def test_moves_match_braid_vec(self) -> None:
+        for word in random_braids(0, 200):
+            native, reference = B.NativeBraid(word), braid_vec.Braid(word)
+            for i in range(len(word)):
+                assert as_list(native.shift_left(i)) == as_list(reference.shift_left(i))
+                assert as_list(native.shift_right(i)) == as_list(reference.shift_right(i))
+            for i in range(len(word) + 1):
+                for on_top in (False, True):
+                    for inverse in (False, True):
+                        expected = reference.stabilization(index=i, on_top=on_top, inverse=inverse)
+                        assert as_list(native.stabilization(i, on_top, inverse)) == as_list(expected)
+            for name in (
+                "braid_relation1_performable_indices",
+                "braid_relation2_performable_indices",
+                "destabilization_performable_indices",
+                "remove_sigma_inverse_pair_performable_indices",
+            ):
+                indices = getattr(native, name)()
+                assert indices.tolist() == getattr(reference, name)().tolist()
+                move = name[: -len("_performable_indices")]
+                for i in indices.tolist():
+                    assert getattr(native, f"is_{move}_performable")(i)
+                    assert as_list(getattr(native, move)(i)) == as_list(getattr(reference, move)(i))
+            assert as_list(native.free_reduce()) == as_list(reference.free_reduce())
+            assert as_list(native.simplify_greedy()) == as_list(reference.simplify_greedy())
+            assert as_list(native.canonical_rotation()) == as_list(reference.canonical_rotation())
+
+    def test_performable_moves(self) -> None:
+        for word in random_braids(1, 50):
+            native, reference = B.NativeBraid(word), braid_vec.Braid(word)
+            moves = native.performable_moves()
+            assert moves.shape == (len(reference.performable_moves()), 3)
+            results = [as_list(native.apply(*row)) for row in moves.tolist()]
+            assert results == [as_list(move()) for move in reference.performable_moves()]
+            assert set(moves[:, 0].tolist()) <= set(int(move) for move in Move)
+
+    def test_illegal_moves(self) -> None:
+        b = B.NativeBraid([1, 2])
+        with pytest.raises(IllegalTransformationException):
+            b.braid_relation2(0)
+        with pytest.raises(IllegalTransformationException):
+            b.conjugation(3, 0)
+        with pytest.raises(IllegalTransformationException):
+            B.NativeBraid([]).shift_left(0)
+        assert not b.is_braid_relation1_performable(5) and not b.is_destabilization_performable(-1)
+
+    def test_hash_and_pickle(self) -> None:
+        b = B.NativeBraid([1, -2, 3])
+        assert b == B.NativeBraid([1, -2, 3]) and b != B.NativeBraid([1, -2]) and b != [1, -2, 3]
+        assert hash(b) == hash(B.NativeBraid([1, -2, 3]))
+        assert len({b, B.NativeBraid([1, -2, 3]), B.NativeBraid([3])}) == 2
+        assert pickle.loads(pickle.dumps(b)) == b
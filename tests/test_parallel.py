@@ -0,0 +1,50 @@
+import os
+import numpy as np
+
+# IMPORTANT: knpy should be installed first
+import knpy
+from knpy import braid_vec
+from knpy.braid import Braid
+from knpy.braid_batch import BraidBatch
+
+
+def simplified_notation(b: Braid) -> list[int]:
+    return b.simplify_greedy().notation().tolist()
+
+
+def worker_pid(_: Braid) -> int:
+    return os.getpid()
+
+
+def random_words(count: int) -> list[list[int]]:
+    rng = np.random.default_rng(0)
+    return [(rng.integers(1, 5, int(n)) * rng.choice([-1, 1], int(n))).tolist() for n in rng.integers(0, 12, count)]
+
+
+class TestParallelMap:
+    def test_in_order(self) -> None:
+        words = random_words(300)
+        expected = [simplified_notation(Braid(word)) for word in words]
+        assert list(knpy.parallel.map(simplified_notation, words, workers=2, chunksize=16)) == expected
+        assert list(knpy.parallel.map(simplified_notation, words, workers=1)) == expected
+        batch = BraidBatch(words, capacity=16)
+        assert list(knpy.parallel.map(simplified_notation, batch, workers=2, chunksize=50)) == expected
+
+    def test_workers(self) -> None:
+        pids = set(knpy.parallel.map(worker_pid, [[1]] * 40, workers=2, chunksize=4))
+        assert os.getpid() not in pids and 1 <= len(pids) <= 2
+        # Few braids are mapped in this process
+        assert set(knpy.parallel.map(worker_pid, [[1]] * 3, workers=2, chunksize=4)) == {os.getpid()}
+
+    def test_knot_names(self) -> None:
+        names = ["3_1", "4_1", "5_2"] * 4
+        results = list(knpy.parallel.map(Braid.jones_polynomial, names, workers=2, chunksize=3))
+        assert results == [Braid(name).jones_polynomial() for name in names]
+
+    def test_braid_class(self) -> None:
+        results = knpy.parallel.map(type, [[1, 2]] * 10, workers=2, chunksize=2, braid_class=braid_vec.Braid)
+        assert set(results) == {braid_vec.Braid}
+
+    def test_empty(self) -> None:
+        assert list(knpy.parallel.map(len, [], workers=2)) == []
+        assert list(knpy.parallel.map(len, [[]] * 10, workers=2, chunksize=2)) == [0] * 10
@@ -0,0 +1,52 @@
+import pickle
+import pytest
+
+# IMPORTANT: knpy should be installed first
+from knpy.polynomial import LaurentPolynomial
+
+
+class TestLaurentPolynomial:
+    def test_init(self) -> None:
+        assert LaurentPolynomial([1, 0, -2], lowest=-1).terms == {-1: 1, 1: -2}
+        assert LaurentPolynomial({0: 3, 2: 0}) == LaurentPolynomial(3)
+        assert not LaurentPolynomial()
+        assert LaurentPolynomial([0, 1, 2]).coefficients() == [1, 2]
+        assert (LaurentPolynomial().lowest, LaurentPolynomial().highest) == (0, 0)
+
+    def test_arithmetic(self) -> None:
+        t = LaurentPolynomial({1: 1})
+        one = LaurentPolynomial(1)
+        assert (one - t) * (one + t) == one - t * t
+        assert t.shift(-1) == one
+        assert 2 * t - t == t
+        assert 1 - t == -(t - 1)
+        assert (t + one) * (t.shift(-3) - 1) == LaurentPolynomial({-2: 1, -1: 1, 0: -1, 1: -1})
+
+    def test_exact_divide(self) -> None:
+        t = LaurentPolynomial({1: 1})
+        one = LaurentPolynomial(1)
+        product = (one - t + t * t) * (one + t).shift(-2)
+        assert product.exact_divide(one + t) == (one - t + t * t).shift(-2)
+        with pytest.raises(ValueError):
+            (one + t * t).exact_divide(one + t)
+        with pytest.raises(ValueError):
+            (one + t).exact_divide(LaurentPolynomial(2))
+        with pytest.raises(ZeroDivisionError):
+            one.exact_divide(LaurentPolynomial())
+
+    def test_evaluate(self) -> None:
+        p = LaurentPolynomial({-1: 2, 0: 1, 2: -1})
+        assert p(2.0) == pytest.approx(1 + 1 - 4)
+        assert LaurentPolynomial()(3) == 0
+
+    def test_str(self) -> None:
+        assert str(LaurentPolynomial([1, -3, 1])) == "1-3*t+t^2"
+        assert str(LaurentPolynomial({-2: -1, 1: 2})) == "-t^(-2)+2*t"
+        assert str(LaurentPolynomial()) == "0"
+        assert repr(LaurentPolynomial([1, -1])) == "LaurentPolynomial({0: 1, 1: -1})"
+
+    def test_hash_and_pickle(self) -> None:
+        p = LaurentPolynomial({-1: 2, 3: -5})
+        assert hash(p) == hash(LaurentPolynomial({3: -5, -1: 2}))
+        assert len({p, LaurentPolynomial({-1: 2, 3: -5}), LaurentPolynomial(1)}) == 2
+        assert pickle.loads(pickle.dumps(p)) == p
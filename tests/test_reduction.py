@@ -0,0 +1,99 @@
+import pytest
+import numpy as np
+
+# IMPORTANT: knpy should be installed first
+from knpy import braid, braid_vec
+from knpy.braid import Braid, SIGMA_DTYPE
+from knpy.braid_batch import BraidBatch
+from knpy.reduction import batch_simplify, free_reduce, simplify_greedy
+
+
+def random_words(rng: np.random.Generator, count: int, strand_count: int) -> list[list[int]]:
+    words = []
+    for _ in range(count):
+        length = int(rng.integers(0, 16))
+        words.append((rng.integers(1, strand_count, length) * rng.choice([-1, 1], length)).tolist())
+    return words
+
+
+def remove_pairs_one_by_one(b: Braid) -> Braid:
+    while len(indices := b.remove_sigma_inverse_pair_performable_indices()) > 0:
+        b = b.remove_sigma_inverse_pair(int(indices[0]))
+    return b
+
+
+def simplify_one_by_one(b: Braid) -> Braid:
+    while True:
+        b = remove_pairs_one_by_one(b)
+        indices = b.destabilization_performable_indices()
+        if len(indices) == 0:
+            return b
+        # On top first
+        top = [int(i) for i in indices if abs(b.notation()[i]) == 1]
+        b = b.destabilization(top[0] if top else int(indices[0]))
+
+
+class TestReduction:
+    def test_free_reduce(self) -> None:
+        assert free_reduce([1, -1, 2]) == [2]
+        assert free_reduce([1, 2, -2, -1]) == []
+        # The last and first sigma are neighbours
+        assert free_reduce([1, 2, -1]) == [2]
+        assert free_reduce([-1, 2, -1, 1]) == [-1, 2]
+        assert free_reduce([1, -2]) == [1, -2]
+        assert free_reduce([]) == []
+
+    def test_free_reduce_matches_moves(self) -> None:
+        rng = np.random.default_rng(0)
+        for word in random_words(rng, 200, 4):
+            expected = remove_pairs_one_by_one(Braid(word))
+            reduced = Braid(free_reduce(word))
+            assert len(reduced.remove_sigma_inverse_pair_performable_indices()) == 0
+            assert reduced.canonical_rotation() == expected.canonical_rotation()
+
+    def test_simplify_greedy(self) -> None:
+        assert simplify_greedy([1]) == []
+        assert simplify_greedy([1, 1, 1, 2]) == [1, 1, 1]
+        assert simplify_greedy([2, 3]) == []
+        assert simplify_greedy([1, 2, -1, 3, 1]) == []
+        assert simplify_greedy([1, 1, 1]) == [1, 1, 1]
+        rng = np.random.default_rng(1)
+        for word in random_words(rng, 200, 5):
+            expected = simplify_one_by_one(Braid(word))
+            assert simplify_greedy(word) == expected.notation().tolist()
+
+    @pytest.mark.parametrize("braid_class", [braid.Braid, braid_vec.Braid])
+    def test_braid_methods(self, braid_class) -> None:
+        rng = np.random.default_rng(2)
+        for word in random_words(rng, 100, 6):
+            b = braid_class(word)
+            assert b.free_reduce().notation().tolist() == free_reduce(word)
+            assert b.simplify_greedy().notation().tolist() == simplify_greedy(word)
+        noisy = braid_class("5_2").stabilization(index=2).conjugation(3, 4).stabilization(index=0, on_top=True)
+        simplified = noisy.simplify_greedy()
+        assert simplified.strand_count == 3
+        assert simplified.jones_polynomial() == braid_class("5_2").jones_polynomial()
+
+    def test_batch(self) -> None:
+        rng = np.random.default_rng(3)
+        words = random_words(rng, 300, 6)
+        batch = BraidBatch(words, capacity=20)
+        for destabilize, simplify in ((False, free_reduce), (True, simplify_greedy)):
+            sigmas, lengths = batch_simplify(batch.sigmas, batch.lengths, destabilize)
+            assert sigmas.shape == (300, 20)
+            for row, word in enumerate(words):
+                assert sigmas[row, : lengths[row]].tolist() == simplify(word)
+                assert not np.any(sigmas[row, lengths[row] :])
+        assert batch.simplify_greedy() == BraidBatch([simplify_greedy(word) for word in words])
+        assert batch.free_reduce() == BraidBatch([free_reduce(word) for word in words])
+
+    def test_cpp_kernel_matches_numpy(self) -> None:
+        B = pytest.importorskip("knpy.braid_cpp_impl")
+        rng = np.random.default_rng(4)
+        batch = BraidBatch(random_words(rng, 300, 7))
+        for destabilize in (False, True):
+            expected = batch_simplify(batch.sigmas, batch.lengths, destabilize)
+            sigmas, lengths = B.simplify_batch(batch.sigmas, batch.lengths, destabilize)
+            assert np.array_equal(sigmas, expected[0]) and np.array_equal(lengths, expected[1])
+        empty = np.zeros((2, 0), dtype=SIGMA_DTYPE)
+        assert B.simplify_batch(empty, np.zeros(2, dtype=np.int64))[1].tolist() == [0, 0]
@@ -0,0 +1,75 @@
+import pytest
+import numpy as np
+
+# IMPORTANT: knpy should be installed first
+from knpy import braid, braid_vec
+from knpy.braid import SIGMA_DTYPE
+from knpy.braid_batch import BraidBatch
+from knpy.rotation import least_rotation, batch_least_rotations
+
+
+def least_rotation_reference(sigmas: list[int]) -> int:
+    rotations = [sigmas[k:] + sigmas[:k] for k in range(len(sigmas))]
+    return min(range(len(sigmas)), key=lambda k: rotations[k]) if sigmas else 0
+
+
+def random_words(rng: np.random.Generator, count: int) -> list[list[int]]:
+    words = []
+    for _ in range(count):
+        length = int(rng.integers(0, 12))
+        word = (rng.integers(1, 3, length) * rng.choice([-1, 1], length)).tolist()
+        if rng.random() < 0.3:
+            word = word[: max(1, length // 3)] * 3  # Periodic words have several least rotations.
+        words.append(word)
+    return words
+
+
+def padded(words: list[list[int]]) -> tuple[np.ndarray, np.ndarray]:
+    lengths = np.array([len(word) for word in words], dtype=np.int64)
+    sigmas = np.zeros((len(words), int(lengths.max(initial=0))), dtype=SIGMA_DTYPE)
+    for row, word in enumerate(words):
+        sigmas[row, : len(word)] = word
+    return sigmas, lengths
+
+
+class TestLeastRotation:
+    def test_least_rotation(self) -> None:
+        assert least_rotation([]) == 0
+        assert least_rotation([2, 1, 3]) == 1
+        assert least_rotation([1, 2, 1, 2]) == 0
+        assert least_rotation([-1, 2, -3, 1]) == 2
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_matches_reference(self, seed) -> None:
+        words = random_words(np.random.default_rng(seed), 500)
+        expected = [least_rotation_reference(word) for word in words]
+        assert [least_rotation(word) for word in words] == expected
+        assert batch_least_rotations(*padded(words)).tolist() == expected
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_cpp_matches_python(self, seed) -> None:
+        B = pytest.importorskip("knpy.braid_cpp_impl")
+        words = random_words(np.random.default_rng(seed), 500)
+        sigmas, lengths = padded(words)
+        assert B.least_rotations_batch(sigmas, lengths).tolist() == [least_rotation(word) for word in words]
+        assert [B.least_rotation(np.array(word, dtype=SIGMA_DTYPE)) for word in words] == [
+            least_rotation(word) for word in words
+        ]
+
+
+@pytest.mark.parametrize("Braid", [braid.Braid, braid_vec.Braid])
+class TestCanonicalRotation:
+    def test_canonical_rotation(self, Braid) -> None:
+        assert Braid([2, -1, 3]).canonical_rotation() == Braid([-1, 3, 2])
+        assert Braid([]).canonical_rotation() == Braid([])
+
+    def test_rotations_have_the_same_key(self, Braid) -> None:
+        knot = Braid("10_136")
+        keys = {knot.shift_left(amount).canonical_rotation().key() for amount in range(len(knot))}
+        assert keys == {knot.canonical_rotation().key()}
+
+    def test_batch_canonical_rotations(self, Braid) -> None:
+        braids = [Braid([2, -1, 3]), Braid([]), Braid("4_1"), Braid([3, 1, 2])]
+        rotated, amounts = BraidBatch([b.notation() for b in braids]).canonical_rotations()
+        assert rotated.keys() == [b.canonical_rotation().key() for b in braids]
+        assert amounts.tolist() == [1, 0, 1, 1]
@@ -0,0 +1,67 @@
+import pytest
+import numpy as np
+
+# IMPORTANT: knpy should be installed first
+from knpy import scramble
+from knpy.actions import action_space
+from knpy.braid import Braid
+from knpy.braid_batch import BraidBatch, Move
+from knpy.data_utils import knot_table
+
+
+class TestScramble:
+    def test_random_actions(self) -> None:
+        space = action_space(12, 5)
+        batch = BraidBatch(["3_1", "4_1", [1, -1], [1, 2, 3, 4]], capacity=12)
+        masks = space.batch_masks(batch)
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            actions = scramble.random_actions(space, masks, rng)
+            assert np.all(masks[np.arange(4), actions])
+        only = scramble.random_actions(space, masks, rng, {Move.REMOVE_SIGMA_INVERSE_PAIR: 1.0})
+        moves, _, _ = space.decode(only[2])
+        assert moves == Move.REMOVE_SIGMA_INVERSE_PAIR
+        assert only[[0, 1, 3]].tolist() == [-1, -1, -1]
+
+    def test_move_weights(self) -> None:
+        space = action_space(32, 8)
+        masks = space.batch_masks(BraidBatch(["5_2"] * 2000, capacity=32))
+        weights = {Move.CONJUGATION: 3, Move.STABILIZATION: 1}
+        actions = scramble.random_actions(space, masks, np.random.default_rng(1), weights)
+        moves, _, _ = space.decode(actions)
+        share = np.mean(moves == Move.CONJUGATION)
+        assert 0.7 < share < 0.8
+        assert np.all((moves == Move.CONJUGATION) | (moves == Move.STABILIZATION))
+
+    def test_bounds_and_knots(self) -> None:
+        result = scramble.random_scrambles(300, moves=15, max_len=16, max_strands=6, seed=0)
+        assert result.sigmas.shape == (300, 16)
+        assert np.all(result.lengths <= 16)
+        assert np.all(result.batch().strand_counts <= 6)
+        columns = np.arange(16)[None, :]
+        assert np.all((result.sigmas != 0) == (columns < result.lengths[:, None]))
+        # Markov moves keep the knot
+        for row in range(5):
+            name = str(result.names()[row])
+            assert result.batch()[row].jones_polynomial() == Braid(name).jones_polynomial()
+
+    def test_moves(self) -> None:
+        knots = ["3_1", "5_2"]
+        plain = scramble.random_scrambles(50, moves=0, knots=knots, seed=1)
+        table = knot_table()
+        for row, name in enumerate(plain.names()):
+            assert plain.sigmas[row, : plain.lengths[row]].tolist() == table.notation(str(name)).tolist()
+        conjugated = scramble.random_scrambles(50, moves=3, knots=knots, move_weights={Move.CONJUGATION: 1}, seed=1)
+        assert np.array_equal(conjugated.knot_ids, plain.knot_ids)
+        assert np.array_equal(conjugated.lengths, plain.lengths + 6)
+        with pytest.raises(ValueError):
+            scramble.random_scrambles(10, max_len=2)
+
+    def test_reproducible(self) -> None:
+        first = scramble.random_scrambles(1000, moves=5, seed=7, chunk_size=300)
+        second = scramble.random_scrambles(1000, moves=5, seed=7, chunk_size=300, processes=2)
+        for column, other in zip(first, second):
+            assert np.array_equal(column, other)
+        third = scramble.random_scrambles(1000, moves=5, seed=8, chunk_size=300)
+        assert not np.array_equal(first.sigmas, third.sigmas)
+        assert len(scramble.random_scrambles(0, seed=7).lengths) == 0
@@ -0,0 +1,102 @@
+import pytest
+import numpy as np
+
+# IMPORTANT: knpy should be installed first
+from knpy import braid_vec, search
+from knpy.braid import Braid
+from knpy.data_utils import benchmark_table
+
+
+def reducing_moves(b: Braid) -> set[Braid]:
+    """
+    Least rotations of the braids one search move away from b, with the member functions of `Braid`.
+    """
+    results = [b.remove_sigma_inverse_pair(i) for i in b.remove_sigma_inverse_pair_performable_indices()]
+    results += [b.destabilization(i) for i in b.destabilization_performable_indices()]
+    results += [b.braid_relation1(i) for i in b.braid_relation1_performable_indices()]
+    results += [b.braid_relation2(i) for i in b.braid_relation2_performable_indices()]
+    return {result.canonical_rotation() for result in results}
+
+
+def reachable(b: Braid) -> set[Braid]:
+    seen, stack = {b.canonical_rotation()}, [b.canonical_rotation()]
+    while stack:
+        for neighbour in reducing_moves(stack.pop()):
+            if neighbour not in seen:
+                seen.add(neighbour)
+                stack.append(neighbour)
+    return seen
+
+
+def check_path(result: search.SearchResult, start: Braid) -> None:
+    assert result.path[0] == start.canonical_rotation()
+    assert result.path[-1] is result.braid
+    for previous, current in zip(result.path, result.path[1:]):
+        assert current in reducing_moves(previous)
+
+
+# The trefoil with a stabilization and a conjugation
+NOISY_TREFOIL = Braid("3_1").stabilization(index=1).conjugation(2, 2)
+
+
+class TestSearch:
+    @pytest.mark.parametrize("method", [search.bfs, search.beam_search, search.astar])
+    def test_trefoil(self, method) -> None:
+        result = method(NOISY_TREFOIL)
+        assert result.braid == Braid([1, 1, 1])
+        assert len(result.path) == 3
+        check_path(result, NOISY_TREFOIL)
+
+    def test_exhaustive(self) -> None:
+        rng = np.random.default_rng(0)
+        for _ in range(10):
+            length = int(rng.integers(0, 8))
+            start = Braid((rng.integers(1, 4, length) * rng.choice([-1, 1], length)).tolist())
+            states = reachable(start)
+            result = search.bfs(start, batch_size=3, target_length=-1)
+            assert result.exhausted
+            assert result.visited == len(states) == result.expanded
+            shortest = min(states, key=lambda b: (len(b), b.strand_count))
+            assert (len(result.braid), result.braid.strand_count) == (len(shortest), shortest.strand_count)
+            check_path(result, start)
+
+    def test_limits(self) -> None:
+        start = Braid([1, 3, 5, 7, 1, 3, 5, 7])
+        result = search.bfs(start, max_states=10, batch_size=1)
+        assert not result.exhausted
+        assert result.visited <= 10 + 8
+        result = search.astar(start, max_expansions=3, batch_size=1)
+        assert result.expanded == 3 and not result.exhausted
+        # The beam is pruned, so the search is not exhaustive even if it runs out of states.
+        assert not search.beam_search(start, beam_width=1).exhausted
+        # Already short enough
+        result = search.beam_search(NOISY_TREFOIL, target_length=6)
+        assert result.expanded == 0 and result.path == [NOISY_TREFOIL.canonical_rotation()]
+
+    def test_heuristic(self) -> None:
+        assert search.heuristic(np.array([3, 0]), np.array([2, 1])).tolist() == [5, 1]
+
+    def test_benchmark_braid(self) -> None:
+        table = benchmark_table()
+        start = Braid(table.notation("1_64", 0))
+        result = search.beam_search(start, beam_width=16, patience=8)
+        assert len(result.braid) < len(start)
+        check_path(result, start)
+
+    def test_simplify_many(self) -> None:
+        braids = [NOISY_TREFOIL, Braid([1, -1]), [2, 1, 2, -1, -2, -1], "4_1"]
+        expected = [search.beam_search(b) for b in braids]
+        for processes in (1, 2):
+            results = search.simplify_many(braids, processes=processes)
+            assert [r.braid for r in results] == [r.braid for r in expected]
+            assert [r.path for r in results] == [r.path for r in expected]
+        results = search.simplify_many(braids, method="astar", processes=2, batch_size=1)
+        assert [len(r.braid) for r in results] == [3, 0, 0, 4]
+        with pytest.raises(ValueError):
+            search.simplify_many(braids, method="dfs")
+
+    def test_braid_vec(self) -> None:
+        start = braid_vec.Braid([1, 1, 1, -2, 2])
+        result = search.bfs(start)
+        assert result.braid == Braid([1, 1, 1]) and len(result.path) == 2
+        assert [r.braid for r in search.simplify_many([start, NOISY_TREFOIL], processes=1)] == [result.braid] * 2
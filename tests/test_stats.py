@@ -0,0 +1,123 @@
+import pytest
+import numpy as np
+
+# IMPORTANT: knpy should be installed first
+from knpy import braid, braid_vec
+from knpy.braid import SIGMA_DTYPE
+from knpy.braid_batch import BraidBatch
+from knpy.stats import BatchStats, batch_stats, braid_stats, cycle_counts
+
+
+def random_words(rng: np.random.Generator, count: int, strand_count: int) -> list[list[int]]:
+    words = []
+    for _ in range(count):
+        length = int(rng.integers(0, 15))
+        words.append((rng.integers(1, strand_count, length) * rng.choice([-1, 1], length)).tolist())
+    return words
+
+
+def reference_stats(word: list[int], strand_count: int) -> tuple[int, list[int], int, np.ndarray]:
+    """
+    Follows every strand through the crossings.
+    """
+    permutation = []
+    for start in range(strand_count):
+        position = start
+        for sigma in word:
+            if position == abs(sigma) - 1:
+                position += 1
+            elif position == abs(sigma):
+                position -= 1
+        permutation.append(position)
+    cycles, seen = 0, set()
+    for start in range(strand_count):
+        if start not in seen:
+            cycles += 1
+            while start not in seen:
+                seen.add(start)
+                start = permutation[start]
+    counts = np.zeros((strand_count - 1, 2), dtype=np.int64)
+    for sigma in word:
+        counts[abs(sigma) - 1, int(sigma < 0)] += 1
+    return sum(1 if sigma > 0 else -1 for sigma in word), permutation, cycles, counts
+
+
+class TestStats:
+    def test_braid_stats(self) -> None:
+        stats = braid_stats([1, 2, -1, 3])
+        assert stats.writhe == 2
+        assert stats.permutation.tolist() == [3, 1, 0, 2]
+        assert stats.component_count == 2
+        assert stats.generator_counts.tolist() == [[1, 1], [1, 0], [1, 0]]
+
+        empty = braid_stats([], strand_count=3)
+        assert (empty.writhe, empty.permutation.tolist(), empty.component_count) == (0, [0, 1, 2], 3)
+        with pytest.raises(ValueError):
+            braid_stats([3], strand_count=3)
+
+    def test_random_words(self) -> None:
+        rng = np.random.default_rng(0)
+        for word in random_words(rng, 100, 5):
+            writhe, permutation, cycles, counts = reference_stats(word, 5)
+            stats = braid_stats(word, 5)
+            assert stats.writhe == writhe
+            assert stats.permutation.tolist() == permutation
+            assert stats.component_count == cycles
+            assert np.array_equal(stats.generator_counts, counts)
+
+    def test_cycle_counts(self) -> None:
+        permutations = np.array([[0, 1, 2, 3, 4], [1, 2, 3, 4, 0], [1, 0, 3, 4, 2], [4, 3, 2, 1, 0]])
+        assert cycle_counts(permutations).tolist() == [5, 1, 2, 3]
+        assert cycle_counts(np.zeros((2, 0), dtype=np.int64)).tolist() == [0, 0]
+
+    def test_batch(self) -> None:
+        rng = np.random.default_rng(1)
+        words = random_words(rng, 200, 6)
+        batch = BraidBatch(words)
+        stats = batch_stats(batch.sigmas, batch.lengths)
+        assert isinstance(stats, BatchStats)
+        strand_count = stats.permutations.shape[1]
+        for row, word in enumerate(words):
+            expected = braid_stats(word, strand_count)
+            assert stats.row(row).writhe == expected.writhe
+            assert np.array_equal(stats.permutations[row], expected.permutation)
+            assert stats.component_counts[row] == expected.component_count
+            assert np.array_equal(stats.generator_counts[row], expected.generator_counts)
+        assert batch_stats(batch.sigmas, batch.lengths, strand_count + 2).permutations.shape == (200, strand_count + 2)
+        with pytest.raises(ValueError):
+            batch_stats(batch.sigmas, batch.lengths, 2)
+
+    def test_cpp_kernel_matches_numpy(self) -> None:
+        B = pytest.importorskip("knpy.braid_cpp_impl")
+        rng = np.random.default_rng(2)
+        batch = BraidBatch(random_words(rng, 300, 7))
+        for strand_count in (None, 9):
+            expected = batch_stats(batch.sigmas, batch.lengths, strand_count)
+            stats = B.stats_batch(batch.sigmas, batch.lengths, -1 if strand_count is None else strand_count)
+            for array, expected_array in zip(stats, expected):
+                assert np.array_equal(array, expected_array)
+        writhe, permutation, component_count, counts = B.braid_stats(np.array([1, 2, -1, 3], dtype=SIGMA_DTYPE))
+        assert (writhe, permutation.tolist(), component_count) == (2, [3, 1, 0, 2], 2)
+        assert counts.tolist() == [[1, 1], [1, 0], [1, 0]]
+        with pytest.raises(ValueError):
+            B.braid_stats(np.array([3], dtype=SIGMA_DTYPE), 3)
+
+    @pytest.mark.parametrize("braid_class", [braid.Braid, braid_vec.Braid])
+    def test_braid_method(self, braid_class) -> None:
+        b = braid_class("8_19")
+        stats = b.stats()
+        assert b.stats() is stats
+        assert stats.component_count == 1
+        assert stats.writhe == 8
+        assert stats.generator_counts.sum() == len(b)
+        with pytest.raises(ValueError):
+            stats.permutation[0] = 1
+        # Moves return new braids with their own stats.
+        assert b.stabilization(index=0).stats().permutation.shape == (4,)
+        assert braid_class([1, 1]).stats().component_count == 2
+
+    def test_batch_method(self) -> None:
+        braids = [braid.Braid("3_1"), braid.Braid([1, 1]), braid.Braid([])]
+        stats = BraidBatch(braids).stats()
+        assert stats.writhes.tolist() == [3, 2, 0]
+        assert stats.component_counts.tolist() == [1, 2, 2]